@@ -0,0 +1,1050 @@
+'''
+# ================================================================================================ #
+Camera Adjuster Backends
+
+Purpose: Everything the Camera Adjuster tool asks of Maya, behind one interface,
+         so the tool can also run outside of Maya against an in-memory scene.
+
+Dependencies:
+            maya (optional)
+            OpenMaya (optional)
+            OpenMayaUI (optional)
+            PySide2 / PySide6
+
+Example:
+    from camera_adjuster import backend
+    backend.set_backend(backend.FakeBackend())
+    from camera_adjuster import view
+    view.start_up()
+
+    NOTE: > get_backend() picks MayaBackend inside Maya and FakeBackend everywhere else.
+'''
+# ================================================================================================ #
+# IMPORT
+import os
+import json
+import time
+import logging
+import tempfile
+import functools
+import collections
+
+try:
+    from PySide2 import QtWidgets
+    from shiboken2 import wrapInstance
+except:
+    from PySide6 import QtWidgets
+    from shiboken6 import wrapInstance
+try:
+    from maya import cmds
+    from maya import OpenMaya
+    from maya import OpenMayaUI
+except ImportError:
+    cmds = None
+    OpenMaya = None
+    OpenMayaUI = None
+
+# ================================================================================================ #
+# VARIABLES
+LOG = logging.getLogger(__name__)
+# Maya plugin with the tool's commands, see MayaBackend.load_plugin()
+PLUGIN_NAME = "cameraAdjusterCmds"
+# Backend used by the tool, see get_backend()
+BACKEND = None
+# CallTracer recording backend calls while tracing is on, see start_tracing()
+TRACER = None
+# Camera attributes the tool edits, by the node they live on
+TRANSFORM_ATTRS = ["tx", "ty", "tz", "rx", "ry", "rz"]
+SHAPE_ATTRS = ["horizontalPan", "verticalPan", "zoom", "panZoomEnabled"]
+# viewSet flag for each camera type in the "Create New Camera" menu
+VIEW_SET_FLAGS = {"Perspective": "persp",
+                  "Front"      : "front",
+                  "Back"       : "back",
+                  "Left"       : "leftSide",
+                  "Right"      : "rightSide",
+                  "Top"        : "top",
+                  "Bottom"     : "bottom"}
+
+# ================================================================================================ #
+# FUNCTIONS
+def get_backend():
+    '''Get the backend the tool talks to. Made on first use: MayaBackend if Maya can be imported,
+       otherwise FakeBackend.'''
+    global BACKEND
+    if BACKEND is None:
+        BACKEND = MayaBackend() if cmds else FakeBackend()
+
+    return BACKEND
+
+def set_backend(backend):
+    '''Make the tool talk to another backend (ex. a FakeBackend for tests and benchmarks).'''
+    global BACKEND
+    BACKEND = backend
+
+    return backend
+
+def start_tracing(max_events=2000):
+    '''Start recording every backend call, grouped by the UI event that caused it. Returns the CallTracer.
+        NOTES:
+            > The current backend is wrapped in a TracingBackend until stop_tracing() is called.
+            > Only handlers decorated with @traced start an event. Calls made anywhere else
+            are grouped under "(no event)".
+    '''
+    global TRACER
+    if TRACER is None:
+        TRACER = CallTracer(max_events=max_events)
+        set_backend(TracingBackend(get_backend(), TRACER))
+
+    return TRACER
+
+def stop_tracing():
+    '''Stop recording backend calls and put the original backend back. Returns the CallTracer, or None.'''
+    global TRACER
+    tracer = TRACER
+    TRACER = None
+    if isinstance(BACKEND, TracingBackend):
+        set_backend(BACKEND.backend)
+
+    return tracer
+
+def traced(function):
+    '''Decorator for UI handlers: while tracing is on, the backend calls made during the handler 
+       are grouped under one event named after it (ex. "CameraView.mouseMoveEvent").'''
+    name = getattr(function, "__qualname__", function.__name__)
+    # Qt drops signal arguments a slot doesn't take, it can't tell through the wrapper so drop them here
+    code = function.__code__
+    arg_count = None if code.co_flags & 0x04 else code.co_argcount
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        args = args[:arg_count]
+        if TRACER is None:
+            return function(*args, **kwargs)
+        TRACER.begin_event(name)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            TRACER.end_event()
+
+    return wrapper
+
+# ================================================================================================ #
+# CLASS
+class MayaBackend(object):
+    '''Backend for a live Maya session.
+        NOTES:
+            > Attribute values are in UI units (ex. degrees for rotations), like cmds.getAttr.
+            > Camera plugs are resolved once per camera, see CameraHandle.
+    '''
+    def __init__(self):
+        self.handles = {}
+
+    # ----- #
+    # Cameras
+    # ----- #
+    def get_cameras(self):
+        '''Get [name, type] of every camera shape in the scene. Type is "startup", "ortho" or "persp".'''
+        entries = []
+        iterator = OpenMaya.MItDependencyNodes(OpenMaya.MFn.kCamera)
+        while not iterator.isDone():
+            entries.append(self.get_camera_entry(OpenMaya.MObjectHandle(iterator.thisNode())))
+            iterator.next()
+
+        return entries
+
+    def get_camera_entry(self, node):
+        '''Get [name, type] of a camera node passed to a "camera_added" callback,
+           or None if it has been deleted since.'''
+        if not node.isValid():
+            return None
+        node = node.object()
+        node_fn = OpenMaya.MFnDependencyNode(node)
+        name = node_fn.name()
+        # Read from the node, a cmds.camera() query per camera adds up in big scenes
+        if node_fn.hasAttribute("startupCamera"):
+            startup = node_fn.findPlug("startupCamera", False).asBool()
+        else:
+            startup = cmds.camera(name, query=True, startupCamera=True)
+        if startup:
+            camera_type = "startup"
+        elif OpenMaya.MFnCamera(node).isOrtho():
+            camera_type = "ortho"
+        else:
+            camera_type = "persp"
+
+        return [name, camera_type]
+
+    def get_current_camera(self):
+        '''Get the camera shape being used in the active viewport.'''
+        cur_view = OpenMayaUI.M3dView.active3dView()
+        cur_cam = OpenMaya.MDagPath()
+        cur_view.getCamera(cur_cam)
+
+        return cur_cam.fullPathName().split("|")[-1]
+
+    def create_camera(self, cam_type=""):
+        '''Create a camera set up as one of the VIEW_SET_FLAGS types. Returns [transform, shape].'''
+        new_camera = cmds.camera(name=cam_type)
+        if cam_type in VIEW_SET_FLAGS:
+            cmds.viewSet(new_camera[0], **{VIEW_SET_FLAGS[cam_type]: True})
+
+        return new_camera
+
+    def look_through(self, camera):
+        cmds.lookThru(camera)
+
+    def get_camera_handle(self, camera):
+        '''Get the CameraHandle of a camera (shape or transform name). Handles are reused until
+           invalidate_camera_handles() is called.'''
+        handle = self.handles.get(camera)
+        if handle is None or not handle.is_valid():
+            handle = CameraHandle(camera)
+            self.handles[camera] = handle
+
+        return handle
+
+    def invalidate_camera_handles(self):
+        '''Forget every CameraHandle, since handles hold the names they were resolved with.'''
+        self.handles.clear()
+
+    def get_render_resolution(self):
+        return [cmds.getAttr("defaultResolution.width"), cmds.getAttr("defaultResolution.height")]
+
+    # ----- #
+    # Attributes
+    # ----- #
+    def get_attr(self, attribute_name):
+        return cmds.getAttr(attribute_name)
+
+    def set_attr(self, attribute_name, value):
+        cmds.setAttr(attribute_name, value)
+
+    def set_attr_unlocked(self, attribute_name, value, relative=False):
+        '''Set (or add to, if "relative") an attribute even if it is locked, as one undo entry.
+           Returns the new value. Needs the plugin, see load_plugin().'''
+        return cmds.cameraAdjusterSetAttr(attribute_name, value, relative=relative)
+
+    def is_locked(self, attribute_name):
+        return cmds.getAttr(attribute_name, lock=True)
+
+    def set_locked(self, attribute_name, locked=True):
+        cmds.setAttr(attribute_name, lock=locked)
+
+    def node_exists(self, name):
+        return cmds.objExists(name)
+
+    def get_string_attr(self, node, attr):
+        '''Get a string attribute, or "" if the node doesn't have it.'''
+        if not cmds.attributeQuery(attr, node=node, exists=True):
+            return ""
+
+        return cmds.getAttr("{}.{}".format(node, attr)) or ""
+
+    def set_string_attr(self, node, attr, value):
+        '''Set a string attribute, adding it to the node first if needed.'''
+        if not cmds.attributeQuery(attr, node=node, exists=True):
+            cmds.addAttr(node, longName=attr, dataType="string")
+        cmds.setAttr("{}.{}".format(node, attr), value, type="string")
+
+    # ----- #
+    # Undo
+    # ----- #
+    def undo_enabled(self):
+        return cmds.undoInfo(query=True, state=True)
+
+    def set_undo_enabled(self, state=True):
+        '''Turn the undo queue on or off without flushing it.'''
+        cmds.undoInfo(stateWithoutFlush=state)
+
+    def open_undo_chunk(self, name=""):
+        cmds.undoInfo(openChunk=True, chunkName=name)
+
+    def close_undo_chunk(self):
+        cmds.undoInfo(closeChunk=True)
+
+    # ----- #
+    # Image Planes
+    # ----- #
+    def get_image_planes(self, camera=None):
+        '''Get the imagePlane shapes attached to a camera, or every imagePlane if no camera is given.'''
+        if camera is None:
+            return cmds.ls(type="imagePlane")
+        connections = cmds.listConnections("{}.imagePlane".format(camera), shapes=True) or []
+
+        return cmds.ls(connections, type="imagePlane")
+
+    def create_image_plane(self, camera, image_path):
+        return cmds.imagePlane(camera=camera, fileName=image_path)
+
+    # ----- #
+    # Viewport
+    # ----- #
+    def get_active_editor(self):
+        '''Get the model editor of the active viewport, or "".'''
+        return cmds.playblast(activeEditor=True) or ""
+
+    def editor_exists(self, editor):
+        return bool(editor) and cmds.modelEditor(editor, exists=True)
+
+    def get_editor_settings(self, editor, names):
+        '''Get {setting: value} of modelEditor flags, ex. ["displayAppearance", "displayTextures"].'''
+        return dict([[each, cmds.modelEditor(editor, query=True, **{each: True})] for each in names])
+
+    def set_editor_settings(self, editor, settings):
+        cmds.modelEditor(editor, edit=True, **settings)
+
+    def refresh(self, suspend=None, force=False):
+        '''Suspend/resume viewport refreshes, or force one refresh.'''
+        if suspend is not None:
+            cmds.refresh(suspend=suspend)
+        if force:
+            cmds.refresh(force=True)
+
+    def get_display_layers(self):
+        return [each for each in cmds.ls(type="displayLayer") if each != "defaultLayer"]
+
+    def isolate_layer(self, editor, layer):
+        '''Isolate a display layer's members in an editor, unless the user already isolated something.
+           Returns True if the editor was isolated.'''
+        if not cmds.objExists(layer) or cmds.isolateSelect(editor, query=True, state=True):
+            return False
+        members = cmds.editDisplayLayerMembers(layer, query=True, fullNames=True) or []
+        if not members:
+            return False
+        # isolateSelect works from the selection, swap it without leaving anything in the undo queue
+        undo_state = cmds.undoInfo(query=True, stateWithoutFlush=True)
+        cmds.undoInfo(stateWithoutFlush=False)
+        try:
+            selection = cmds.ls(selection=True)
+            cmds.select(members, replace=True)
+            cmds.isolateSelect(editor, state=True)
+            cmds.select(selection, replace=True)
+        finally:
+            cmds.undoInfo(stateWithoutFlush=undo_state)
+
+        return True
+
+    def end_isolate(self, editor):
+        cmds.isolateSelect(editor, state=False)
+
+    # ----- #
+    # Session
+    # ----- #
+    def get_option(self, name, default=0):
+        '''Get an optionVar, or "default" if it was never set.'''
+        if not cmds.optionVar(exists=name):
+            return default
+
+        return cmds.optionVar(query=name)
+
+    def set_option(self, name, value):
+        if isinstance(value, str):
+            cmds.optionVar(stringValue=[name, value])
+        else:
+            cmds.optionVar(intValue=[name, int(value)])
+
+    def get_user_folder(self):
+        '''Get the folder the tool keeps files in between sessions (inside Maya's user app directory).'''
+        return os.path.join(cmds.internalVar(userAppDir=True), "camera_adjuster")
+
+    def get_main_window(self):
+        '''Locates Main Window, so we can parent our tool to it.'''
+        maya_window_ptr = OpenMayaUI.MQtUtil.mainWindow()
+
+        return wrapInstance(int(maya_window_ptr), QtWidgets.QWidget)
+
+    def load_plugin(self):
+        '''Load the tool's Maya commands (plugins/cameraAdjusterCmds.py) if they aren't loaded yet.'''
+        if not cmds.pluginInfo(PLUGIN_NAME, query=True, loaded=True):
+            cmds.loadPlugin(os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                         "plugins", PLUGIN_NAME + ".py"), quiet=True)
+
+    def add_callbacks(self, callbacks={}):
+        '''Register scene callbacks. Returns ids for remove_callbacks().
+            Parameters:
+                    callbacks : {event: function}. Events and the arguments passed:
+                                "before_export", "after_export", "scene_changed" : none
+                                "camera_added"   : node, for get_camera_entry()
+                                "camera_removed" : camera shape name
+                                "camera_renamed" : old name, new name
+        '''
+        ids = []
+        for event, message in [["before_export", OpenMaya.MSceneMessage.kBeforeExport],
+                               ["after_export", OpenMaya.MSceneMessage.kAfterExport],
+                               ["scene_changed", OpenMaya.MSceneMessage.kAfterOpen],
+                               ["scene_changed", OpenMaya.MSceneMessage.kAfterNew]]:
+            function = callbacks.get(event)
+            if function:
+                ids.append(OpenMaya.MSceneMessage.addCallback(message, self.scene_changed_callback,
+                                                              [event, function]))
+        ids += [OpenMaya.MDGMessage.addNodeAddedCallback(self.camera_added_callback, "camera", callbacks),
+                OpenMaya.MDGMessage.addNodeRemovedCallback(self.camera_removed_callback, "camera", callbacks),
+                OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject(), self.node_renamed_callback,
+                                                             callbacks)]
+
+        return ids
+
+    def remove_callbacks(self, ids=[]):
+        for each in ids:
+            OpenMaya.MMessage.removeCallback(each)
+
+    def scene_changed_callback(self, data):
+        event, function = data
+        if event == "scene_changed":
+            self.invalidate_camera_handles()
+        function()
+
+    def camera_added_callback(self, node, callbacks):
+        # Resolved to a name later, new nodes are usually renamed right after being created
+        if callbacks.get("camera_added"):
+            callbacks["camera_added"](OpenMaya.MObjectHandle(node))
+
+    def camera_removed_callback(self, node, callbacks):
+        self.invalidate_camera_handles()
+        if callbacks.get("camera_removed"):
+            callbacks["camera_removed"](OpenMaya.MFnDependencyNode(node).name())
+
+    def node_renamed_callback(self, node, old_name, callbacks):
+        # Handles store the names of camera shapes and transforms
+        if node.hasFn(OpenMaya.MFn.kDagNode):
+            self.invalidate_camera_handles()
+        if node.hasFn(OpenMaya.MFn.kCamera) and callbacks.get("camera_renamed"):
+            callbacks["camera_renamed"](old_name, OpenMaya.MFnDependencyNode(node).name())
+
+
+class CameraHandle(object):
+    '''Resolves a camera's shape, transform and the plugs the tool uses once, so hot paths
+       (nudging, panning, zooming) don't call listRelatives or parse attribute paths again.
+        Parameters:
+                camera: Name of the camera's shape or transform.
+        NOTES:
+            > Values are read straight from the cached MPlugs, in UI units like cmds.getAttr.
+            > Writes go through cmds.setAttr with the cached plug names, so they stay undoable.
+            > nudge() and set_unlocked() use the cameraAdjusterSetAttr command (see MayaBackend.load_plugin()),
+            which also edits locked plugs in a single graph update and undo entry.
+            set_unlocked(undoable=False) skips the command and edits the cached MPlug directly.
+            > Use get_backend().get_camera_handle() instead of making handles directly.
+    '''
+    transform_attrs = TRANSFORM_ATTRS
+    shape_attrs = SHAPE_ATTRS
+
+    def __init__(self, camera=""):
+        self.camera = camera
+        selection = OpenMaya.MSelectionList()
+        selection.add(camera)
+        self.shape_path = OpenMaya.MDagPath()
+        selection.getDagPath(0, self.shape_path)
+        self.shape_path.extendToShape()
+        self.transform_path = OpenMaya.MDagPath(self.shape_path)
+        self.transform_path.pop()
+        self.node_handle = OpenMaya.MObjectHandle(self.shape_path.node())
+        self.shape = self.shape_path.partialPathName()
+        self.transform = self.transform_path.partialPathName()
+        self.plugs = {}
+        self.names = {}
+        for node_path, node_name, attrs in [[self.transform_path, self.transform, self.transform_attrs],
+                                            [self.shape_path, self.shape, self.shape_attrs]]:
+            node_fn = OpenMaya.MFnDependencyNode(node_path.node())
+            for attr in attrs:
+                self.plugs[attr] = node_fn.findPlug(attr, False)
+                self.names[attr] = "{}.{}".format(node_name, attr)
+
+    def is_valid(self):
+        '''Check that the camera still exists under the name the handle was made with.
+           A renamed camera's cached plug names are stale, and another node may have taken its name.'''
+        if not self.node_handle.isValid():
+            return False
+
+        return self.camera in [self.shape_path.partialPathName(), self.transform_path.partialPathName()]
+
+    def get(self, attr):
+        '''Get an attribute's value.'''
+        plug = self.plugs[attr]
+        if attr in ["rx", "ry", "rz"]:
+            return plug.asMAngle().asUnits(OpenMaya.MAngle.uiUnit())
+        if attr in ["tx", "ty", "tz"]:
+            return plug.asMDistance().asUnits(OpenMaya.MDistance.uiUnit())
+        if attr == "panZoomEnabled":
+            return plug.asBool()
+
+        return plug.asDouble()
+
+    def is_locked(self, attr):
+        return self.plugs[attr].isLocked()
+
+    def set(self, attr, value):
+        '''Set an attribute's value.'''
+        cmds.setAttr(self.names[attr], value)
+
+    def set_locked(self, attr, locked=True):
+        cmds.setAttr(self.names[attr], lock=locked)
+
+    def set_unlocked(self, attr, value, relative=False, undoable=True):
+        '''Set (or add to, if "relative") an attribute, even if it is locked. Returns the new value.
+            Parameters:
+                    undoable : If True, the write is one cameraAdjusterSetAttr command and undo entry.
+                               If False, the cached plug is edited directly with an MDGModifier, 
+                               which never reaches the undo queue. For the in-between values of 
+                               an interaction, see view.UndoSession.
+        '''
+        if undoable:
+            return cmds.cameraAdjusterSetAttr(self.names[attr], value, relative=relative)
+        if relative:
+            value += self.get(attr)
+        plug = self.plugs[attr]
+        modifier = OpenMaya.MDGModifier()
+        if attr in ["rx", "ry", "rz"]:
+            modifier.newPlugValueMAngle(plug, OpenMaya.MAngle(value, OpenMaya.MAngle.uiUnit()))
+        elif attr in ["tx", "ty", "tz"]:
+            modifier.newPlugValueMDistance(plug, OpenMaya.MDistance(value, OpenMaya.MDistance.uiUnit()))
+        else:
+            modifier.newPlugValueDouble(plug, value)
+        locked = plug.isLocked()
+        if locked:
+            plug.setLocked(False)
+        try:
+            modifier.doIt()
+        finally:
+            if locked:
+                plug.setLocked(True)
+
+        return value
+
+    def nudge(self, attr, increment):
+        '''Add an increment to an attribute, even if it is locked, as one undo entry. Returns the new value.'''
+        return self.set_unlocked(attr, increment, relative=True)
+
+
+class FakeBackend(object):
+    '''In-memory stand-in for a Maya scene, for running the tool headless in tests and benchmarks.
+        Parameters:
+                resolution : Render resolution [width, height].
+        NOTES:
+            > Models cameras (shape + transform), attribute values, locks, imagePlanes and the undo queue.
+            Setting a locked attribute raises RuntimeError, like cmds.setAttr.
+            > Every backend call is counted in "calls".
+            > Scene edits (create_camera(), delete_camera(), rename_camera(), new_scene())
+            run the registered callbacks right away, like Maya does.
+    '''
+    defaults = {"zoom": 1.0, "panZoomEnabled": False}
+
+    def __init__(self, resolution=[960, 540]):
+        self.resolution = resolution
+        self.cameras = collections.OrderedDict()
+        self.attrs = {}
+        self.locks = {}
+        self.options = {}
+        self.editors = {}
+        self.image_planes = {}
+        self.handles = {}
+        self.calls = collections.Counter()
+        self.callbacks = {}
+        self.next_callback_id = 0
+        self.current_camera = ""
+        # Undo queue: a list of entries, each a list of [attribute name, "value"/"lock", old, new] edits
+        self.undo_state = True
+        self.undo_queue = []
+        self.redo_queue = []
+        self.chunk_depth = 0
+        self.chunk = []
+        self.new_scene()
+
+    # ----- #
+    # Scene
+    # ----- #
+    def new_scene(self):
+        '''Reset to an empty scene with Maya's startup cameras.'''
+        self.cameras.clear()
+        self.attrs.clear()
+        self.locks.clear()
+        self.image_planes.clear()
+        self.undo_queue = []
+        self.redo_queue = []
+        for name, camera_type in [["persp", "startup"], ["top", "startup"],
+                                  ["front", "startup"], ["side", "startup"]]:
+            self.add_camera_nodes(name, camera_type)
+        self.current_camera = "perspShape"
+        self.run_callbacks("scene_changed")
+
+    def add_camera_nodes(self, transform, camera_type="persp"):
+        shape = transform + "Shape"
+        self.cameras[shape] = {"transform": transform, "type": camera_type}
+
+        return [transform, shape]
+
+    def delete_camera(self, camera):
+        '''Delete a camera (shape or transform name).'''
+        shape = self.get_shape(camera)
+        del self.cameras[shape]
+        # Like Maya, the viewport falls back to another camera
+        if self.current_camera == shape:
+            self.current_camera = "perspShape" if "perspShape" in self.cameras else next(iter(self.cameras), "")
+        self.run_callbacks("camera_removed", shape)
+
+    def rename_camera(self, camera, new_name):
+        '''Rename a camera's shape.'''
+        shape = self.get_shape(camera)
+        self.cameras = collections.OrderedDict([[new_name if key == shape else key, val]
+                                                for key, val in self.cameras.items()])
+        for attr in SHAPE_ATTRS:
+            for store in [self.attrs, self.locks]:
+                if "{}.{}".format(shape, attr) in store:
+                    store["{}.{}".format(new_name, attr)] = store.pop("{}.{}".format(shape, attr))
+        if self.current_camera == shape:
+            self.current_camera = new_name
+        self.run_callbacks("camera_renamed", shape, new_name)
+
+    def get_shape(self, camera):
+        '''Get a camera's shape name from its shape or transform name.'''
+        if camera in self.cameras:
+            return camera
+        for shape, data in self.cameras.items():
+            if data["transform"] == camera:
+                return shape
+        raise ValueError("No object matches name: {}".format(camera))
+
+    # ----- #
+    # Cameras
+    # ----- #
+    def get_cameras(self):
+        self.calls["get_cameras"] += 1
+        return [[shape, data["type"]] for shape, data in self.cameras.items()]
+
+    def get_camera_entry(self, node):
+        '''Get [name, type] of a FakeObjectHandle passed to a "camera_added" callback,
+           or None if it has been deleted since.'''
+        if not node.isValid():
+            return None
+        node = node.object()
+        for shape, data in self.cameras.items():
+            if data is node:
+                return [shape, data["type"]]
+
+    def get_current_camera(self):
+        return self.current_camera
+
+    def create_camera(self, cam_type=""):
+        self.calls["create_camera"] += 1
+        name = cam_type or "camera"
+        num = 1
+        while "{}{}".format(name, num) in [each["transform"] for each in self.cameras.values()]:
+            num += 1
+        camera_type = "persp" if cam_type in ["", "Perspective"] else "ortho"
+        new_camera = self.add_camera_nodes("{}{}".format(name, num), camera_type)
+        self.run_callbacks("camera_added", FakeObjectHandle(self, self.cameras[new_camera[1]]))
+
+        return new_camera
+
+    def look_through(self, camera):
+        self.calls["look_through"] += 1
+        self.current_camera = self.get_shape(camera)
+
+    def get_camera_handle(self, camera):
+        handle = self.handles.get(camera)
+        if handle is None or not handle.is_valid():
+            handle = FakeCameraHandle(self, camera)
+            self.handles[camera] = handle
+
+        return handle
+
+    def invalidate_camera_handles(self):
+        self.handles.clear()
+
+    def get_render_resolution(self):
+        return list(self.resolution)
+
+    # ----- #
+    # Attributes
+    # ----- #
+    def get_attr(self, attribute_name):
+        self.calls["get_attr"] += 1
+        return self.value(attribute_name)
+
+    def value(self, attribute_name):
+        '''Get an attribute's value without counting a call, for reads Maya makes inside a command.'''
+        return self.attrs.get(attribute_name, self.defaults.get(attribute_name.split(".")[-1], 0.0))
+
+    def set_attr(self, attribute_name, value):
+        self.calls["set_attr"] += 1
+        if self.locks.get(attribute_name):
+            raise RuntimeError("The attribute '{}' is locked or connected and cannot be modified.".format(attribute_name))
+        self.write(attribute_name, value)
+
+    def set_attr_unlocked(self, attribute_name, value, relative=False):
+        self.calls["set_attr_unlocked"] += 1
+        if relative:
+            value += self.value(attribute_name)
+        self.write(attribute_name, value)
+
+        return value
+
+    def is_locked(self, attribute_name):
+        self.calls["is_locked"] += 1
+        return self.locks.get(attribute_name, False)
+
+    def set_locked(self, attribute_name, locked=True):
+        self.calls["set_locked"] += 1
+        self.record_undo([attribute_name, "lock", self.locks.get(attribute_name, False), locked])
+        self.locks[attribute_name] = locked
+
+    def set_plug(self, attribute_name, value, relative=False):
+        '''What CameraHandle.set_unlocked(undoable=False) does in Maya: 
+           no command and no undo entry, locked or not.'''
+        self.calls["set_plug"] += 1
+        if relative:
+            value += self.value(attribute_name)
+        self.attrs[attribute_name] = value
+
+        return value
+
+    def write(self, attribute_name, value):
+        self.record_undo([attribute_name, "value", self.value(attribute_name), value])
+        self.attrs[attribute_name] = value
+
+    def node_exists(self, name):
+        return name in self.cameras or name in self.image_planes
+
+    def get_string_attr(self, node, attr):
+        return self.attrs.get("{}.{}".format(node, attr), "")
+
+    def set_string_attr(self, node, attr, value):
+        self.write("{}.{}".format(node, attr), value)
+
+    # ----- #
+    # Undo
+    # ----- #
+    def undo_enabled(self):
+        self.calls["undo_enabled"] += 1
+        return self.undo_state
+
+    def set_undo_enabled(self, state=True):
+        self.calls["set_undo_enabled"] += 1
+        self.undo_state = state
+
+    def open_undo_chunk(self, name=""):
+        self.chunk_depth += 1
+
+    def close_undo_chunk(self):
+        if not self.chunk_depth:
+            return
+        self.chunk_depth -= 1
+        if not self.chunk_depth and self.chunk:
+            self.undo_queue.append(self.chunk)
+            self.chunk = []
+
+    def record_undo(self, edit):
+        '''Add an edit to the undo queue. Edits made inside an open chunk become one entry when it closes.'''
+        if not self.undo_state:
+            return
+        self.redo_queue = []
+        if self.chunk_depth:
+            self.chunk.append(edit)
+        else:
+            self.undo_queue.append([edit])
+
+    def undo(self):
+        '''Undo the last undo entry. Returns False if there was nothing to undo.'''
+        if not self.undo_queue:
+            return False
+        entry = self.undo_queue.pop()
+        for attribute_name, kind, old, new in reversed(entry):
+            store = self.locks if kind == "lock" else self.attrs
+            store[attribute_name] = old
+        self.redo_queue.append(entry)
+
+        return True
+
+    def redo(self):
+        '''Redo the last undone entry. Returns False if there was nothing to redo.'''
+        if not self.redo_queue:
+            return False
+        entry = self.redo_queue.pop()
+        for attribute_name, kind, old, new in entry:
+            store = self.locks if kind == "lock" else self.attrs
+            store[attribute_name] = new
+        self.undo_queue.append(entry)
+
+        return True
+
+    # ----- #
+    # Image Planes
+    # ----- #
+    def get_image_planes(self, camera=None):
+        if camera is None:
+            return list(self.image_planes)
+        shape = self.get_shape(camera)
+
+        return [each for each, owner in self.image_planes.items() if owner == shape]
+
+    def create_image_plane(self, camera, image_path):
+        self.calls["create_image_plane"] += 1
+        name = "imagePlaneShape{}".format(len(self.image_planes) + 1)
+        self.image_planes[name] = self.get_shape(camera)
+        self.attrs[name + ".imageName"] = image_path
+
+        return [name.replace("Shape", ""), name]
+
+    # ----- #
+    # Viewport
+    # ----- #
+    def get_active_editor(self):
+        return "modelPanel4"
+
+    def editor_exists(self, editor):
+        return bool(editor)
+
+    def get_editor_settings(self, editor, names):
+        settings = self.editors.setdefault(editor, {"displayAppearance": "smoothShaded",
+                                                    "displayTextures": True})
+
+        return dict([[each, settings[each]] for each in names])
+
+    def set_editor_settings(self, editor, settings):
+        self.calls["set_editor_settings"] += 1
+        self.get_editor_settings(editor, [])
+        self.editors[editor].update(settings)
+
+    def refresh(self, suspend=None, force=False):
+        self.calls["refresh"] += 1
+
+    def get_display_layers(self):
+        return []
+
+    def isolate_layer(self, editor, layer):
+        return False
+
+    def end_isolate(self, editor):
+        pass
+
+    # ----- #
+    # Session
+    # ----- #
+    def get_option(self, name, default=0):
+        return self.options.get(name, default)
+
+    def set_option(self, name, value):
+        self.options[name] = value
+
+    def get_user_folder(self):
+        '''Get a folder in the system's temp directory, so fake sessions don't touch Maya's prefs.'''
+        return os.path.join(tempfile.gettempdir(), "camera_adjuster_fake")
+
+    def get_main_window(self):
+        return None
+
+    def load_plugin(self):
+        pass
+
+    def add_callbacks(self, callbacks={}):
+        self.next_callback_id += 1
+        self.callbacks[self.next_callback_id] = callbacks
+
+        return [self.next_callback_id]
+
+    def remove_callbacks(self, ids=[]):
+        for each in ids:
+            self.callbacks.pop(each, None)
+
+    def run_callbacks(self, event, *args):
+        for callbacks in list(self.callbacks.values()):
+            if callbacks.get(event):
+                callbacks[event](*args)
+
+
+class FakeObjectHandle(object):
+    '''Stand-in for the OpenMaya.MObjectHandle a "camera_added" callback gets. 
+       The camera's data dict in FakeBackend.cameras stands in for the MObject.'''
+    def __init__(self, backend, node):
+        self.backend = backend
+        self.node = node
+
+    def isValid(self):
+        return any(each is self.node for each in self.backend.cameras.values())
+
+    def object(self):
+        return self.node
+
+
+class FakeCameraHandle(object):
+    '''CameraHandle of a FakeBackend camera. Reads and writes go through the backend.
+        NOTES:
+            > Like CameraHandle, it holds the names it was made with. It stops being valid once
+            its camera is deleted or renamed, even if another camera takes the old name.
+    '''
+    transform_attrs = TRANSFORM_ATTRS
+    shape_attrs = SHAPE_ATTRS
+
+    def __init__(self, backend, camera=""):
+        self.backend = backend
+        self.camera = camera
+        self.shape = backend.get_shape(camera)
+        # The camera's data dict stands in for the MObject
+        self.node = backend.cameras[self.shape]
+        self.transform = self.node["transform"]
+        self.names = dict([[each, "{}.{}".format(self.transform, each)] for each in self.transform_attrs] +
+                          [[each, "{}.{}".format(self.shape, each)] for each in self.shape_attrs])
+
+    def is_valid(self):
+        return (self.backend.cameras.get(self.shape) is self.node and 
+                self.camera in [self.shape, self.node["transform"]])
+
+    def get(self, attr):
+        return self.backend.get_attr(self.names[attr])
+
+    def is_locked(self, attr):
+        return self.backend.is_locked(self.names[attr])
+
+    def set(self, attr, value):
+        self.backend.set_attr(self.names[attr], value)
+
+    def set_locked(self, attr, locked=True):
+        self.backend.set_locked(self.names[attr], locked)
+
+    def set_unlocked(self, attr, value, relative=False, undoable=True):
+        if undoable:
+            return self.backend.set_attr_unlocked(self.names[attr], value, relative=relative)
+
+        return self.backend.set_plug(self.names[attr], value, relative=relative)
+
+    def nudge(self, attr, increment):
+        return self.set_unlocked(attr, increment, relative=True)
+
+
+class CallTracer(object):
+    '''Records backend calls with their plug and duration, grouped by the UI event that caused them.
+        Parameters:
+                max_events : Number of most recent top-level events kept.
+        NOTES:
+            > Each top-level event is {"name", "start", "duration", "calls", "spans"}. 
+            "calls" holds [call, plug, start, duration, handler] of every backend call made during it,
+            including calls made by handlers it ran (listed in "spans" as [name, start, duration]).
+            > Times are seconds from when the tracer was made.
+    '''
+    def __init__(self, max_events=2000):
+        self.origin = time.perf_counter()
+        self.events = collections.deque(maxlen=max_events)
+        self.stack = []
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    def begin_event(self, name):
+        event = {"name": name, "start": self.now(), "duration": 0.0, "calls": [], "spans": []}
+        if not self.stack:
+            self.events.append(event)
+        self.stack.append(event)
+
+    def end_event(self):
+        event = self.stack.pop()
+        event["duration"] = self.now() - event["start"]
+        if self.stack:
+            self.stack[0]["spans"].append([event["name"], event["start"], event["duration"]])
+
+    def record(self, call, plug, start, duration):
+        '''Store one backend call. "start" is a time from now().'''
+        if self.stack:
+            self.stack[0]["calls"].append([call, plug, start, duration, self.stack[-1]["name"]])
+        else:
+            self.events.append({"name": "(no event)", "start": start, "duration": duration, 
+                                "calls": [[call, plug, start, duration, ""]], "spans": []})
+
+    def clear(self):
+        self.events.clear()
+
+    def summary(self):
+        '''Get {event name: {"events", "calls", "call_ms", "event_ms", "max_calls"}} over the kept events.'''
+        summary = collections.OrderedDict()
+        for event in self.events:
+            stats = summary.setdefault(event["name"], {"events": 0, "calls": 0, "call_ms": 0.0, 
+                                                       "event_ms": 0.0, "max_calls": 0})
+            stats["events"] += 1
+            stats["calls"] += len(event["calls"])
+            stats["call_ms"] += sum([each[3] for each in event["calls"]]) * 1000
+            stats["event_ms"] += event["duration"] * 1000
+            stats["max_calls"] = max(stats["max_calls"], len(event["calls"]))
+
+        return summary
+
+    def chrome_trace(self):
+        '''Get the kept events as Chrome trace-event JSON data (chrome://tracing, Perfetto).'''
+        trace_events = []
+        for event in list(self.events):
+            trace_events.append({"name": event["name"], "cat": "event", "ph": "X", "pid": 1, "tid": 1,
+                                 "ts": event["start"] * 1e6, "dur": event["duration"] * 1e6,
+                                 "args": {"calls": len(event["calls"])}})
+            for name, start, duration in event["spans"]:
+                trace_events.append({"name": name, "cat": "event", "ph": "X", "pid": 1, "tid": 1,
+                                     "ts": start * 1e6, "dur": duration * 1e6})
+            for call, plug, start, duration, handler in event["calls"]:
+                trace_events.append({"name": call, "cat": "maya", "ph": "X", "pid": 1, "tid": 1,
+                                     "ts": start * 1e6, "dur": duration * 1e6,
+                                     "args": {"plug": plug, "handler": handler}})
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path):
+        with open(path, "w") as json_file:
+            json.dump(self.chrome_trace(), json_file)
+
+
+class TracingBackend(object):
+    '''Wraps another backend and reports every call made through it to a CallTracer.
+        Parameters:
+                backend : The backend doing the work.
+                tracer  : CallTracer the calls are recorded to.
+        NOTES:
+            > Made by start_tracing(). Camera handles are wrapped too, see TracingCameraHandle.
+    '''
+    def __init__(self, backend, tracer):
+        self.backend = backend
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        attr = getattr(self.backend, name)
+        if not callable(attr):
+            return attr
+        tracer = self.tracer
+
+        def wrapper(*args, **kwargs):
+            start = tracer.now()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                tracer.record(name, args[0] if args and isinstance(args[0], str) else "",
+                              start, tracer.now() - start)
+        # Looked up once per name
+        self.__dict__[name] = wrapper
+
+        return wrapper
+
+    def get_camera_handle(self, camera):
+        start = self.tracer.now()
+        handle = self.backend.get_camera_handle(camera)
+        self.tracer.record("get_camera_handle", camera, start, self.tracer.now() - start)
+
+        return TracingCameraHandle(handle, self.tracer)
+
+
+class TracingCameraHandle(object):
+    '''Wraps a camera handle and reports its reads and writes to a CallTracer, with the plug used.'''
+    def __init__(self, handle, tracer):
+        self.handle = handle
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        attr = getattr(self.handle, name)
+        if not callable(attr):
+            return attr
+        tracer = self.tracer
+        names = self.handle.names
+
+        def wrapper(*args, **kwargs):
+            start = tracer.now()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                tracer.record("handle." + name, names.get(args[0], "") if args else "",
+                              start, tracer.now() - start)
+        self.__dict__[name] = wrapper
+
+        return wrapper
@@ -0,0 +1,836 @@
+'''
+# ================================================================================================ #
+Camera Adjuster Benchmarks
+
+Purpose: To measure how hard the tool's interactions hit Maya, outside of a Maya session.
+
+Dependencies:
+            PySide2 / PySide6
+
+Example:
+    # Replay every built-in input trace and print the report
+    python -m camera_adjuster.benchmark
+    # Save the report as a baseline, then compare a later run against it
+    python -m camera_adjuster.benchmark --save baseline.json
+    python -m camera_adjuster.benchmark --compare baseline.json
+    # Replay traces recorded with TraceRecorder
+    python -m camera_adjuster.benchmark --trace-file my_drag.json
+    # The older single-purpose benchmarks
+    python -m camera_adjuster.benchmark --micro
+
+    NOTE: > Runs on Qt's "offscreen" platform against backend.FakeBackend,
+            so it must not be run from inside Maya.
+          > Traces are JSON: {"name": str, "setup": {...}, "events": [{"time": seconds, "target": str, 
+            "type": str, ...}]}. Targets are "view" (CameraView), "nav" (NavGrid), 
+            "combo" (camera picker) and "tool" (image loads).
+'''
+# ================================================================================================ #
+# IMPORT
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import collections
+import multiprocessing
+from concurrent import futures
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    from PySide2 import QtWidgets, QtCore, QtGui
+except:
+    from PySide6 import QtWidgets, QtCore, QtGui
+
+# ================================================================================================ #
+# VARIABLES
+# How much slower (as a fraction) a latency percentile may get before compare_reports() flags it
+BASELINE_TOLERANCE = 0.10
+# Latency percentiles in the report
+PERCENTILES = [50, 90, 99]
+# [width, height] of the CameraView traces are replayed in
+TRACE_VIEW_SIZE = [960, 540]
+
+# ================================================================================================ #
+# FUNCTIONS
+def import_view():
+    '''Import view.py against a fresh FakeBackend. Returns [view module, FakeBackend].'''
+    from . import backend
+    fake_backend = backend.set_backend(backend.FakeBackend())
+    get_app()
+    from . import view
+
+    return [view, fake_backend]
+
+def get_app():
+    '''Get (or create) a QApplication on the offscreen platform.
+       NOTE: > Must run before view.py is imported, view.py builds widgets at import time.'''
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance()
+    if not app:
+        app = QtWidgets.QApplication([])
+
+    return app
+
+def send_mouse(widget, event_type, pos, buttons):
+    '''Send a synthetic mouse event to a widget.'''
+    button = QtCore.Qt.NoButton if event_type == QtCore.QEvent.MouseMove else QtCore.Qt.LeftButton
+    local_pos = QtCore.QPointF(pos[0], pos[1])
+    event = QtGui.QMouseEvent(event_type, local_pos, widget.mapToGlobal(local_pos),
+                              button, buttons, QtCore.Qt.NoModifier)
+    get_app().sendEvent(widget, event)
+
+def bench_pan_drag(write_rate=None, duration=1.0, mouse_rate=1000):
+    '''Drag across a CameraView for "duration" seconds with a mouse polling at "mouse_rate" Hz.
+       Returns [attribute writes per second of dragging, undo entries left by the drag].'''
+    view, fake_backend = import_view()
+    app = get_app()
+    widget = view.CameraView(camera="perspShape", write_rate=write_rate)
+    widget.resize(480, 270)
+    widget.show()
+    app.processEvents()
+    viewport = widget.viewport()
+    events = int(duration * mouse_rate)
+    fake_backend.calls.clear()
+    send_mouse(viewport, QtCore.QEvent.MouseButtonPress, [240, 135], QtCore.Qt.LeftButton)
+    start = time.perf_counter()
+    for num in range(events):
+        pos = [240 - (num % 200), 135 - (num % 100) / 2.0]
+        send_mouse(viewport, QtCore.QEvent.MouseMove, pos, QtCore.Qt.LeftButton)
+        app.processEvents()
+        # Pace events like a real mouse would
+        next_time = start + float(num + 1) / mouse_rate
+        while time.perf_counter() < next_time:
+            app.processEvents()
+    send_mouse(viewport, QtCore.QEvent.MouseButtonRelease, pos, QtCore.Qt.NoButton)
+    elapsed = time.perf_counter() - start
+    widget.close()
+
+    writes = sum(fake_backend.calls[each] for each in ["set_attr", "set_attr_unlocked", "set_plug"])
+
+    return [writes / elapsed, len(fake_backend.undo_queue)]
+
+def bench_grid_paint(density=3, mode="pan", paints=300):
+    '''Repaint a 480x270 CameraView "paints" times with a "density" x "density" grid and every guide on.
+       Returns milliseconds per paint.
+        Parameters:
+                mode : "pan" scrolls a pixel before each paint, "pan_uncached" does too with the 
+                       background cache off, "zoom" changes the zoom so the cached background is redrawn.
+    '''
+    view, fake_backend = import_view()
+    app = get_app()
+    widget = view.CameraView(camera="perspShape")
+    widget.resize(480, 270)
+    widget.set_grid(columns=density, rows=density, guides=[each[1] for each in view.GRID_GUIDES])
+    if mode == "pan_uncached":
+        widget.setCacheMode(QtWidgets.QGraphicsView.CacheNone)
+    widget.show()
+    app.processEvents()
+    scroll_bar = widget.horizontalScrollBar()
+    start = time.perf_counter()
+    for num in range(paints):
+        step = 1 if num % 40 < 20 else -1
+        if mode == "zoom":
+            widget.set_zoom(widget.zoom * 1.01 ** step)
+        else:
+            scroll_bar.setValue(scroll_bar.value() + step)
+        widget.viewport().repaint()
+    elapsed = time.perf_counter() - start
+    widget.close()
+
+    return elapsed * 1000 / paints
+
+def build_up_down_buttons(text="tx", btn_size=[32, 32]):
+    '''Build one cell of the transform pad NavGrid replaced: an up button, a label and a down button,
+       each button styled and given icons read from disk on its own.'''
+    view, fake_backend = import_view()
+    widget = QtWidgets.QWidget()
+    layout = QtWidgets.QVBoxLayout(widget)
+    widget.setStyleSheet("font-weight: bold")
+    label = QtWidgets.QLabel(text)
+    label.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+    label.setAlignment(QtCore.Qt.AlignCenter)
+    for each in ["up_btn.jpg", label, "down_btn.jpg"]:
+        if each is label:
+            layout.addWidget(label)
+            continue
+        button = QtWidgets.QPushButton("")
+        button.setFixedSize(btn_size[0], btn_size[1])
+        button.setIcon(QtGui.QIcon(os.path.join(view.ICON_FOLDER, each)))
+        button.setStyleSheet("QPushButton:pressed{background: #666;}")
+        layout.addWidget(button)
+    layout.setAlignment(QtCore.Qt.AlignHCenter)
+
+    return widget
+
+def bench_nav_build(builds=20):
+    '''Time building and showing the transform pad against the table of six up/down button cells it replaced
+       (see build_up_down_buttons()), with the tool's stylesheet applied. 
+       Returns {name: [milliseconds per build, widgets per build]}.'''
+    view, fake_backend = import_view()
+    app = get_app()
+    def build_pad():
+        return view.NavGrid()
+    def build_buttons():
+        table = QtWidgets.QTableWidget(2, 3)
+        for num in range(6):
+            table.setCellWidget(num // 3, num % 3, build_up_down_buttons())
+        return table
+    results = collections.OrderedDict()
+    for name, build in [["NavGrid", build_pad], ["Up/down button table", build_buttons]]:
+        start = time.perf_counter()
+        for num in range(builds):
+            parent = QtWidgets.QWidget()
+            parent.setStyleSheet(view.STYLESHEET)
+            layout = QtWidgets.QVBoxLayout(parent)
+            layout.addWidget(build())
+            parent.show()
+            app.processEvents()
+            widgets = len(parent.findChildren(QtWidgets.QWidget))
+            parent.close()
+            parent.deleteLater()
+        results[name] = [(time.perf_counter() - start) * 1000 / builds, widgets]
+    app.processEvents()
+
+    return results
+
+def bench_startup(opens=10):
+    '''Time opening the tool (build, show and first paint) on a FakeBackend, starting with no icons loaded.
+       Returns [first open milliseconds, average milliseconds of the opens after it].'''
+    view, fake_backend = import_view()
+    app = get_app()
+    # The automatic render profile pick runs a paint benchmark after the tool opens
+    fake_backend.set_option(view.RENDER_PROFILE_OPTION_VAR, "quality")
+    view.ICONS.clear()
+    times = []
+    for num in range(opens):
+        start = time.perf_counter()
+        tool = view.CameraAdjuster()
+        tool.show()
+        app.processEvents()
+        times.append((time.perf_counter() - start) * 1000)
+        tool.close()
+        tool.deleteLater()
+        app.processEvents()
+
+    return [times[0], sum(times[1:]) / max(1, len(times) - 1)]
+
+def bench_render_profiles(paints=200, zoom=2.0):
+    '''Time CameraView repaints under each of view.RENDER_PROFILES, with a 6000x4000 reference image 
+       decoded and zoomed in "zoom" times. Returns {profile name: milliseconds per paint}.'''
+    app = get_app()
+    folder = tempfile.mkdtemp(prefix="camera_adjuster_bench_")
+    try:
+        trace = {"name": "render_profiles", "setup": {"images": [[6000, 4000, "jpg"]]}}
+        view, fake_backend, tool, image_paths = setup_tool(trace, folder)
+        image_plane = fake_backend.get_image_planes(fake_backend.get_current_camera())[0]
+        fake_backend.set_string_attr(image_plane, "imageName", image_paths[0])
+        tool.change_image_display()
+        tool.grid_widget.set_zoom(zoom)
+        # Wait for the image and the tiles at this zoom, so only painting is timed
+        tool.grid_widget.viewport().repaint()
+        while tool.image_plane_point.task or tool.image_plane_point.pending_tiles:
+            app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+            tool.grid_widget.viewport().repaint()
+        timings = tool.grid_widget.benchmark_render_profiles(paints)
+        # Tiles requested while panning must finish before their file is deleted
+        tool.image_plane_point.cancel()
+        view.IMAGE_THREAD_POOL.waitForDone()
+        tool.close()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return timings
+
+def bench_key_hold(repeat_rate=30, duration=1.0):
+    '''Hold the up key on a NavGrid for "duration" seconds while the OS auto-repeats at "repeat_rate" Hz.
+       Returns [distance moved, attribute writes, undo entries].'''
+    view, fake_backend = import_view()
+    app = get_app()
+    widget = view.NavGrid()
+    attribute_name = view.get_camera_handle(fake_backend.get_current_camera()).names["tx"]
+    fake_backend.calls.clear()
+    start = time.perf_counter()
+    repeats = 0
+    app.sendEvent(widget, QtGui.QKeyEvent(QtCore.QEvent.KeyPress, QtCore.Qt.Key_Up, QtCore.Qt.NoModifier))
+    while time.perf_counter() - start < duration:
+        if time.perf_counter() - start >= float(repeats + 1) / repeat_rate:
+            repeats += 1
+            app.sendEvent(widget, QtGui.QKeyEvent(QtCore.QEvent.KeyPress, QtCore.Qt.Key_Up, 
+                                                  QtCore.Qt.NoModifier, "", True))
+        app.processEvents()
+    app.sendEvent(widget, QtGui.QKeyEvent(QtCore.QEvent.KeyRelease, QtCore.Qt.Key_Up, QtCore.Qt.NoModifier))
+    writes = sum(fake_backend.calls[each] for each in ["set_attr", "set_attr_unlocked", "set_plug"])
+    widget.close()
+
+    return [fake_backend.get_attr(attribute_name), writes, len(fake_backend.undo_queue)]
+
+def bench_dispatcher(threads=4, writes=2000, plugs=4):
+    '''Have "threads" worker threads each queue "writes" setAttrs spread over "plugs" plugs 
+       through a MainThreadDispatcher, while the main thread runs the event loop.
+       Returns the dispatcher's stats plus the setAttr calls that reached Maya.'''
+    view, fake_backend = import_view()
+    app = get_app()
+    dispatcher = view.MainThreadDispatcher()
+    fake_backend.calls.clear()
+
+    def worker(num):
+        results = []
+        for each in range(writes):
+            results.append(dispatcher.set_attr("cameraShape{}.horizontalPan".format(each % plugs), each))
+        return futures.wait(results)
+
+    with futures.ThreadPoolExecutor(max_workers=threads) as pool:
+        jobs = [pool.submit(worker, num) for num in range(threads)]
+        while not all(job.done() for job in jobs):
+            app.processEvents()
+    stats = dispatcher.stats()
+    stats["setAttr"] = fake_backend.calls["set_attr"]
+
+    return stats
+
+def make_test_images(folder, width=8000, height=6000, formats=["jpg", "png", "tif"]):
+    '''Write a synthetic width-by-height image in each format. Returns the file paths.'''
+    get_app()
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    gradient = QtGui.QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QtGui.QColor(40, 90, 160))
+    gradient.setColorAt(1, QtGui.QColor(230, 180, 60))
+    painter = QtGui.QPainter(image)
+    painter.fillRect(image.rect(), gradient)
+    painter.setPen(QtGui.QPen(QtCore.Qt.black, 3))
+    for num in range(0, width, 50):
+        painter.drawLine(num, 0, width - num, height)
+    painter.end()
+    paths = []
+    for each in formats:
+        path = os.path.join(folder, "reference_{}x{}.{}".format(width, height, each))
+        image.save(path)
+        paths.append(path)
+
+    return paths
+
+def peak_memory():
+    '''Get the process's peak resident memory in MB, or 0.0 if the platform can't report it.'''
+    # VmHWM is reset for each new process, ru_maxrss is carried over from the parent on Linux
+    if os.path.isfile("/proc/self/status"):
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    if resource:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+    return 0.0
+
+def decode_in_process(image_path, size, scale_on_decode):
+    '''Decode one image and report [milliseconds, peak memory growth in MB].
+       NOTE: > Meant to run in a fresh child process so the peak belongs to this decode only.'''
+    view, fake_backend = import_view()
+    peak_before = peak_memory()
+    start = time.perf_counter()
+    if scale_on_decode:
+        image = view.decode_image(image_path, size)
+    else:
+        image = QtGui.QImage(image_path).scaled(QtCore.QSize(size[0], size[1]),
+                                                QtCore.Qt.KeepAspectRatio,
+                                                QtCore.Qt.FastTransformation)
+    elapsed = (time.perf_counter() - start) * 1000
+    # A failed decode would time nothing, and keeps the result in use for both methods
+    if image.isNull():
+        raise RuntimeError("Unable to decode '{}'".format(image_path))
+
+    return [elapsed, peak_memory() - peak_before]
+
+def bench_image_decode(width=8000, height=6000, size=[1920, 1080]):
+    '''Compare full decode + scale against decoding at display size.
+       Returns {file name: {"full": [ms, MB], "scaled": [ms, MB]}}'''
+    folder = tempfile.mkdtemp(prefix="camera_adjuster_bench_")
+    results = {}
+    try:
+        for path in make_test_images(folder, width, height):
+            results[os.path.basename(path)] = {}
+            for key, scale_on_decode in [["full", False], ["scaled", True]]:
+                context = multiprocessing.get_context("spawn")
+                with futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    results[os.path.basename(path)][key] = pool.submit(decode_in_process, path, 
+                                                                       size, scale_on_decode).result()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return results
+
+def bench_camera_handle(camera="perspShape", iterations=2000):
+    '''Compare nudges per second of a locked attribute through string-formatted cmds calls 
+       (the old path), through a cached CameraHandle, through CameraHandle.nudge(), and through
+       the direct plug write UndoSession uses for in-between values.
+       NOTE: > Needs a real Maya session. Run it from Maya's Script Editor:
+                   from camera_adjuster import benchmark
+                   benchmark.bench_camera_handle()'''
+    from maya import cmds
+    from . import view
+    view.get_backend().load_plugin()
+
+    def cmds_nudge():
+        parent = cmds.listRelatives(camera, parent=True)[0]
+        attribute_name = "{}.{}".format(parent, "tx")
+        value = cmds.getAttr(attribute_name)
+        if cmds.getAttr(attribute_name, lock=True):
+            cmds.setAttr(attribute_name, lock=False)
+            cmds.setAttr(attribute_name, value)
+            cmds.setAttr(attribute_name, lock=True)
+        else:
+            cmds.setAttr(attribute_name, value)
+        cmds.getAttr("{}.horizontalPan".format(camera))
+
+    def handle_nudge():
+        handle = view.get_camera_handle(camera)
+        value = handle.get("tx")
+        if handle.is_locked("tx"):
+            handle.set_locked("tx", False)
+            handle.set("tx", value)
+            handle.set_locked("tx", True)
+        else:
+            handle.set("tx", value)
+        handle.get("horizontalPan")
+
+    def modifier_nudge():
+        handle = view.get_camera_handle(camera)
+        handle.nudge("tx", 0.0)
+        handle.get("horizontalPan")
+
+    def plug_nudge():
+        handle = view.get_camera_handle(camera)
+        handle.set_unlocked("tx", 0.0, relative=True, undoable=False)
+        handle.get("horizontalPan")
+
+    results = {}
+    handle = view.get_camera_handle(camera)
+    locked = handle.is_locked("tx")
+    handle.set_locked("tx", True)
+    # Keep thousands of no-op writes out of the undo queue
+    undo_state = cmds.undoInfo(query=True, stateWithoutFlush=True)
+    cmds.undoInfo(stateWithoutFlush=False)
+    try:
+        for name, nudge in [["cmds", cmds_nudge], ["handle", handle_nudge], ["modifier", modifier_nudge],
+                            ["plug", plug_nudge]]:
+            start = time.perf_counter()
+            for num in range(iterations):
+                nudge()
+            results[name] = iterations / (time.perf_counter() - start)
+    finally:
+        cmds.undoInfo(stateWithoutFlush=undo_state)
+        handle.set_locked("tx", locked)
+    print("Locked nudges per second, {}:".format(camera))
+    print("    cmds + listRelatives : {:10.1f}".format(results["cmds"]))
+    print("    CameraHandle         : {:10.1f}".format(results["handle"]))
+    print("    CameraHandle.nudge   : {:10.1f}".format(results["modifier"]))
+    print("    cached plug write    : {:10.1f}".format(results["plug"]))
+
+    return results
+
+# ----- #
+# Input Traces
+# ----- #
+def make_drag_trace(duration=2.0, rate=250, width=960, height=540):
+    '''A pan drag in the CameraView: press, a looping path sampled at "rate" Hz, release.'''
+    center = [width / 2.0, height / 2.0]
+    events = [{"time": 0.0, "target": "view", "type": "press", "pos": center}]
+    count = int(duration * rate)
+    for num in range(1, count + 1):
+        angle = 2 * math.pi * num / count
+        pos = [center[0] + math.sin(angle) * width / 4, center[1] + math.sin(angle * 2) * height / 6]
+        events.append({"time": float(num) / rate, "target": "view", "type": "move", "pos": pos})
+    events.append({"time": duration + 0.01, "target": "view", "type": "release", "pos": pos})
+
+    return {"name": "drag", "setup": {}, "events": events}
+
+def make_wheel_trace(bursts=4, notches=12, rate=60, gap=0.6, width=960, height=540):
+    '''Bursts of wheel notches over the CameraView, alternating zoom in and out.'''
+    events = []
+    start = 0.0
+    for burst in range(bursts):
+        delta = 120 if burst % 2 == 0 else -120
+        for num in range(notches):
+            events.append({"time": start + float(num) / rate, "target": "view", "type": "wheel", 
+                           "pos": [width / 2.0, height / 2.0], "delta": delta})
+        start += float(notches) / rate + gap
+
+    return {"name": "wheel", "setup": {}, "events": events}
+
+def make_key_hold_trace(holds=3, hold_time=1.0, repeat_rate=30, delay=0.5):
+    '''Up/down arrow holds on the NavGrid, with OS auto-repeat presses at "repeat_rate" Hz after "delay".'''
+    events = []
+    start = 0.0
+    for hold in range(holds):
+        key = "Up" if hold % 2 == 0 else "Down"
+        events.append({"time": start, "target": "nav", "type": "key_press", "key": key, "auto_repeat": False})
+        repeat = start + delay
+        while repeat < start + hold_time:
+            events.append({"time": repeat, "target": "nav", "type": "key_press", "key": key, "auto_repeat": True})
+            repeat += 1.0 / repeat_rate
+        events.append({"time": start + hold_time, "target": "nav", "type": "key_release", "key": key, 
+                       "auto_repeat": False})
+        start += hold_time + 0.3
+
+    return {"name": "key_hold", "setup": {}, "events": events}
+
+def make_camera_switch_trace(switches=60, rate=20, cameras=50):
+    '''Rapid camera picker switching in a scene with "cameras" extra cameras.'''
+    events = [{"time": float(num) / rate, "target": "combo", "type": "camera", "index": (num * 7) % cameras}
+              for num in range(switches)]
+
+    return {"name": "camera_switch", "setup": {"cameras": cameras}, "events": events}
+
+def make_image_load_trace(loads=4, gap=1.0):
+    '''Swap the current camera's imagePlane between large images (cold loads, then cache hits).'''
+    images = [[8000, 6000, "jpg"], [6000, 4000, "png"]]
+    events = [{"time": num * gap, "target": "tool", "type": "image", "image": num % len(images)}
+              for num in range(loads)]
+
+    return {"name": "image_load", "setup": {"images": images}, "events": events}
+
+def get_traces():
+    '''Get the built-in traces by name.'''
+    traces = [make_drag_trace(), make_wheel_trace(), make_key_hold_trace(), 
+              make_camera_switch_trace(), make_image_load_trace()]
+
+    return collections.OrderedDict([[each["name"], each] for each in traces])
+
+def save_json(data, path):
+    with open(path, "w") as json_file:
+        json.dump(data, json_file, indent=2, sort_keys=True)
+
+def load_json(path):
+    with open(path) as json_file:
+        return json.load(json_file)
+
+def percentile(values, pct):
+    '''Get the nearest-rank percentile of a list of numbers.'''
+    if not values:
+        return 0.0
+    values = sorted(values)
+
+    return values[min(len(values) - 1, max(0, int(math.ceil(pct / 100.0 * len(values))) - 1))]
+
+def make_trace_images(trace, folder):
+    '''Write the test images a trace's setup asks for. Returns their paths.'''
+    image_paths = []
+    for width, height, image_format in trace.get("setup", {}).get("images", []):
+        image_paths += make_test_images(folder, width, height, formats=[image_format])
+
+    return image_paths
+
+def setup_tool(trace, folder, image_paths=None):
+    '''Open a CameraAdjuster against a fresh FakeBackend, with the scene a trace asks for.
+       Returns [view module, FakeBackend, tool, image paths].'''
+    view, fake_backend = import_view()
+    # Pinned, so replays don't depend on the render profile the tool would pick on this machine
+    fake_backend.set_option(view.RENDER_PROFILE_OPTION_VAR, trace.get("setup", {}).get("render_profile", "quality"))
+    for num in range(trace.get("setup", {}).get("cameras", 0)):
+        fake_backend.add_camera_nodes("benchCamera{}".format(num + 1), "persp")
+    if image_paths is None:
+        image_paths = make_trace_images(trace, folder)
+    if image_paths:
+        fake_backend.create_image_plane(fake_backend.get_current_camera(), "")
+    # Start cold, and keep proxies out of the user's cache folder
+    view.IMAGE_CACHE.clear()
+    view.PROXY_CACHE.folder = os.path.join(folder, "proxies")
+    tool = view.CameraAdjuster()
+    # Trace positions are in pixels of the view they were made for
+    tool.grid_widget.setFixedSize(TRACE_VIEW_SIZE[0], TRACE_VIEW_SIZE[1])
+    tool.show()
+    get_app().processEvents()
+
+    return [view, fake_backend, tool, image_paths]
+
+def dispatch_event(view, fake_backend, tool, image_paths, event):
+    '''Send one trace event to the tool. Returns {event type: milliseconds} of the handlers run.'''
+    app = get_app()
+    timings = {}
+    start = time.perf_counter()
+    if event["target"] == "view":
+        viewport = tool.grid_widget.viewport()
+        pos = QtCore.QPointF(event["pos"][0], event["pos"][1])
+        if event["type"] == "wheel":
+            qt_event = QtGui.QWheelEvent(pos, viewport.mapToGlobal(pos), QtCore.QPoint(), 
+                                         QtCore.QPoint(0, event["delta"]), QtCore.Qt.NoButton, 
+                                         QtCore.Qt.NoModifier, QtCore.Qt.NoScrollPhase, False)
+            start = time.perf_counter()
+            app.sendEvent(viewport, qt_event)
+        else:
+            event_type = {"press"  : QtCore.QEvent.MouseButtonPress,
+                          "move"   : QtCore.QEvent.MouseMove,
+                          "release": QtCore.QEvent.MouseButtonRelease}[event["type"]]
+            buttons = QtCore.Qt.NoButton if event["type"] == "release" else QtCore.Qt.LeftButton
+            start = time.perf_counter()
+            send_mouse(viewport, event_type, event["pos"], buttons)
+    elif event["target"] == "nav":
+        event_type = QtCore.QEvent.KeyPress if event["type"] == "key_press" else QtCore.QEvent.KeyRelease
+        qt_event = QtGui.QKeyEvent(event_type, getattr(QtCore.Qt, "Key_" + event["key"]), 
+                                   QtCore.Qt.NoModifier, "", event.get("auto_repeat", False))
+        start = time.perf_counter()
+        app.sendEvent(tool.transform_widget, qt_event)
+    elif event["target"] == "combo":
+        tool.combo_box.setCurrentIndex(event["index"] % max(1, tool.combo_box.count()))
+    elif event["target"] == "tool" and event["type"] == "image":
+        image_plane = fake_backend.get_image_planes(fake_backend.get_current_camera())[0]
+        fake_backend.set_string_attr(image_plane, "imageName", image_paths[event["image"]])
+        tool.change_image_display()
+        timings["image"] = (time.perf_counter() - start) * 1000
+        # Also time until the decoded image is on screen
+        while isinstance(tool.image_plane_point, view.CameraImagePoint) and tool.image_plane_point.task:
+            app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+        timings["image_ready"] = (time.perf_counter() - start) * 1000
+        return timings
+    timings[event["type"]] = (time.perf_counter() - start) * 1000
+
+    return timings
+
+def replay_trace(trace, realtime=True, image_paths=None):
+    '''Replay a trace against the tool on a FakeBackend.
+        Parameters:
+                trace       : Trace dictionary, see get_traces() or TraceRecorder.
+                realtime    : If True, events are sent at their recorded times and the event loop 
+                              runs in between, like a real session. If False, as fast as possible.
+                image_paths : Images made by make_trace_images(). Made here if not given, 
+                              which adds the memory used to write them to the peak.
+        NOTES:
+            > Allocations are traced with tracemalloc, which slows Python down. 
+            Compare latencies against baselines made the same way.
+            > Returns {"latency_ms": {event type: {"p50", "p90", "p99", "max", "count"}}, 
+                       "backend_calls": {call: count}, "alloc_peak_kb", "alloc_kb", "peak_rss_mb", "duration"}
+    '''
+    folder = tempfile.mkdtemp(prefix="camera_adjuster_trace_")
+    app = get_app()
+    try:
+        view, fake_backend, tool, image_paths = setup_tool(trace, folder, image_paths)
+        fake_backend.calls.clear()
+        latencies = collections.defaultdict(list)
+        tracemalloc.start()
+        start = time.perf_counter()
+        for event in trace["events"]:
+            while realtime and time.perf_counter() - start < event["time"]:
+                app.processEvents()
+            for event_type, elapsed in dispatch_event(view, fake_backend, tool, image_paths, event).items():
+                latencies[event_type].append(elapsed)
+            app.processEvents()
+        # Let timers finish the interaction (wheel timeout, held key release, pending writes)
+        settle = time.perf_counter()
+        while time.perf_counter() - settle < 0.5:
+            app.processEvents()
+        duration = time.perf_counter() - start
+        alloc_kb, alloc_peak_kb = [each / 1024.0 for each in tracemalloc.get_traced_memory()]
+        tracemalloc.stop()
+        tool.close()
+        view.IMAGE_THREAD_POOL.waitForDone()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    report = {"latency_ms"   : {},
+              "backend_calls": dict(fake_backend.calls),
+              "alloc_kb"     : alloc_kb,
+              "alloc_peak_kb": alloc_peak_kb,
+              "peak_rss_mb"  : peak_memory(),
+              "duration"     : duration}
+    for event_type, values in latencies.items():
+        report["latency_ms"][event_type] = dict([["p{}".format(each), percentile(values, each)] 
+                                                 for each in PERCENTILES])
+        report["latency_ms"][event_type]["max"] = max(values)
+        report["latency_ms"][event_type]["count"] = len(values)
+
+    return report
+
+def run_suite(traces=None, realtime=True):
+    '''Replay each trace in its own fresh process, so peak memory belongs to that trace alone.
+       Returns a report: {"environment": {...}, "traces": {name: replay_trace() result}}'''
+    traces = traces or list(get_traces().values())
+    report = {"environment": {"python"  : platform.python_version(),
+                              "qt"      : QtCore.qVersion(),
+                              "platform": platform.platform()},
+              "traces": collections.OrderedDict()}
+    context = multiprocessing.get_context("spawn")
+    folder = tempfile.mkdtemp(prefix="camera_adjuster_images_")
+    try:
+        for trace in traces:
+            # Written here so making the images doesn't count towards the trace's peak memory
+            image_paths = make_trace_images(trace, folder)
+            with futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                report["traces"][trace["name"]] = pool.submit(replay_trace, trace, realtime, 
+                                                              image_paths).result()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return report
+
+def print_report(report):
+    '''Print a run_suite() report.'''
+    for name, result in report["traces"].items():
+        print("{} ({:.1f} s, peak RSS {:.1f} MB, traced allocations peak {:.1f} KB)".format(
+              name, result["duration"], result["peak_rss_mb"], result["alloc_peak_kb"]))
+        for event_type, stats in sorted(result["latency_ms"].items()):
+            print("    {:<12} n={:<5d} ".format(event_type, stats["count"]) + 
+                  "  ".join(["p{}={:8.3f}".format(each, stats["p{}".format(each)]) for each in PERCENTILES]) + 
+                  "  max={:8.3f} ms".format(stats["max"]))
+        calls = ", ".join(["{}={}".format(key, val) for key, val in sorted(result["backend_calls"].items())])
+        print("    backend calls: {}".format(calls or "none"))
+
+def compare_reports(report, baseline, tolerance=BASELINE_TOLERANCE):
+    '''Compare a report against a saved baseline. Returns a list of regressions, 
+       each [trace, metric, baseline value, new value].
+        NOTES:
+            > Latency percentiles and peak allocations are compared with "tolerance", 
+            backend call counts must not grow at all.
+            > Latencies under 0.05 ms are ignored, they're mostly timer noise.
+    '''
+    regressions = []
+    for name, result in report["traces"].items():
+        old = baseline["traces"].get(name)
+        if not old:
+            continue
+        for event_type, stats in result["latency_ms"].items():
+            for key in ["p{}".format(each) for each in PERCENTILES]:
+                before = old["latency_ms"].get(event_type, {}).get(key)
+                if before is not None and stats[key] > 0.05 and stats[key] > before * (1 + tolerance):
+                    regressions.append([name, "{} {} ms".format(event_type, key), before, stats[key]])
+        for call, count in result["backend_calls"].items():
+            before = old["backend_calls"].get(call, 0)
+            if count > before:
+                regressions.append([name, "{} calls".format(call), before, count])
+        if result["alloc_peak_kb"] > old["alloc_peak_kb"] * (1 + tolerance):
+            regressions.append([name, "alloc_peak_kb", old["alloc_peak_kb"], result["alloc_peak_kb"]])
+
+    return regressions
+
+def main(argv=None):
+    '''Command line entry point, see the module docstring. Returns 1 if --compare found regressions.'''
+    parser = argparse.ArgumentParser(prog="camera_adjuster.benchmark", 
+                                     description="Replay input traces against the Camera Adjuster tool.")
+    parser.add_argument("--traces", nargs="+", choices=list(get_traces()), help="Built-in traces to run.")
+    parser.add_argument("--trace-file", nargs="+", default=[], help="Recorded trace JSON files to run.")
+    parser.add_argument("--save", help="Save the report as a JSON baseline.")
+    parser.add_argument("--compare", help="Compare against a saved JSON baseline.")
+    parser.add_argument("--tolerance", type=float, default=BASELINE_TOLERANCE, 
+                        help="Fraction a latency may grow by before --compare flags it.")
+    parser.add_argument("--fast", action="store_true", help="Send events as fast as possible, not at their recorded times.")
+    parser.add_argument("--micro", action="store_true", help="Run the older single-purpose benchmarks instead.")
+    args = parser.parse_args(argv)
+    if args.micro:
+        run_micro_benchmarks()
+        return 0
+    traces = [get_traces()[each] for each in args.traces or []] + [load_json(each) for each in args.trace_file]
+    report = run_suite(traces, realtime=not args.fast)
+    print_report(report)
+    if args.save:
+        save_json(report, args.save)
+    if args.compare:
+        regressions = compare_reports(report, load_json(args.compare), args.tolerance)
+        print("Compared to {}: {}".format(args.compare, "{} regression(s)".format(len(regressions)) 
+                                                      if regressions else "no regressions"))
+        for name, metric, before, after in regressions:
+            print("    {:<14} {:<28} {:>10.3f} -> {:>10.3f}".format(name, metric, before, after))
+        return 1 if regressions else 0
+
+    return 0
+
+def run_micro_benchmarks():
+    '''Run the single-purpose benchmarks and print the results.'''
+    print("One second pan drag, attribute writes per second / undo entries (1000 Hz mouse):")
+    for name, write_rate in [["write every move", 0], ["once per frame", None]]:
+        print("    {:<17}: {:8.1f} / {:d}".format(name, *bench_pan_drag(write_rate=write_rate)))
+    print("Holding the up key for one second, distance / attribute writes / undo entries:")
+    for repeat_rate in [15, 30, 60]:
+        print("    {:>2} Hz key repeat : {:6.2f} / {:4d} / {:d}".format(repeat_rate, *bench_key_hold(repeat_rate)))
+    print("CameraView paint with every guide on, ms per paint (pan cached / pan uncached / zoom redraw):")
+    for density in [3, 64]:
+        print("    {:>2} x {:<2} grid       : {:6.3f} / {:6.3f} / {:6.3f}".format(
+              density, density, *[bench_grid_paint(density, mode) for mode in ["pan", "pan_uncached", "zoom"]]))
+    print("Opening the tool, first / later opens (ms): {:.1f} / {:.1f}".format(*bench_startup()))
+    print("Building the transform pad (ms / widgets):")
+    for name, result in bench_nav_build().items():
+        print("    {:<18}: {:6.2f} / {:d}".format(name, *result))
+    print("CameraView paint by render profile, 6000x4000 reference image at 2x zoom (ms per paint):")
+    for name, milliseconds in bench_render_profiles().items():
+        print("    {:<18}: {:6.3f}".format(name, milliseconds))
+    stats = bench_dispatcher()
+    print("4 threads x 2000 setAttrs on 4 plugs through MainThreadDispatcher:")
+    print("    setAttr calls run: {setAttr}, merged: {merged}, max queue depth: {max_depth}".format(**stats))
+    print("    latency ms avg / p95 / max: {latency_avg:.2f} / {latency_p95:.2f} / {latency_max:.2f}".format(**stats))
+    print("Reference image decode to 1920x1080 (time ms / peak memory MB):")
+    for name, result in bench_image_decode().items():
+        print("    {:<28} full: {:8.1f} / {:7.1f}    at display size: {:8.1f} / {:7.1f}".format(
+              name, result["full"][0], result["full"][1], result["scaled"][0], result["scaled"][1]))
+
+
+# ================================================================================================ #
+# CLASS
+class TraceRecorder(QtCore.QObject):
+    '''Records a user's input on an open CameraAdjuster as a trace for replay_trace().
+        Parameters:
+                tool : The CameraAdjuster window to record.
+                name : Name of the trace.
+        NOTES:
+            > Works inside Maya too. From the Script Editor:
+                  from camera_adjuster import view, benchmark
+                  recorder = benchmark.TraceRecorder(view.start_up(), "my_drag")
+                  # ...use the tool...
+                  recorder.save("C:/traces/my_drag.json")
+            > Camera switches are recorded as picker rows. When replayed in a scene with fewer 
+            cameras they wrap around.
+    '''
+    keys = dict([[getattr(QtCore.Qt, "Key_" + each), each] for each in ["Up", "Down", "Left", "Right"]])
+
+    def __init__(self, tool, name="recorded"):
+        super(TraceRecorder, self).__init__(parent=tool)
+        self.tool = tool
+        self.name = name
+        self.events = []
+        self.clock = QtCore.QElapsedTimer()
+        self.clock.start()
+        self.viewport = tool.grid_widget.viewport()
+        self.viewport.installEventFilter(self)
+        tool.transform_widget.installEventFilter(self)
+        tool.combo_box.currentIndexChanged.connect(self.camera_changed)
+
+    def add(self, event):
+        event["time"] = self.clock.elapsed() / 1000.0
+        self.events.append(event)
+
+    def eventFilter(self, obj, event):
+        mouse_types = {QtCore.QEvent.MouseButtonPress  : "press",
+                       QtCore.QEvent.MouseMove         : "move",
+                       QtCore.QEvent.MouseButtonRelease: "release"}
+        if obj is self.viewport and event.type() in mouse_types:
+            self.add({"target": "view", "type": mouse_types[event.type()], 
+                      "pos": [event.pos().x(), event.pos().y()]})
+        elif obj is self.viewport and event.type() == QtCore.QEvent.Wheel:
+            self.add({"target": "view", "type": "wheel", "pos": [event.position().x(), event.position().y()], 
+                      "delta": event.angleDelta().y()})
+        elif (obj is self.tool.transform_widget and event.type() in [QtCore.QEvent.KeyPress, QtCore.QEvent.KeyRelease] 
+              and event.key() in self.keys):
+            self.add({"target": "nav", "type": "key_press" if event.type() == QtCore.QEvent.KeyPress else "key_release",
+                      "key": self.keys[event.key()], "auto_repeat": event.isAutoRepeat()})
+
+        return False
+
+    def camera_changed(self, index):
+        self.add({"target": "combo", "type": "camera", "index": index})
+
+    def trace(self):
+        '''Get the recorded trace.'''
+        return {"name": self.name, "setup": {"cameras": max(0, self.tool.combo_box.count() - 4)}, 
+                "events": list(self.events)}
+
+    def save(self, path):
+        '''Save the recorded trace to a JSON file.'''
+        save_json(self.trace(), path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+'''
+# ================================================================================================ #
+Camera Adjuster Commands
+
+Purpose: Maya commands the Camera Adjuster tool uses to edit cameras in as few graph updates as possible.
+
+Dependencies:
+            maya
+            maya.api.OpenMaya
+
+Commands:
+    cameraAdjusterSetAttr <plug> <value> [-relative]
+        Sets a numeric plug, even if it is locked, with one MDGModifier and one undo entry.
+        Values are in UI units (ex. degrees for rotations), like setAttr.
+        -relative (-r): Add the value to the plug's current value instead.
+        Returns the plug's new value.
+
+Example:
+    from maya import cmds
+    cmds.loadPlugin("<path>/camera_adjuster/plugins/cameraAdjusterCmds.py")
+    cmds.cameraAdjusterSetAttr("persp.tx", 1.0, relative=True)
+'''
+# ================================================================================================ #
+# IMPORT
+from maya.api import OpenMaya
+
+# ================================================================================================ #
+# VARIABLES
+RELATIVE_FLAG = ["-r", "-relative"]
+
+# ================================================================================================ #
+# FUNCTIONS
+def maya_useNewAPI():
+    '''Tells Maya this plugin uses the Python API 2.0.'''
+    pass
+
+def initializePlugin(plugin):
+    plugin_fn = OpenMaya.MFnPlugin(plugin, "Eric Hug", "1.0")
+    plugin_fn.registerCommand(SetAttrCommand.name, SetAttrCommand.creator, SetAttrCommand.syntax)
+
+def uninitializePlugin(plugin):
+    plugin_fn = OpenMaya.MFnPlugin(plugin)
+    plugin_fn.deregisterCommand(SetAttrCommand.name)
+
+def get_unit_type(plug):
+    '''Get the MFnUnitAttribute unit type of a plug, or None if it isn't a unit attribute.'''
+    attribute = plug.attribute()
+    if not attribute.hasFn(OpenMaya.MFn.kUnitAttribute):
+        return None
+
+    return OpenMaya.MFnUnitAttribute(attribute).unitType()
+
+# ================================================================================================ #
+# CLASS
+class SetAttrCommand(OpenMaya.MPxCommand):
+    '''Sets a numeric plug in a single MDGModifier. Locked plugs are unlocked only for the
+       duration of the modifier, so the edit is one graph evaluation and one undo entry.'''
+    name = "cameraAdjusterSetAttr"
+
+    def __init__(self):
+        super(SetAttrCommand, self).__init__()
+        self.plug = None
+        self.modifier = None
+
+    @staticmethod
+    def creator():
+        return SetAttrCommand()
+
+    @staticmethod
+    def syntax():
+        syntax = OpenMaya.MSyntax()
+        syntax.addArg(OpenMaya.MSyntax.kString)
+        syntax.addArg(OpenMaya.MSyntax.kDouble)
+        syntax.addFlag(RELATIVE_FLAG[0], RELATIVE_FLAG[1])
+
+        return syntax
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        arg_data = OpenMaya.MArgDatabase(self.syntax(), args)
+        selection = OpenMaya.MSelectionList()
+        selection.add(arg_data.commandArgumentString(0))
+        self.plug = selection.getPlug(0)
+        value = arg_data.commandArgumentDouble(1)
+        if arg_data.isFlagSet(RELATIVE_FLAG[0]):
+            value += self.get_value()
+        self.modifier = OpenMaya.MDGModifier()
+        unit_type = get_unit_type(self.plug)
+        if unit_type == OpenMaya.MFnUnitAttribute.kAngle:
+            self.modifier.newPlugValueMAngle(self.plug, OpenMaya.MAngle(value, OpenMaya.MAngle.uiUnit()))
+        elif unit_type == OpenMaya.MFnUnitAttribute.kDistance:
+            self.modifier.newPlugValueMDistance(self.plug, OpenMaya.MDistance(value, OpenMaya.MDistance.uiUnit()))
+        else:
+            self.modifier.newPlugValueDouble(self.plug, value)
+        self.redoIt()
+        self.setResult(value)
+
+    def redoIt(self):
+        self.apply(self.modifier.doIt)
+
+    def undoIt(self):
+        self.apply(self.modifier.undoIt)
+
+    def apply(self, function):
+        '''Run a modifier function with the plug unlocked, then restore its lock.'''
+        locked = self.plug.isLocked
+        if locked:
+            self.plug.isLocked = False
+        try:
+            function()
+        finally:
+            if locked:
+                self.plug.isLocked = True
+
+    def get_value(self):
+        '''Get the plug's value in UI units.'''
+        unit_type = get_unit_type(self.plug)
+        if unit_type == OpenMaya.MFnUnitAttribute.kAngle:
+            return self.plug.asMAngle().asUnits(OpenMaya.MAngle.uiUnit())
+        if unit_type == OpenMaya.MFnUnitAttribute.kDistance:
+            return self.plug.asMDistance().asUnits(OpenMaya.MDistance.uiUnit())
+
+        return self.plug.asDouble()
@@ -0,0 +1,75 @@
+'''
+# ================================================================================================ #
+Camera Adjuster Test Helpers
+
+Purpose: Offscreen Qt and FakeBackend setup shared by the headless tests.
+
+Dependencies:
+            PySide2 / PySide6
+
+    NOTE: > Runs on Qt's "offscreen" platform, so it must not be run from inside Maya.
+'''
+# ================================================================================================ #
+# IMPORT
+import os
+
+try:
+    from PySide2 import QtWidgets, QtCore, QtGui
+except:
+    from PySide6 import QtWidgets, QtCore, QtGui
+
+# ================================================================================================ #
+# FUNCTIONS
+def get_app():
+    '''Get (or create) a QApplication on the offscreen platform.
+       NOTE: > Must run before view.py is imported, view.py builds widgets at import time.'''
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance()
+    if not app:
+        app = QtWidgets.QApplication([])
+
+    return app
+
+def import_view():
+    '''Import view.py against a fresh FakeBackend. Returns [view module, FakeBackend].'''
+    from .. import backend
+    fake_backend = backend.set_backend(backend.FakeBackend())
+    get_app()
+    from .. import view
+
+    return [view, fake_backend]
+
+def send_mouse(widget, event_type, pos, buttons, button=None):
+    '''Send a synthetic mouse event to a widget. "button" defaults to the left button, none for moves.'''
+    if button is None:
+        button = QtCore.Qt.NoButton if event_type == QtCore.QEvent.MouseMove else QtCore.Qt.LeftButton
+    local_pos = QtCore.QPointF(pos[0], pos[1])
+    event = QtGui.QMouseEvent(event_type, local_pos, widget.mapToGlobal(local_pos),
+                              button, buttons, QtCore.Qt.NoModifier)
+    get_app().sendEvent(widget, event)
+
+def send_key(widget, event_type, key, auto_repeat=False):
+    '''Send a synthetic key event to a widget.'''
+    get_app().sendEvent(widget, QtGui.QKeyEvent(event_type, key, QtCore.Qt.NoModifier, "", auto_repeat))
+
+def send_wheel(widget, pos, notches=1.0):
+    '''Send a synthetic mouse wheel event to a widget, "notches" of 15 degrees.'''
+    local_pos = QtCore.QPointF(pos[0], pos[1])
+    event = QtGui.QWheelEvent(local_pos, widget.mapToGlobal(local_pos), QtCore.QPoint(), 
+                              QtCore.QPoint(0, int(notches * 120)), QtCore.Qt.NoButton, QtCore.Qt.NoModifier, 
+                              QtCore.Qt.NoScrollPhase, False)
+    get_app().sendEvent(widget, event)
+
+
+# ================================================================================================ #
+# CLASS
+class FakeClock(object):
+    '''Stand-in for a QElapsedTimer, so hold timing can be stepped by hand.'''
+    def __init__(self):
+        self.milliseconds = 0
+
+    def start(self):
+        self.milliseconds = 0
+
+    def elapsed(self):
+        return self.milliseconds
@@ -0,0 +1,87 @@
+'''
+# ================================================================================================ #
+Camera Adjuster Backend Tests
+
+Purpose: To check that backend.FakeBackend behaves like MayaBackend where the tool relies on it.
+
+Dependencies:
+            PySide2 / PySide6
+
+Example:
+    python -m unittest camera_adjuster.tests.test_backend
+
+    NOTE: > Runs on Qt's "offscreen" platform, so it must not be run from inside Maya.
+'''
+# ================================================================================================ #
+# IMPORT
+import unittest
+
+from .helpers import import_view
+
+# ================================================================================================ #
+# CLASS
+class CameraHandleTest(unittest.TestCase):
+    def setUp(self):
+        self.view, self.backend = import_view()
+
+    def test_handles_are_reused(self):
+        handle = self.view.get_camera_handle("perspShape")
+        self.assertIs(self.view.get_camera_handle("perspShape"), handle)
+        self.view.invalidate_camera_handles()
+        self.assertIsNot(self.view.get_camera_handle("perspShape"), handle)
+
+    def test_renamed_camera_name_taken_by_another(self):
+        self.backend.add_camera_nodes("shot", "persp")
+        old_handle = self.view.get_camera_handle("shotShape")
+        self.backend.rename_camera("shotShape", "shotRenamedShape")
+        # Another camera takes the old name while nothing is listening for renames
+        self.backend.add_camera_nodes("shot", "persp")
+        handle = self.view.get_camera_handle("shotShape")
+        self.assertIsNot(handle, old_handle)
+        handle.set("horizontalPan", 0.5)
+        self.assertEqual(self.backend.get_attr("shotShape.horizontalPan"), 0.5)
+        self.assertEqual(self.backend.get_attr("shotRenamedShape.horizontalPan"), 0.0)
+
+    def test_plug_write_leaves_no_undo_entry(self):
+        handle = self.view.get_camera_handle("perspShape")
+        handle.set_locked("tx", True)
+        self.backend.undo_queue = []
+        self.assertEqual(handle.set_unlocked("tx", 2.0, relative=True, undoable=False), 2.0)
+        self.assertEqual(self.backend.undo_queue, [])
+        self.assertEqual(handle.set_unlocked("tx", 1.0, relative=True), 3.0)
+        self.assertEqual(self.backend.undo_queue, [[["persp.tx", "value", 2.0, 3.0]]])
+
+    def test_locked_nudge_is_one_undo_entry(self):
+        handle = self.view.get_camera_handle("perspShape")
+        handle.set_locked("tx", True)
+        self.backend.undo_queue = []
+        with self.assertRaises(RuntimeError):
+            handle.set("tx", 1.0)
+        self.assertEqual(handle.nudge("tx", 1.5), 1.5)
+        self.assertTrue(handle.is_locked("tx"))
+        self.assertEqual(len(self.backend.undo_queue), 1)
+        self.backend.undo()
+        self.assertEqual(handle.get("tx"), 0.0)
+        self.assertTrue(handle.is_locked("tx"))
+
+
+class CameraCallbackTest(unittest.TestCase):
+    def setUp(self):
+        self.view, self.backend = import_view()
+        self.added = []
+        self.backend.add_callbacks({"camera_added": self.added.append})
+
+    def test_added_camera_resolves_after_rename(self):
+        transform, shape = self.backend.create_camera()
+        # Like Maya, the callback gets a node, resolved to a name when it is read
+        self.backend.rename_camera(shape, "heroShape")
+        self.assertEqual(self.backend.get_camera_entry(self.added[0]), ["heroShape", "persp"])
+
+    def test_deleted_camera_has_no_entry(self):
+        transform, shape = self.backend.create_camera()
+        self.backend.delete_camera(shape)
+        self.assertIsNone(self.backend.get_camera_entry(self.added[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
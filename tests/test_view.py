@@ -0,0 +1,429 @@
+'''
+# ================================================================================================ #
+Camera Adjuster View Tests
+
+Purpose: To check the tool's Maya traffic (calls, writes and undo entries) against backend.FakeBackend.
+
+Dependencies:
+            PySide2 / PySide6
+
+Example:
+    python -m unittest camera_adjuster.tests.test_view
+
+    NOTE: > Runs on Qt's "offscreen" platform, so it must not be run from inside Maya.
+'''
+# ================================================================================================ #
+# IMPORT
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+try:
+    from PySide2 import QtCore, QtGui, QtWidgets
+except:
+    from PySide6 import QtCore, QtGui, QtWidgets
+
+from .helpers import import_view, get_app, send_mouse, send_key, send_wheel, FakeClock
+
+# ================================================================================================ #
+# CLASS
+class ToolTestCase(unittest.TestCase):
+    '''Opens a CameraAdjuster against a fresh FakeBackend for every test.'''
+    cameras = 0
+
+    def setUp(self):
+        self.view, self.backend = import_view()
+        self.backend.set_option(self.view.RENDER_PROFILE_OPTION_VAR, "quality")
+        for num in range(self.cameras):
+            self.backend.add_camera_nodes("benchCamera{}".format(num + 1), "persp")
+        self.folder = tempfile.mkdtemp(prefix="camera_adjuster_test_")
+        self.view.PROXY_CACHE.folder = os.path.join(self.folder, "proxies")
+        self.view.PLANE_PROXY_CACHE.folder = os.path.join(self.folder, "image_plane_proxies")
+        self.tool = self.view.CameraAdjuster()
+        self.tool.show()
+        get_app().processEvents()
+        self.backend.calls.clear()
+        self.backend.undo_queue = []
+
+    def tearDown(self):
+        self.tool.close()
+        self.tool.deleteLater()
+        self.view.IMAGE_THREAD_POOL.waitForDone()
+        get_app().processEvents()
+        self.view.PROXY_CACHE.folder = ""
+        self.view.PLANE_PROXY_CACHE.folder = ""
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def pick_camera(self, camera):
+        self.tool.combo_box.setCurrentIndex(self.tool.combo_box.findText(camera))
+        get_app().processEvents()
+
+    def make_image(self, name, size=4096):
+        '''Write a "size" x "size" PNG to the test folder. Returns its path.'''
+        image = QtGui.QImage(size, size, QtGui.QImage.Format_RGB32)
+        image.fill(QtGui.QColor(90, 20, 200))
+        path = os.path.join(self.folder, name)
+        image.save(path)
+
+        return path
+
+
+class CameraPickerTest(ToolTestCase):
+    cameras = 3
+
+    def test_pick_looks_through_once(self):
+        self.tool.camera_type_box.setCurrentIndex(self.tool.camera_type_box.findData("persp"))
+        self.assertEqual(self.backend.calls["look_through"], 0)
+        # Pinning the new camera drops perspShape's row, which used to re-run change_camera()
+        self.pick_camera("benchCamera2Shape")
+        self.assertEqual(self.backend.calls["look_through"], 1)
+        self.assertEqual(self.backend.get_current_camera(), "benchCamera2Shape")
+        self.assertEqual(self.tool.selected_camera(), "benchCamera2Shape")
+
+
+class PanTest(ToolTestCase):
+    def drag(self, points):
+        viewport = self.tool.grid_widget.viewport()
+        send_mouse(viewport, QtCore.QEvent.MouseButtonPress, points[0], QtCore.Qt.LeftButton)
+        for each in points[1:]:
+            send_mouse(viewport, QtCore.QEvent.MouseMove, each, QtCore.Qt.LeftButton)
+        send_mouse(viewport, QtCore.QEvent.MouseButtonRelease, points[-1], QtCore.Qt.NoButton)
+
+    def test_click_leaves_no_undo_step(self):
+        center = self.tool.grid_widget.viewport().rect().center()
+        self.drag([[center.x(), center.y()]])
+        self.assertEqual(self.backend.undo_queue, [])
+        self.assertEqual(self.backend.calls["set_attr_unlocked"] + self.backend.calls["set_plug"], 0)
+
+    def test_drag_leaves_one_undo_step(self):
+        center = self.tool.grid_widget.viewport().rect().center()
+        self.drag([[center.x(), center.y()], [center.x() + 10, center.y() + 7], [center.x() + 20, center.y() + 14]])
+        self.assertEqual(len(self.backend.undo_queue), 1)
+        self.assertEqual(sorted(each[0] for each in self.backend.undo_queue[0]),
+                         ["perspShape.horizontalPan", "perspShape.verticalPan"])
+
+    def test_drag_checks_undo_once(self):
+        center = self.tool.grid_widget.viewport().rect().center()
+        self.drag([[center.x(), center.y()]] + [[center.x() + num, center.y() + num] for num in range(1, 30)])
+        self.assertEqual(self.backend.calls["undo_enabled"], 1)
+        self.assertEqual(self.backend.calls["set_undo_enabled"], 0)
+        # Both start values, read once when the drag's first write begins the session
+        self.assertEqual(self.backend.calls["get_attr"], 2)
+        self.assertEqual(self.backend.calls["set_attr_unlocked"], 2)
+        self.assertEqual(len(self.backend.undo_queue), 1)
+
+    def test_first_move_writes_both_pan_values(self):
+        viewport = self.tool.grid_widget.viewport()
+        center = viewport.rect().center()
+        send_mouse(viewport, QtCore.QEvent.MouseButtonPress, [center.x(), center.y()], QtCore.Qt.LeftButton)
+        send_mouse(viewport, QtCore.QEvent.MouseMove, [center.x() + 10, center.y() + 7], QtCore.Qt.LeftButton)
+        # Straight to the cached plugs, the undoable command only runs on release
+        self.assertEqual(self.backend.calls["set_plug"], 2)
+        self.assertEqual(self.backend.calls["set_attr_unlocked"], 0)
+        self.assertNotEqual(self.backend.get_attr("perspShape.horizontalPan"), 0.0)
+        self.assertNotEqual(self.backend.get_attr("perspShape.verticalPan"), 0.0)
+        send_mouse(viewport, QtCore.QEvent.MouseButtonRelease, [center.x() + 10, center.y() + 7], QtCore.Qt.NoButton)
+
+
+class ZoomTest(ToolTestCase):
+    def test_wheel_burst_is_coalesced(self):
+        widget = self.tool.grid_widget
+        center = widget.viewport().rect().center()
+        for num in range(20):
+            send_wheel(widget.viewport(), [center.x(), center.y()], 1.0)
+        # The first notch is written right away, the rest wait for the next frame
+        self.assertEqual(self.backend.calls["set_plug"], 1)
+        widget.end_wheel()
+        self.assertEqual(self.backend.calls["set_attr_unlocked"], 1)
+        self.assertAlmostEqual(self.backend.get_attr("perspShape.zoom"), 1 / widget.zoom)
+        self.assertEqual(len(self.backend.undo_queue), 1)
+
+    def test_zoom_follows_wheel_angle(self):
+        widget = self.tool.grid_widget
+        center = widget.viewport().rect().center()
+        send_wheel(widget.viewport(), [center.x(), center.y()], 0.5)
+        self.assertAlmostEqual(widget.zoom, 1.05 ** 0.5)
+
+
+class PosingModeTest(ToolTestCase):
+    def setUp(self):
+        super(PosingModeTest, self).setUp()
+        self.addCleanup(setattr, self.view.POSING_MODE, "mode", self.view.POSING_MODE.mode)
+        self.view.POSING_MODE.mode = "bounding_box"
+
+    def test_drag_draws_bounding_boxes(self):
+        viewport = self.tool.grid_widget.viewport()
+        center = viewport.rect().center()
+        send_mouse(viewport, QtCore.QEvent.MouseButtonPress, [center.x(), center.y()], QtCore.Qt.LeftButton)
+        send_mouse(viewport, QtCore.QEvent.MouseMove, [center.x() + 10, center.y() + 7], QtCore.Qt.LeftButton)
+        self.assertEqual(self.backend.get_editor_settings("modelPanel4", ["displayAppearance"]),
+                         {"displayAppearance": "boundingBox"})
+        send_mouse(viewport, QtCore.QEvent.MouseButtonRelease, [center.x() + 10, center.y() + 7], QtCore.Qt.NoButton)
+        self.assertEqual(self.backend.get_editor_settings("modelPanel4", ["displayAppearance"]),
+                         {"displayAppearance": "smoothShaded"})
+        self.assertEqual(self.backend.calls["refresh"], 1)
+
+    def test_click_leaves_viewport_alone(self):
+        viewport = self.tool.grid_widget.viewport()
+        center = viewport.rect().center()
+        send_mouse(viewport, QtCore.QEvent.MouseButtonPress, [center.x(), center.y()], QtCore.Qt.LeftButton)
+        send_mouse(viewport, QtCore.QEvent.MouseButtonRelease, [center.x(), center.y()], QtCore.Qt.NoButton)
+        self.assertEqual(self.backend.calls["set_editor_settings"], 0)
+        self.assertEqual(self.backend.calls["refresh"], 0)
+
+
+class NavGridTest(ToolTestCase):
+    def click(self, pos, release_pos=None):
+        widget = self.tool.transform_widget
+        release_pos = release_pos or pos
+        send_mouse(widget, QtCore.QEvent.MouseButtonPress, [pos.x(), pos.y()], QtCore.Qt.LeftButton)
+        send_mouse(widget, QtCore.QEvent.MouseButtonRelease, [release_pos.x(), release_pos.y()], QtCore.Qt.NoButton)
+
+    def test_hit_testing(self):
+        widget = self.tool.transform_widget
+        for cell in range(6):
+            for zone in ["up", "down"]:
+                self.assertEqual(widget.cell_at(widget.button_rect(cell, zone).center()), [cell, zone])
+            label = QtCore.QPoint(widget.button_rect(cell, "up").left() - 2, widget.cell_rect(cell).center().y())
+            self.assertEqual(widget.cell_at(label), [cell, "label"])
+        self.assertEqual(widget.cell_at(QtCore.QPoint(-5, -5)), [-1, None])
+
+    def test_click_nudges_locked_attribute(self):
+        widget = self.tool.transform_widget
+        handle = self.view.get_camera_handle("perspShape")
+        handle.set_locked("ry", True)
+        self.backend.undo_queue = []
+        self.click(widget.button_rect(4, "down").center())
+        self.assertEqual(handle.get("ry"), -1.0)
+        self.assertTrue(handle.is_locked("ry"))
+        self.assertEqual(len(self.backend.undo_queue), 1)
+
+    def test_release_off_the_button_does_nothing(self):
+        widget = self.tool.transform_widget
+        self.click(widget.button_rect(0, "up").center(), widget.cell_rect(0).center())
+        self.assertEqual(self.view.get_camera_handle("perspShape").get("tx"), 0.0)
+        self.assertEqual(self.backend.undo_queue, [])
+
+    def test_left_right_keys_wrap(self):
+        widget = self.tool.transform_widget
+        widget.select_cell(-1)
+        send_key(widget, QtCore.QEvent.KeyPress, QtCore.Qt.Key_Left)
+        self.assertEqual(widget.attr, "rz")
+        send_key(widget, QtCore.QEvent.KeyPress, QtCore.Qt.Key_Right)
+        self.assertEqual(widget.attr, "tx")
+
+    def test_hold_moves_by_elapsed_time(self):
+        widget = self.tool.transform_widget
+        widget.hold_clock = FakeClock()
+        handle = self.view.get_camera_handle("perspShape")
+        widget.select_cell(0)
+        send_key(widget, QtCore.QEvent.KeyPress, QtCore.Qt.Key_Up)
+        self.assertEqual(handle.get("tx"), 1.0)
+        # OS key repeats are dropped
+        send_key(widget, QtCore.QEvent.KeyPress, QtCore.Qt.Key_Up, auto_repeat=True)
+        self.assertEqual(handle.get("tx"), 1.0)
+        # Nothing moves until "hold_delay" has passed
+        widget.hold_clock.milliseconds = 300
+        widget.hold_step()
+        self.assertEqual(handle.get("tx"), 1.0)
+        widget.hold_clock.milliseconds = 1300
+        widget.hold_step()
+        speed = self.view.hold_speed(0.5, widget.hold_curve, widget.max_multiplier, widget.ramp_time)
+        self.assertAlmostEqual(handle.get("tx"), 1.0 + widget.hold_rate * speed)
+        send_key(widget, QtCore.QEvent.KeyRelease, QtCore.Qt.Key_Up)
+        self.assertEqual(len(self.backend.undo_queue), 1)
+        self.assertFalse(widget.hold_timer.isActive())
+
+
+class RenderProfileTest(ToolTestCase):
+    def test_every_profile_caches_the_grid(self):
+        widget = self.tool.grid_widget
+        for name in self.view.RENDER_PROFILES:
+            widget.set_render_profile(name)
+            self.assertEqual(widget.cacheMode(), QtWidgets.QGraphicsView.CacheBackground)
+
+    def test_benchmark_times_one_profile_per_pass(self):
+        self.tool.choose_render_profile()
+        self.assertEqual(list(self.tool.render_timings), [list(self.view.RENDER_PROFILES)[0]])
+        while self.tool.render_timings:
+            get_app().processEvents()
+        self.assertIn(self.backend.get_option(self.view.RENDER_PROFILE_AUTO_OPTION_VAR, ""), 
+                      self.view.RENDER_PROFILES)
+
+    def test_benchmark_waits_for_a_drag(self):
+        viewport = self.tool.grid_widget.viewport()
+        center = viewport.rect().center()
+        send_mouse(viewport, QtCore.QEvent.MouseButtonPress, [center.x(), center.y()], QtCore.Qt.LeftButton)
+        self.tool.choose_render_profile()
+        self.assertEqual(self.tool.render_timings, {})
+        send_mouse(viewport, QtCore.QEvent.MouseButtonRelease, [center.x(), center.y()], QtCore.Qt.NoButton)
+
+    def test_picking_a_profile_stops_the_benchmark(self):
+        self.tool.choose_render_profile()
+        self.tool.set_render_profile("direct")
+        get_app().processEvents()
+        self.assertIsNone(self.tool.render_timings)
+        self.assertEqual(self.tool.grid_widget.render_profile, "direct")
+
+
+class ProxyImagePlaneTest(ToolTestCase):
+    def test_unreadable_image_is_left_alone(self):
+        path = self.make_image("big.png")
+        truncated = os.path.join(self.folder, "truncated.png")
+        with open(path, "rb") as source, open(truncated, "wb") as target:
+            target.write(source.read()[:2000])
+        image_plane = self.backend.create_image_plane("perspShape", truncated)[1]
+        self.assertFalse(self.view.proxy_image_plane(image_plane))
+        self.view.IMAGE_THREAD_POOL.waitForDone()
+        get_app().processEvents()
+        self.assertEqual(self.backend.get_string_attr(image_plane, "imageName"), truncated)
+        self.assertFalse(self.view.is_proxied(image_plane))
+
+    def test_unwritable_cache_is_left_alone(self):
+        path = self.make_image("big.png")
+        blocker = os.path.join(self.folder, "not_a_folder")
+        open(blocker, "w").close()
+        self.view.PLANE_PROXY_CACHE.folder = os.path.join(blocker, "image_plane_proxies")
+        image_plane = self.backend.create_image_plane("perspShape", path)[1]
+        self.view.proxy_image_plane(image_plane)
+        self.view.IMAGE_THREAD_POOL.waitForDone()
+        get_app().processEvents()
+        self.assertEqual(self.backend.get_string_attr(image_plane, "imageName"), path)
+
+    def test_proxy_swap_leaves_no_undo_step(self):
+        path = self.make_image("big.png")
+        image_plane = self.backend.create_image_plane("perspShape", path)[1]
+        # Built on the image thread pool, the imagePlane keeps its image until the proxy is written
+        self.assertFalse(self.view.proxy_image_plane(image_plane))
+        self.assertEqual(self.backend.get_string_attr(image_plane, "imageName"), path)
+        self.view.IMAGE_THREAD_POOL.waitForDone()
+        get_app().processEvents()
+        self.assertTrue(self.view.is_proxied(image_plane))
+        self.assertEqual(self.view.get_original_image(image_plane), path)
+        self.view.restore_image_plane(image_plane)
+        self.assertEqual(self.backend.get_string_attr(image_plane, "imageName"), path)
+        self.assertEqual(self.backend.undo_queue, [])
+
+
+class ImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.view, self.backend = import_view()
+
+    def test_least_recently_used_is_evicted(self):
+        pixmap = QtGui.QPixmap(10, 10)
+        cache = self.view.ImageCache(budget=self.view.ImageCache.pixmap_bytes(pixmap) * 2)
+        cache.put("a", pixmap)
+        cache.put("b", pixmap)
+        cache.get("a")
+        cache.put("c", pixmap)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_edited_file_gets_a_new_key(self):
+        handle, path = tempfile.mkstemp(suffix=".png")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        key = self.view.ImageCache.key(path, [100, 100])
+        os.utime(path, (time.time() + 10, time.time() + 10))
+        self.assertNotEqual(self.view.ImageCache.key(path, [100, 100]), key)
+
+
+class ProxyCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.view, self.backend = import_view()
+        self.folder = tempfile.mkdtemp(prefix="camera_adjuster_test_")
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        self.cache = self.view.ProxyCache(folder=os.path.join(self.folder, "proxies"), max_size=64)
+
+    def make_image(self, name):
+        image = QtGui.QImage(256, 128, QtGui.QImage.Format_RGB32)
+        image.fill(QtGui.QColor(90, 20, 200))
+        path = os.path.join(self.folder, name)
+        image.save(path)
+
+        return [path, image]
+
+    def test_round_trip(self):
+        path, image = self.make_image("a.png")
+        self.assertEqual(self.cache.get(path), "")
+        self.assertTrue(self.cache.write(path, image))
+        proxy = QtGui.QImage(self.cache.get(path))
+        self.assertEqual([proxy.width(), proxy.height()], [64, 32])
+        # An edited image doesn't get the old proxy
+        os.utime(path, (time.time() + 10, time.time() + 10))
+        self.assertEqual(self.cache.get(path), "")
+
+    def test_prune_keeps_recent_proxies_and_open_files(self):
+        paths = [self.make_image("{}.png".format(each)) for each in "abc"]
+        for num, [path, image] in enumerate(paths):
+            self.cache.write(path, image)
+            proxy = self.cache.proxy_path(path)
+            os.utime(proxy, (num, num))
+        writing = os.path.join(self.cache.folder, "unfinished.tmp")
+        with open(writing, "wb") as temp_file:
+            temp_file.write(b"x" * 4096)
+        self.cache.max_bytes = sum(os.path.getsize(self.cache.proxy_path(path)) for path, image in paths[1:])
+        self.cache.prune()
+        self.assertFalse(os.path.isfile(self.cache.proxy_path(paths[0][0])))
+        self.assertTrue(all(os.path.isfile(self.cache.proxy_path(path)) for path, image in paths[1:]))
+        self.assertTrue(os.path.isfile(writing))
+
+    def test_parallel_writes_of_one_proxy(self):
+        path, image = self.make_image("a.png")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.write(path, image))) for num in range(6)]
+        for each in threads:
+            each.start()
+        for each in threads:
+            each.join()
+        self.assertEqual(results, [True] * 6)
+        self.assertEqual(os.listdir(self.cache.folder), [os.path.basename(self.cache.proxy_path(path))])
+
+
+class MainThreadDispatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.view, self.backend = import_view()
+        self.dispatcher = self.view.MainThreadDispatcher()
+
+    def run_queue(self):
+        while self.dispatcher.depth():
+            get_app().processEvents()
+
+    def test_runs_in_queued_order(self):
+        reads = []
+        self.dispatcher.set_attr("persp.tx", 1.0)
+        self.dispatcher.submit(lambda: reads.append(self.backend.get_attr("persp.tx")))
+        self.dispatcher.set_attr("persp.tx", 2.0)
+        self.dispatcher.set_attr("persp.tx", 3.0)
+        self.dispatcher.submit(lambda: reads.append(self.backend.get_attr("persp.tx")))
+        self.run_queue()
+        self.assertEqual(reads, [1.0, 3.0])
+        # Only the back to back writes were merged
+        self.assertEqual(self.dispatcher.stats()["merged"], 1)
+        self.assertEqual(self.backend.calls["set_attr"], 2)
+
+    def test_worker_thread_gets_result(self):
+        results = []
+        worker = threading.Thread(target=lambda: results.append(
+                                  self.dispatcher.submit(self.backend.get_current_camera).result(timeout=5)))
+        worker.start()
+        while worker.is_alive():
+            get_app().processEvents()
+        self.assertEqual(results, ["perspShape"])
+
+
+class IconRegistryTest(unittest.TestCase):
+    def test_icon_per_size(self):
+        view, fake_backend = import_view()
+        name = sorted(os.listdir(view.ICON_FOLDER))[0]
+        self.assertIsNot(view.ICONS.icon(name, 16), view.ICONS.icon(name, 64))
+        self.assertIn(QtCore.QSize(64, 64), view.ICONS.icon(name, 64).availableSizes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,9 +5,7 @@ Camera Adjuster 2.0.1
 Purpose: To pose camera for modeling objects from reference images
 
 Dependencies:
-            maya
-            OpenMaya
-            OpenMayaUI
+            maya (through backend.py, optional)
             PySide2 / PySide6
 
 Author: Eric Hug
@@ -24,32 +22,37 @@ Example:
 # IMPORT
 import os
 import sys
+import math
+import time
+import hashlib
 import logging
+import tempfile
+import threading
+import collections
+from concurrent import futures
 from importlib import reload
-from functools import partial
+from functools import partial, wraps
 
 try:
     from PySide2 import QtWidgets, QtCore, QtGui
-    from PySide2.QtWidgets import QAction
-    from shiboken2 import wrapInstance
+    from PySide2.QtWidgets import QAction, QActionGroup
 except:
     from PySide6 import QtWidgets, QtCore, QtGui
-    from PySide6.QtGui import QAction
-    from shiboken6 import wrapInstance
-from maya import cmds
-from maya import OpenMaya
-from maya import OpenMayaUI
+    from PySide6.QtGui import QAction, QActionGroup
+from .backend import get_backend, start_tracing, stop_tracing, traced
 
 # ================================================================================================ #
 # VARIABLES
 LOG = logging.getLogger(__name__)
-MENUBAR_STYLESHEET_ACTIVE = '''
-QMenuBar {
+# Folder of the tool's icons, see IconRegistry
+ICON_FOLDER = os.path.join(os.path.dirname(os.path.realpath(__file__)), "icons")
+# The tool's only stylesheet, set once on CameraAdjuster and cascaded to its children by object name
+STYLESHEET = '''
+QMenuBar#CameraAdjusterMenuBar {
     background: rgb(55,55,55);
     color: lightgrey;
 }
-'''
-STYLESHEET = '''
+
 QPushButton {
     background: #555;
     border: 0px solid #333;
@@ -62,16 +65,104 @@ QPushButton:hover {
     color: white;
     background: #666;
 }
+
 QTextEdit#OutputWin_textEdit {font: 24pt Courier; color: lightgrey; font-size: 10pt;}
 '''
+# Camera picker type filters: [label, camera type]. An empty type shows every camera.
+CAMERA_TYPE_FILTERS = [["All", ""], 
+                       ["Perspective", "persp"], 
+                       ["Orthographic", "ortho"], 
+                       ["Startup", "startup"]]
+# optionVar remembering if new imagePlanes are pointed at proxy images
+PROXY_OPTION_VAR = "cameraAdjusterProxyImagePlanes"
+# imagePlane attribute holding the original image while the plane shows a proxy
+PROXY_ORIGINAL_ATTR = "cameraAdjusterOriginalImage"
+# optionVars remembering the interactive posing display mode and the display layer it isolates
+POSING_OPTION_VAR = "cameraAdjusterPosingMode"
+POSING_LAYER_OPTION_VAR = "cameraAdjusterPosingLayer"
+# Interactive posing display modes: [label, mode]. An empty mode leaves the viewport alone.
+POSING_MODES = [["Off", ""], 
+                ["Suspend Viewport Refresh", "suspend"], 
+                ["Bounding Boxes", "bounding_box"], 
+                ["Textures Off", "textures_off"]]
+# optionVars remembering the CameraView grid: density (cells across the pan area), guides shown, custom guide size
+GRID_OPTION_VAR = "cameraAdjusterGridDensity"
+GRID_GUIDES_OPTION_VAR = "cameraAdjusterGridGuides"
+GRID_CUSTOM_OPTION_VAR = "cameraAdjusterCustomGrid"
+# CameraView grid densities: [label, cells across the pan area]
+GRID_DENSITIES = [["3 x 3", 3], 
+                  ["6 x 6", 6], 
+                  ["12 x 12", 12]]
+# Guides CameraView can draw over the film: [label, guide]
+GRID_GUIDES = [["Rule of Thirds", "thirds"], 
+               ["Golden Ratio", "golden"], 
+               ["Safe Action", "safe_action"], 
+               ["Safe Title", "safe_title"], 
+               ["Custom Grid", "custom"]]
+# Fraction of the film inside the safe action and safe title frames
+SAFE_AREAS = {"safe_action": 0.9, 
+              "safe_title" : 0.8}
+# optionVars remembering the CameraView render profile picked by the user ("" for automatic) and by benchmark
+RENDER_PROFILE_OPTION_VAR = "cameraAdjusterRenderProfile"
+RENDER_PROFILE_AUTO_OPTION_VAR = "cameraAdjusterAutoRenderProfile"
+# Milliseconds the render profile benchmark waits for the window to show or the user to stop working the view
+RENDER_BENCHMARK_WAIT = 500
+# How CameraView and its reference image are rendered, by profile name, see CameraView.set_render_profile().
+# The grid and guides are cached in every profile, see CameraView.
+#     item_cache       : QGraphicsItem cache mode of the reference image
+#     update_mode      : QGraphicsView viewport update mode
+#     optimization     : QGraphicsView optimization flags
+#     preblend         : Draw a copy of the reference image with its opacity already applied
+RENDER_PROFILES = collections.OrderedDict()
+RENDER_PROFILES["quality"] = {"label"           : "Quality", 
+                              "item_cache"      : QtWidgets.QGraphicsItem.NoCache,
+                              "update_mode"     : QtWidgets.QGraphicsView.MinimalViewportUpdate,
+                              "optimization"    : [],
+                              "preblend"        : False}
+RENDER_PROFILES["direct"] = {"label"           : "Direct", 
+                             "item_cache"      : QtWidgets.QGraphicsItem.NoCache,
+                             "update_mode"     : QtWidgets.QGraphicsView.MinimalViewportUpdate,
+                             "optimization"    : [QtWidgets.QGraphicsView.DontSavePainterState, 
+                                                  QtWidgets.QGraphicsView.DontAdjustForAntialiasing],
+                             "preblend"        : False}
+RENDER_PROFILES["preblended"] = {"label"           : "Pre-blended", 
+                                 "item_cache"      : QtWidgets.QGraphicsItem.NoCache,
+                                 "update_mode"     : QtWidgets.QGraphicsView.BoundingRectViewportUpdate,
+                                 "optimization"    : [QtWidgets.QGraphicsView.DontSavePainterState, 
+                                                      QtWidgets.QGraphicsView.DontAdjustForAntialiasing],
+                                 "preblend"        : True}
+RENDER_PROFILES["cached"] = {"label"           : "Cached", 
+                             "item_cache"      : QtWidgets.QGraphicsItem.DeviceCoordinateCache,
+                             "update_mode"     : QtWidgets.QGraphicsView.MinimalViewportUpdate,
+                             "optimization"    : [QtWidgets.QGraphicsView.DontSavePainterState, 
+                                                  QtWidgets.QGraphicsView.DontAdjustForAntialiasing],
+                             "preblend"        : False}
+RENDER_PROFILES["cached_preblended"] = {"label"           : "Cached, Pre-blended", 
+                                        "item_cache"      : QtWidgets.QGraphicsItem.DeviceCoordinateCache,
+                                        "update_mode"     : QtWidgets.QGraphicsView.BoundingRectViewportUpdate,
+                                        "optimization"    : [QtWidgets.QGraphicsView.DontSavePainterState, 
+                                                             QtWidgets.QGraphicsView.DontAdjustForAntialiasing],
+                                        "preblend"        : True}
+# Speed multipliers for a held arrow key in NavGrid, by the seconds the key has been held. 
+# "ramp_time" is how long a curve takes to reach "max_multiplier".
+HOLD_CURVES = {"constant": lambda t: 0.0,
+               "linear"  : lambda t: t,
+               "ease_in" : lambda t: t * t}
+# Upper edges (ms) of the handler latency histogram buckets, see HandlerLatency. Slower samples go in one last bucket.
+LATENCY_BUCKETS = [1, 2, 4, 8, 16, 33, 66, 100]
+# Reference images are decoded here instead of on Maya's GUI thread
+IMAGE_THREAD_POOL = QtCore.QThreadPool()
+IMAGE_THREAD_POOL.setMaxThreadCount(2)
 
 # ================================================================================================ #
 # FUNCTIONS
 def start_up(width=500, height=200):
     '''Start Function for user to run the tool.'''
+    get_backend().load_plugin()
     win = get_maya_main_window()
-    for each in win.findChildren(QtWidgets.QWidget):
+    for each in (win.findChildren(QtWidgets.QWidget) if win else QtWidgets.QApplication.topLevelWidgets()):
         if each.objectName() == "CameraAdjuster":
+            each.close()
             each.deleteLater()
     tool = CameraAdjuster(parent=win)
     tool.resize(width, height)
@@ -79,17 +170,167 @@ def start_up(width=500, height=200):
 
     return tool
 
-def get_maya_main_window():
-    '''Locates Main Window, so we can parent our tool to it.'''
-    maya_window_ptr = OpenMayaUI.MQtUtil.mainWindow()
+def fit_image_size(reader, size=[100,100]):
+    '''Get the size an image fits within "size" at, keeping its aspect ratio.
+       Only reads the file header.
+        Parameters:
+                reader : QImageReader for the image file.
+                size   : [width, height] the image is scaled to fit within.
+        NOTES:
+            > The returned size is before the reader's auto-transform is applied,
+            so it can be passed directly to QImageReader.setScaledSize().
+    '''
+    target = QtCore.QSize(size[0], size[1])
+    source_size = reader.size()
+    if not source_size.isValid():
+        return target
+    # Rotated images (ex. EXIF orientation) are stored on their side
+    if reader.autoTransform() and reader.transformation() & QtGui.QImageIOHandler.TransformationRotate90:
+        target.transpose()
+
+    return source_size.scaled(target, QtCore.Qt.KeepAspectRatio)
+
+def decode_image(image_path, size=[100,100]):
+    '''Decode an image file directly at the size it will be displayed at.
+        Parameters:
+                image_path : Path to the image file.
+                size       : [width, height] the image is scaled to fit within.
+        NOTES:
+            > The decoder is told the final size before reading, so formats that can scale 
+            while decoding (ex. JPEG) never hold the full resolution image in memory.
+            > Returns a QImage, so it is safe to call from worker threads.
+    '''
+    reader = QtGui.QImageReader(image_path)
+    reader.setAutoTransform(True)
+    reader.setScaledSize(fit_image_size(reader, size))
+    image = reader.read()
+    if image.isNull():
+        LOG.warning("Unable to read image '{}': {}".format(image_path, reader.errorString()))
+
+    return image
+
+def get_cache_folder():
+    '''Get the folder the tool keeps files in between sessions (inside Maya's user app directory).'''
+    return os.path.join(get_backend().get_user_folder(), "cache")
+
+def get_camera_handle(camera):
+    '''Get the CameraHandle of a camera (shape or transform name). Handles are reused until
+       invalidate_camera_handles() is called.'''
+    return get_backend().get_camera_handle(camera)
+
+def invalidate_camera_handles():
+    '''Forget every CameraHandle. Called when nodes are renamed or deleted, 
+       since handles hold the names they were resolved with.'''
+    get_backend().invalidate_camera_handles()
+
+def get_image_plane_nodes(camera):
+    '''Get the imagePlane shape nodes attached to a camera.'''
+    return get_backend().get_image_planes(camera)
+
+def is_proxied(image_plane):
+    '''Check if an imagePlane is pointed at a proxy by proxy_image_plane().'''
+    return bool(get_backend().get_string_attr(image_plane, PROXY_ORIGINAL_ATTR))
+
+def get_original_image(image_plane):
+    '''Get the image file of an imagePlane. If it shows a proxy, the original image is returned.'''
+    if is_proxied(image_plane):
+        return get_backend().get_string_attr(image_plane, PROXY_ORIGINAL_ATTR)
+
+    return get_backend().get_string_attr(image_plane, "imageName")
+
+def get_proxied_image_planes():
+    '''Get every imagePlane in the scene that is pointed at a proxy.'''
+    return [each for each in get_backend().get_image_planes() if is_proxied(each)]
+
+def proxy_image_plane(image_plane):
+    '''Point an imagePlane at a downsampled copy of its image so the viewport uploads a smaller texture.
+       The original path is stored on the node (PROXY_ORIGINAL_ATTR) for restore_image_plane().
+       Returns True if the imagePlane now shows a proxy.
+        NOTES:
+            > A proxy that isn't in PLANE_PROXY_CACHE yet is built on IMAGE_THREAD_POOL by PLANE_PROXY_BUILDER,
+            which swaps the imagePlane once it is written. False is returned until then.
+    '''
+    original = get_original_image(image_plane)
+    if not os.path.isfile(original):
+        LOG.warning("Image '{}' of {} doesn't exist. No proxy made.".format(original, image_plane))
+        return False
+    reader = QtGui.QImageReader(original)
+    if max(reader.size().width(), reader.size().height()) <= PLANE_PROXY_CACHE.max_size:
+        # Already small enough
+        return False
+    proxy_path = PLANE_PROXY_CACHE.get(original)
+    if not proxy_path:
+        PLANE_PROXY_BUILDER.build(image_plane, original)
+        return False
+    swap_image_plane(image_plane, proxy_path, original)
+
+    return True
 
-    return wrapInstance(int(maya_window_ptr), QtWidgets.QWidget)
+def restore_image_plane(image_plane):
+    '''Point a proxied imagePlane back at its original image.'''
+    if not is_proxied(image_plane):
+        return
+    swap_image_plane(image_plane, get_original_image(image_plane), "")
+
+def swap_image_plane(image_plane, image_name, original=""):
+    '''Point an imagePlane at an image, storing "original" in PROXY_ORIGINAL_ATTR ("" once restored).
+       Proxy swaps aren't user edits, so they are kept out of Maya's undo queue.'''
+    backend = get_backend()
+    undo_state = backend.undo_enabled()
+    backend.set_undo_enabled(False)
+    try:
+        backend.set_string_attr(image_plane, PROXY_ORIGINAL_ATTR, original)
+        backend.set_string_attr(image_plane, "imageName", image_name)
+    finally:
+        backend.set_undo_enabled(undo_state)
+
+def get_maya_dispatcher():
+    '''Get the process-wide MainThreadDispatcher, making it on first use. Safe to call from any thread.'''
+    global MAYA_DISPATCHER
+    with MAYA_DISPATCHER_LOCK:
+        if MAYA_DISPATCHER is None:
+            dispatcher = MainThreadDispatcher()
+            # Batches run on the thread the dispatcher lives in
+            app = QtCore.QCoreApplication.instance()
+            if app and dispatcher.thread() != app.thread():
+                dispatcher.moveToThread(app.thread())
+            MAYA_DISPATCHER = dispatcher
+
+    return MAYA_DISPATCHER
+
+def hold_speed(hold_time, curve="ease_in", max_multiplier=8.0, ramp_time=2.0):
+    '''Get the speed multiplier of a key held for "hold_time" seconds, from 1.0 up to "max_multiplier".'''
+    amount = HOLD_CURVES[curve](min(hold_time / ramp_time, 1.0)) if ramp_time > 0 else 1.0
+    return 1.0 + (max_multiplier - 1.0) * amount
+
+def timed(function):
+    '''Decorator for UI handlers: adds how long each call took to HANDLER_LATENCY.
+        NOTES:
+            > Put it above @traced on Qt slots, traced() drops the signal arguments the slot doesn't take.
+    '''
+    name = getattr(function, "__qualname__", function.__name__)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            HANDLER_LATENCY.record(name, time.perf_counter() - start)
+
+    return wrapper
+
+def get_maya_main_window():
+    '''Locates Main Window, so we can parent our tool to it. None outside of Maya.'''
+    return get_backend().get_main_window()
 
 # ================================================================================================ #
 # CLASS
 class CameraAdjuster(QtWidgets.QWidget):
     def __init__(self, parent=None, currentTab=1):
         super(CameraAdjuster, self).__init__(parent=parent)
+        # Cameras may have been renamed or deleted while no tool was open to hear about it
+        invalidate_camera_handles()
         self.setStyleSheet(STYLESHEET)
         self.tips_str = "Tips: \n" \
                         "> You can select a \n" \
@@ -112,6 +353,55 @@ class CameraAdjuster(QtWidgets.QWidget):
         # Menus
         # ----- #
         self.menu_bar = QtWidgets.QMenuBar()
+        self.proxy_action = QAction("Use Proxy Image Planes")
+        self.proxy_action.setCheckable(True)
+        self.proxy_action.setChecked(bool(get_backend().get_option(PROXY_OPTION_VAR)))
+        self.proxy_action.setToolTip("Point image planes at downsampled copies of their images while posing.\n"
+                                     "Originals are restored on lock, export or when the tool closes.")
+        self.posing_action_group = QActionGroup(self)
+        self.posing_actions = {}
+        posing_items = {}
+        for label, mode in POSING_MODES:
+            self.posing_actions[mode] = QAction(label)
+            self.posing_actions[mode].setCheckable(True)
+            self.posing_actions[mode].setChecked(mode == POSING_MODE.mode)
+            self.posing_action_group.addAction(self.posing_actions[mode])
+            posing_items[label] = [self.posing_actions[mode], partial(self.set_posing_mode, mode)]
+        self.grid_action_group = QActionGroup(self)
+        grid_density = get_backend().get_option(GRID_OPTION_VAR, GRID_DENSITIES[0][1])
+        grid_items = {}
+        for label, density in GRID_DENSITIES:
+            action = QAction(label)
+            action.setCheckable(True)
+            action.setChecked(density == grid_density)
+            self.grid_action_group.addAction(action)
+            grid_items[label] = [action, partial(self.set_grid_density, density)]
+        self.guide_actions = {}
+        guide_items = {}
+        guides = get_backend().get_option(GRID_GUIDES_OPTION_VAR, "").split(",")
+        for label, guide in GRID_GUIDES:
+            self.guide_actions[guide] = QAction(label)
+            self.guide_actions[guide].setCheckable(True)
+            self.guide_actions[guide].setChecked(guide in guides)
+            guide_items[label] = [self.guide_actions[guide], self.set_guides]
+        guide_items["Custom Grid Size..."] = [QAction("Custom Grid Size..."), self.choose_custom_grid]
+        self.render_action_group = QActionGroup(self)
+        self.render_actions = {}
+        render_items = {}
+        render_profile = get_backend().get_option(RENDER_PROFILE_OPTION_VAR, "")
+        for label, name in [["Automatic", ""]] + [[RENDER_PROFILES[each]["label"], each] for each in RENDER_PROFILES]:
+            self.render_actions[name] = QAction(label)
+            self.render_actions[name].setCheckable(True)
+            self.render_actions[name].setChecked(name == render_profile)
+            self.render_action_group.addAction(self.render_actions[name])
+            render_items[label] = [self.render_actions[name], partial(self.set_render_profile, name)]
+        self.render_actions[""].setToolTip("Use the fastest profile on this machine, measured the first time the tool opens.")
+        self.overlay_action = QAction("Show Latency Overlay")
+        self.overlay_action.setCheckable(True)
+        self.overlay_action.setToolTip("Show paint FPS, the last handler's latency and writes waiting for Maya over the pan view.")
+        self.posing_layer_action = QAction("Isolate Display Layer...")
+        self.posing_layer_action.setToolTip("Only show one display layer while posing.")
+        posing_items["Isolate Display Layer..."] = [self.posing_layer_action, self.choose_posing_layer]
         self.menu_actions_dict = {"File": [QtWidgets.QMenu("File"), 
                                            {"Create New Camera" : [QtWidgets.QMenu("Create New Camera"), 
                                                                    {"Perspective" : [QAction("Perspective"),partial(self.new_camera, "Perspective")],
@@ -126,12 +416,28 @@ class CameraAdjuster(QtWidgets.QWidget):
                                                                                     ]
                                                                    }
                                                                   ],
-                                            "Create Image Plane": [QAction("Create Image Plane"), self.new_imagePlane]
+                                            "Create Image Plane": [QAction("Create Image Plane"), self.new_imagePlane],
+                                            "Proxy Image Planes": [QtWidgets.QMenu("Proxy Image Planes"), 
+                                                                   {"Use Proxy Image Planes" : [self.proxy_action, self.toggle_proxy_image_planes],
+                                                                    "Restore Original Images": [QAction("Restore Original Images"), self.restore_image_planes]
+                                                                   }
+                                                                  ],
+                                            "Interactive Posing": [QtWidgets.QMenu("Interactive Posing"), posing_items]
                                            }
-                                          ]
+                                          ],
+                                  "View": [QtWidgets.QMenu("View"), 
+                                           {"Grid Density": [QtWidgets.QMenu("Grid Density"), grid_items],
+                                            "Guides"      : [QtWidgets.QMenu("Guides"), guide_items],
+                                            "Render Profile": [QtWidgets.QMenu("Render Profile"), render_items]
+                                           }
+                                          ],
+                                  "Debug": [QtWidgets.QMenu("Debug"), 
+                                            {"Backend Call Tracer...": [QAction("Backend Call Tracer..."), self.show_call_tracer],
+                                             "Show Latency Overlay"  : [self.overlay_action, self.toggle_latency_overlay]}
+                                           ]
                                   }
         self.build_menu(menu=self.menu_bar, menu_items=self.menu_actions_dict)
-        self.menu_bar.setStyleSheet(MENUBAR_STYLESHEET_ACTIVE)
+        self.menu_bar.setObjectName("CameraAdjusterMenuBar")
         # ------------------------- #
         # Camera Combo Box Controls
         # ------------------------- #
@@ -140,22 +446,31 @@ class CameraAdjuster(QtWidgets.QWidget):
         self.cameras_list_widget.setLayout(self.cameras_list_hLayout)
         self.cameras_list_hLayout.setAlignment(QtCore.Qt.AlignLeft)
         self.cameras_list_hLayout.setContentsMargins(QtCore.QMargins(0,6,0,0))
+        self.camera_model = CameraListModel()
+        self.camera_filter = CameraFilterModel()
+        self.camera_filter.setSourceModel(self.camera_model)
+        self.camera_type_box = QtWidgets.QComboBox()
+        self.camera_type_box.setFixedHeight(32)
+        for label, camera_type in CAMERA_TYPE_FILTERS:
+            self.camera_type_box.addItem(label, camera_type)
+        self.camera_type_box.currentIndexChanged.connect(self.filter_cameras)
+        self.camera_type_box.setToolTip("Show only cameras of this type")
+        # Editable for type-ahead search, typing only filters the completer popup
         self.combo_box = QtWidgets.QComboBox()
         self.combo_box.setFixedHeight(32)
         self.combo_box.setFixedWidth(175)
-        self.combo_box.currentTextChanged.connect(self.change_camera)
-        self.refresh_icon = QtGui.QIcon(os.path.dirname(os.path.realpath(__file__)) + 
-                                        "/icons/refresh_btn.jpg")
-        self.refresh_btn  = QtWidgets.QPushButton(self.refresh_icon, "")
-        self.refresh_btn.setFixedSize(32, 32)
-        self.refresh_btn.clicked.connect(self.load_cameras)
-        self.refresh_btn.setStyleSheet('''QPushButton:pressed {background: rgb(200,200,200);
-                                                              }''')
-        self.refresh_btn.setToolTip("Refresh list of existing cameras")
+        self.combo_box.setEditable(True)
+        self.combo_box.setInsertPolicy(QtWidgets.QComboBox.NoInsert)
+        self.combo_box.setModel(self.camera_filter)
+        self.camera_completer = QtWidgets.QCompleter(self.camera_filter, self.combo_box)
+        self.camera_completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.camera_completer.setFilterMode(QtCore.Qt.MatchContains)
+        self.combo_box.setCompleter(self.camera_completer)
+        self.combo_box.currentIndexChanged.connect(self.change_camera)
         self.lock_settings_cbox = QtWidgets.QCheckBox("Lock Transform Attributes")
         self.lock_settings_cbox.clicked.connect(self.lock_camera)
+        self.cameras_list_hLayout.addWidget(self.camera_type_box)
         self.cameras_list_hLayout.addWidget(self.combo_box)
-        self.cameras_list_hLayout.addWidget(self.refresh_btn)
         self.cameras_list_hLayout.addWidget(self.lock_settings_cbox)
         # ------------------ #
         # # Spacer
@@ -205,11 +520,14 @@ class CameraAdjuster(QtWidgets.QWidget):
         self.body_hLayout.addWidget(self.local_camera_widget)
         # ------------------------------- #
         # # # Camera Pan Grid Control # # #
-        self.grid_size = [cmds.getAttr("defaultResolution.width"), 
-                          cmds.getAttr("defaultResolution.height")]
+        resolution = get_backend().get_render_resolution()
         self.grid_widget = CameraView(camera = self.get_current_camera(),
-                                           width  = self.grid_size[0],
-                                           height = self.grid_size[1])
+                                      aspect_ratio = float(resolution[0]) / resolution[1])
+        self.grid_size = self.grid_widget.film_size()
+        custom_grid = get_backend().get_option(GRID_CUSTOM_OPTION_VAR, "4x4").split("x")
+        self.grid_widget.set_grid(columns=grid_density, rows=grid_density, 
+                                  guides=[each for each in self.guide_actions if self.guide_actions[each].isChecked()],
+                                  custom_grid=[int(each) for each in custom_grid])
         self.local_camera_vlayout.addWidget(self.grid_widget)
         self.image_path = self.get_image_plane()
         if os.path.isfile(self.image_path):
@@ -218,6 +536,7 @@ class CameraAdjuster(QtWidgets.QWidget):
         else:
             self.image_plane_point = QtWidgets.QGraphicsRectItem()
         self.grid_widget.graph_scene.addItem(self.image_plane_point)
+        self.grid_widget.apply_render_profile(self.image_plane_point)
         self.image_plane_point.setPos(0, 0)
         self.reset_pan_btn = QtWidgets.QPushButton("Reset Camera Pan")
         self.reset_pan_btn.clicked.connect(self.grid_widget.reset_pan)
@@ -237,12 +556,52 @@ class CameraAdjuster(QtWidgets.QWidget):
         self.load_cameras()
         self.load_pan()
         self.load_zoom()
-        new_cam = self.combo_box.currentText()
-        cmds.lookThru(new_cam)
-        cmds.setAttr("{}.panZoomEnabled".format(new_cam), True)
+        new_cam = self.selected_camera()
+        get_backend().look_through(new_cam)
+        get_camera_handle(new_cam).set("panZoomEnabled", True)
         self.main_layout.setAlignment(QtCore.Qt.AlignTop)
         self.main_layout.setSpacing(0)
         self.setWindowFlags(QtCore.Qt.Window)
+        # Exported files should never point at proxy images
+        self.exported_proxies = []
+        # Keep the camera list in sync with the scene, see queue_camera_event()
+        self.camera_events = []
+        self.callback_ids = get_backend().add_callbacks({"before_export" : self.before_export,
+                                                         "after_export"  : self.after_export,
+                                                         "camera_added"  : self.camera_added,
+                                                         "camera_removed": self.camera_removed,
+                                                         "camera_renamed": self.camera_renamed,
+                                                         "scene_changed" : self.scene_changed})
+        self.check_cam_locked_state()
+        if self.proxy_action.isChecked() and not self.lock_settings_cbox.isChecked():
+            self.proxy_camera_image_planes()
+        # Made on first use, see show_call_tracer()
+        self.call_tracer_panel = None
+        # Timings of a render profile benchmark in progress, see choose_render_profile()
+        self.render_timings = None
+        auto_profile = get_backend().get_option(RENDER_PROFILE_AUTO_OPTION_VAR, "")
+        if render_profile in RENDER_PROFILES:
+            self.grid_widget.set_render_profile(render_profile)
+        elif auto_profile in RENDER_PROFILES:
+            self.grid_widget.set_render_profile(auto_profile)
+        else:
+            # Once the window is on screen and settled, so the view has its real size
+            QtCore.QTimer.singleShot(RENDER_BENCHMARK_WAIT, self.choose_render_profile)
+
+    def closeEvent(self, event):
+        '''Remove Maya callbacks, close open undo steps and restore proxied image planes when the tool closes.'''
+        if self.call_tracer_panel:
+            self.call_tracer_panel.close()
+        self.remove_callbacks()
+        self.grid_widget.end_sessions()
+        self.transform_widget.stop_hold()
+        self.restore_image_planes()
+        super(CameraAdjuster, self).closeEvent(event)
+
+    def remove_callbacks(self):
+        '''Remove every Maya callback the tool added.'''
+        get_backend().remove_callbacks(self.callback_ids)
+        self.callback_ids = []
 
 
     def build_menu(self, menu=QtWidgets.QMenu(), menu_items={}):
@@ -267,93 +626,163 @@ class CameraAdjuster(QtWidgets.QWidget):
                 menu.addAction(val[0])
                 val[0].triggered.connect(val[1])
 
+    @traced
     def new_camera(self, cam_type=""):
         '''Create a new camera for the scene.
             Parameters:
                         cam_type: Camera's type (ex. Front, Back, Left, Right, Top, Down, Perspective)'''
-        new_camera = cmds.camera(name=cam_type)
-        if cam_type == "Perspective":
-            cmds.viewSet(new_camera[0], persp=True)
-        elif cam_type == "Front":
-            cmds.viewSet(new_camera[0], front=True)
-        elif cam_type == "Back":
-            cmds.viewSet(new_camera[0], back=True)
-        elif cam_type == "Left":
-            cmds.viewSet(new_camera[0], leftSide=True)
-        elif cam_type == "Right":
-            cmds.viewSet(new_camera[0], rightSide=True)
-        elif cam_type == "Top":
-            cmds.viewSet(new_camera[0], top=True)
-        elif cam_type == "Bottom":
-            cmds.viewSet(new_camera[0], bottom=True)
-        self.load_cameras()
-        self.combo_box.setCurrentText(new_camera[1])
+        new_camera = get_backend().create_camera(cam_type)
+        # The new camera is queued by camera_added(), add it now instead of next tick
+        self.apply_camera_events()
+        self.set_current_camera(new_camera[1])
         self.change_camera()
 
     def get_cameras(self):
         '''Get all cameras in scene.'''
-        return cmds.ls(cameras=True)
+        return [each[0] for each in get_backend().get_cameras()]
+
+    def selected_camera(self):
+        '''Get the camera picked in the combobox. Text typed into the combobox is ignored.'''
+        index = self.combo_box.currentIndex()
+        if index == -1:
+            return ""
+
+        return self.combo_box.itemText(index)
+
+    def set_current_camera(self, camera):
+        '''Pick a camera in the combobox without changing the viewport's camera.'''
+        # Pinning refilters the list, which moves the current index
+        self.combo_box.blockSignals(True)
+        self.camera_filter.set_pinned(camera)
+        self.combo_box.setCurrentIndex(self.combo_box.findText(camera))
+        self.combo_box.blockSignals(False)
+
+    def filter_cameras(self):
+        '''Show only the cameras of the type picked in the type combobox. The current camera is always shown.'''
+        current_camera = self.selected_camera()
+        self.combo_box.blockSignals(True)
+        self.camera_filter.set_camera_type(self.camera_type_box.currentData())
+        self.combo_box.blockSignals(False)
+        self.set_current_camera(current_camera)
 
     def get_current_camera(self):
         '''Get the current camera being used in the active viewport.'''
-        cur_view = OpenMayaUI.M3dView.active3dView()
-        cur_cam = OpenMaya.MDagPath()
-        cur_view.getCamera(cur_cam)
-        cur_camPath = cur_cam.fullPathName()
-        cur_camPath = cur_camPath.split("|")[-1]
-
-        return cur_camPath
+        return get_backend().get_current_camera()
     
     def load_cameras(self):
         '''Load up all cameras in scene into the combobox'''
         current_camera = self.get_current_camera()
-        cameras = self.get_cameras()
         # Prevent camera in viewport being changed
         # when loading up all cameras to combobox.
         self.combo_box.blockSignals(True)
-        self.combo_box.clear()
-        for each in cameras:
-            self.combo_box.addItem(each)
-        # Restore Setting that changes camera in viewport
-        # when combobox changes text.
-        self.combo_box.setCurrentText(current_camera)
+        self.camera_model.set_cameras(get_backend().get_cameras())
         self.combo_box.blockSignals(False)
+        self.set_current_camera(current_camera)
         self.grid_widget.camera = current_camera
 
+    def camera_added(self, node):
+        '''Maya callback: a camera was created.'''
+        # Resolved to a name later, new nodes are usually renamed right after being created
+        self.queue_camera_event(["add", node])
+
+    def camera_removed(self, name):
+        '''Maya callback: a camera was deleted.'''
+        self.queue_camera_event(["remove", name])
+
+    def camera_renamed(self, old_name, new_name):
+        '''Maya callback: a camera was renamed.'''
+        self.queue_camera_event(["rename", old_name, new_name])
+
+    def scene_changed(self):
+        '''Maya callback: a scene was opened or a new scene made.'''
+        self.queue_camera_event(["reload"])
+
+    def queue_camera_event(self, event):
+        '''Store a camera change. All changes made during one event loop tick are applied 
+           together by apply_camera_events().'''
+        if not self.camera_events:
+            QtCore.QTimer.singleShot(0, self.apply_camera_events)
+        self.camera_events.append(event)
+
+    @traced
+    def apply_camera_events(self):
+        '''Update the combobox with the queued camera changes, one item at a time.'''
+        events = self.camera_events
+        self.camera_events = []
+        if not events:
+            return
+        if ["reload"] in events:
+            self.load_cameras()
+            self.change_camera()
+            return
+        current_camera = self.selected_camera()
+        self.combo_box.blockSignals(True)
+        for event in events:
+            if event[0] == "add":
+                entry = get_backend().get_camera_entry(event[1])
+                if entry:
+                    self.camera_model.add_camera(*entry)
+            elif event[0] == "remove":
+                self.camera_model.remove_camera(event[1])
+            elif event[0] == "rename":
+                self.camera_model.rename_camera(event[1], event[2])
+                if current_camera == event[1]:
+                    current_camera = event[2]
+                    self.grid_widget.camera = current_camera
+        self.combo_box.blockSignals(False)
+        if self.camera_model.has_camera(current_camera):
+            self.set_current_camera(current_camera)
+        else:
+            # The current camera was deleted, follow whatever the viewport switched to
+            self.set_current_camera(self.get_current_camera())
+            self.change_camera()
+
+    @timed
+    @traced
     def change_camera(self):
         '''Change camera when combo box text changes.'''
-        if self.combo_box.currentText():
-            new_cam = self.combo_box.currentText()
-            cmds.lookThru(new_cam)
+        if self.selected_camera():
+            new_cam = self.selected_camera()
+            self.set_current_camera(new_cam)
+            get_backend().look_through(new_cam)
             # Allow pan and zoom attributes to be adjusted when switching to new camera
-            cmds.setAttr("{}.panZoomEnabled".format(new_cam), True)
+            get_camera_handle(new_cam).set("panZoomEnabled", True)
             self.change_image_display()
             self.grid_widget.camera=new_cam
             self.load_pan()
             self.load_zoom()
             self.check_cam_locked_state()
+            if self.proxy_action.isChecked() and not self.lock_settings_cbox.isChecked():
+                self.proxy_camera_image_planes()
     
+    @traced
     def lock_camera(self):
         '''Locks camera's movement attributes so user doesn't accidentally use mouse to move by mistake'''
-        current_camera = self.combo_box.currentText()
-        transform_node = cmds.listRelatives(current_camera, parent=True)[0]
-        transform_list = ["tx", "ty", "tz", "rx", "ry", "rz"]
+        current_camera = self.selected_camera()
+        handle = get_camera_handle(current_camera)
         check = False
         if self.lock_settings_cbox.isChecked():
             check = True
-        for each in transform_list:
-            cmds.setAttr("{}.{}".format(transform_node, each), lock=check)
+        for each in handle.transform_attrs:
+            handle.set_locked(each, check)
+        # Locked cameras are done being posed, so they get their full quality images back
+        if check:
+            for each in get_image_plane_nodes(current_camera):
+                PLANE_PROXY_BUILDER.discard(each)
+                restore_image_plane(each)
+        elif self.proxy_action.isChecked():
+            self.proxy_camera_image_planes()
 
     def check_cam_locked_state(self):
         '''Updates the Locked Camera Attributes Checkbox when changing active camera'''
-        current_camera = self.combo_box.currentText()
-        transform_node = cmds.listRelatives(current_camera, parent=True)[0]
-        check = cmds.getAttr("{}.tx".format(transform_node), lock=True)
+        current_camera = self.selected_camera()
+        check = get_camera_handle(current_camera).is_locked("tx")
         self.lock_settings_cbox.setChecked(check)
 
+    @traced
     def new_imagePlane(self):
         '''Create an imagePlane for active camera'''
-        current_cam = self.combo_box.currentText()
+        current_cam = self.selected_camera()
         file_path = self.browse_command()
         # Check if no file was selected for image plane
         if len(file_path) == 0:
@@ -362,8 +791,126 @@ class CameraAdjuster(QtWidgets.QWidget):
         else:
             file_path = file_path.replace("\'", "")
         
-        cmds.imagePlane(camera=current_cam, fileName=file_path)
+        get_backend().create_image_plane(current_cam, file_path)
+        if self.proxy_action.isChecked() and not self.lock_settings_cbox.isChecked():
+            self.proxy_camera_image_planes()
         self.change_image_display()
+
+    @traced
+    def toggle_proxy_image_planes(self):
+        '''Turn proxy image planes on or off, and swap the current camera's image planes to match.'''
+        get_backend().set_option(PROXY_OPTION_VAR, int(self.proxy_action.isChecked()))
+        if not self.proxy_action.isChecked():
+            self.restore_image_planes()
+        elif not self.lock_settings_cbox.isChecked():
+            self.proxy_camera_image_planes()
+
+    def set_posing_mode(self, mode=""):
+        '''Choose how the viewport is drawn while the camera is being dragged or nudged.'''
+        POSING_MODE.mode = mode
+        get_backend().set_option(POSING_OPTION_VAR, mode)
+
+    def choose_posing_layer(self):
+        '''Pick the display layer left visible while posing, or none to show everything.'''
+        none_label = "(No Isolation)"
+        layers = [none_label] + get_backend().get_display_layers()
+        current = layers.index(POSING_MODE.layer) if POSING_MODE.layer in layers else 0
+        layer, accepted = QtWidgets.QInputDialog.getItem(self, "Isolate Display Layer", 
+                                                         "Display layer shown while posing:", 
+                                                         layers, current, False)
+        if not accepted:
+            return
+        POSING_MODE.layer = "" if layer == none_label else layer
+        get_backend().set_option(POSING_LAYER_OPTION_VAR, POSING_MODE.layer)
+
+    def set_grid_density(self, density=3):
+        '''Set how many grid cells span the CameraView's pan area, across and down.'''
+        self.grid_widget.set_grid(columns=density, rows=density)
+        get_backend().set_option(GRID_OPTION_VAR, density)
+
+    def set_guides(self):
+        '''Draw the guides checked in the "Guides" menu over the film.'''
+        guides = [guide for label, guide in GRID_GUIDES if self.guide_actions[guide].isChecked()]
+        self.grid_widget.set_grid(guides=guides)
+        get_backend().set_option(GRID_GUIDES_OPTION_VAR, ",".join(guides))
+
+    def choose_custom_grid(self):
+        '''Pick the columns and rows of the custom grid guide, and show it.'''
+        columns, accepted = QtWidgets.QInputDialog.getInt(self, "Custom Grid", "Columns:", 
+                                                          self.grid_widget.custom_grid[0], 1, 64)
+        if not accepted:
+            return
+        rows, accepted = QtWidgets.QInputDialog.getInt(self, "Custom Grid", "Rows:", 
+                                                       self.grid_widget.custom_grid[1], 1, 64)
+        if not accepted:
+            return
+        self.grid_widget.set_grid(custom_grid=[columns, rows])
+        get_backend().set_option(GRID_CUSTOM_OPTION_VAR, "{}x{}".format(columns, rows))
+        self.guide_actions["custom"].setChecked(True)
+        self.set_guides()
+
+    def set_render_profile(self, name=""):
+        '''Render the CameraView with one of RENDER_PROFILES, or "" to pick the fastest one by benchmark.'''
+        get_backend().set_option(RENDER_PROFILE_OPTION_VAR, name)
+        # Stops a benchmark that is still running
+        self.render_timings = None
+        if name:
+            self.grid_widget.set_render_profile(name)
+        else:
+            self.choose_render_profile()
+
+    def choose_render_profile(self, timings=None):
+        '''Benchmark RENDER_PROFILES in the CameraView and use the fastest one from now on.
+            NOTES:
+                > One profile is timed per pass of the event loop, and none while the window is off screen
+                or the user is working the view or the NavGrid, so the benchmark never holds up input.
+                > set_render_profile() stops a running benchmark.
+        '''
+        if timings is None:
+            timings = self.render_timings = collections.OrderedDict()
+        if timings is not self.render_timings or not self.isVisible():
+            return
+        # Painting does nothing until the window is on screen
+        window = self.window().windowHandle()
+        if (not window or not window.isExposed() or self.grid_widget.interacting() 
+            or self.transform_widget.hold_timer.isActive()):
+            QtCore.QTimer.singleShot(RENDER_BENCHMARK_WAIT, partial(self.choose_render_profile, timings))
+            return
+        remaining = [name for name in RENDER_PROFILES if name not in timings]
+        if remaining:
+            timings[remaining[0]] = self.grid_widget.benchmark_render_profile(remaining[0])
+            QtCore.QTimer.singleShot(0, partial(self.choose_render_profile, timings))
+            return
+        self.render_timings = None
+        fastest = min(timings, key=timings.get)
+        LOG.info("Render profile paint times (ms): {}. Using '{}'.".format(
+                 ", ".join(["{} {:.3f}".format(key, value) for key, value in timings.items()]), fastest))
+        get_backend().set_option(RENDER_PROFILE_AUTO_OPTION_VAR, fastest)
+        self.grid_widget.set_render_profile(fastest)
+
+    def proxy_camera_image_planes(self):
+        '''Point the current camera's image planes at proxy images.'''
+        for each in get_image_plane_nodes(self.selected_camera()):
+            proxy_image_plane(each)
+
+    def restore_image_planes(self):
+        '''Point every proxied image plane in the scene back at its original image.'''
+        PLANE_PROXY_BUILDER.cancel()
+        for each in get_proxied_image_planes():
+            restore_image_plane(each)
+
+    def before_export(self, *args):
+        '''Maya callback: restore original images so exported files never reference proxies.'''
+        self.exported_proxies = get_proxied_image_planes()
+        for each in self.exported_proxies:
+            restore_image_plane(each)
+
+    def after_export(self, *args):
+        '''Maya callback: swap back to the proxies that were restored for the export.'''
+        for each in self.exported_proxies:
+            if get_backend().node_exists(each):
+                proxy_image_plane(each)
+        self.exported_proxies = []
     
     def browse_command(self):
         '''allows user to select an image file,
@@ -383,18 +930,31 @@ class CameraAdjuster(QtWidgets.QWidget):
         return new_string
 
     def get_image_plane(self):
-        '''Get the image plane for the current camera'''
+        '''Get the image of the current camera's image plane. Proxied image planes return their original image.'''
         current_camera = self.get_current_camera()
-        image_plane = cmds.listConnections("{}.imagePlane".format(current_camera))
+        image_plane = get_image_plane_nodes(current_camera)
         if image_plane:
-            image_plane = image_plane[0]
-            image_path = cmds.getAttr("{}.imageName".format(image_plane))
+            image_path = get_original_image(image_plane[0])
         else:
             image_path = "No File Exists"
         return image_path
 
+    def toggle_latency_overlay(self):
+        self.grid_widget.set_stats_overlay(self.overlay_action.isChecked())
+
+    def show_call_tracer(self):
+        '''Open the panel listing the Maya calls each UI event made.'''
+        if not self.call_tracer_panel:
+            self.call_tracer_panel = CallTracerPanel(parent=self)
+        self.call_tracer_panel.show()
+        self.call_tracer_panel.raise_()
+
+    @timed
+    @traced
     def change_image_display(self):
         '''Changes the image shown in the CameraView when camera is changed'''
+        if isinstance(self.image_plane_point, CameraImagePoint):
+            self.image_plane_point.cancel()
         self.grid_widget.graph_scene.removeItem(self.image_plane_point)
         self.image_path = self.get_image_plane()
         if os.path.isfile(self.image_path):
@@ -403,155 +963,941 @@ class CameraAdjuster(QtWidgets.QWidget):
         else:
             self.image_plane_point = QtWidgets.QGraphicsRectItem()
         self.grid_widget.graph_scene.addItem(self.image_plane_point)
+        self.grid_widget.apply_render_profile(self.image_plane_point)
         self.image_plane_point.setPos(0, 0)
 
     def zoom_image(self):
         '''Changes the value of attribute zoom on active camera'''
-        current_cam = self.combo_box.currentText()
+        current_cam = self.selected_camera()
         val = self.zoom_widget.spinbox.value() / 100.000
-        cmds.setAttr("{}.zoom".format(current_cam), val)
+        get_camera_handle(current_cam).set("zoom", val)
         img_plane_scale = 1.0 / val
         self.image_plane_point.setScale(img_plane_scale)
 
     def reset_pan(self):
         '''Reset the pan attributes of current camera.'''
-        current_cam = self.combo_box.currentText()
-        cmds.setAttr("{}.horizontalPan".format(current_cam), 0)
-        cmds.setAttr("{}.verticalPan".format(current_cam), 0)
+        handle = get_camera_handle(self.selected_camera())
+        handle.set("horizontalPan", 0)
+        handle.set("verticalPan", 0)
 
     def load_pan(self):
         '''When camera changes, take camera's pan attribute 
            offsets and apply them to the CameraView'''
-        current_camera = self.combo_box.currentText()
-        pan_x = cmds.getAttr("{}.horizontalPan".format(current_camera))
-        pan_y = cmds.getAttr("{}.verticalPan".format(current_camera))
-        pos_x = self.grid_widget.width * pan_x
-        pos_y = self.grid_widget.height * -pan_y
-        self.grid_widget.centerOn(pos_x, pos_y)
+        handle = get_camera_handle(self.selected_camera())
+        pan_x = handle.get("horizontalPan")
+        pan_y = handle.get("verticalPan")
+        self.grid_widget.set_pan([pan_x, pan_y])
 
     def load_zoom(self):
         '''When camera changes, take the camera's zoom attribute 
            and apply it to the CameraView'''
-        current_camera = self.combo_box.currentText()
-        zoom = cmds.getAttr("{}.zoom".format(current_camera))
-        self.grid_widget.scale(1/zoom,1/zoom)
+        zoom = get_camera_handle(self.selected_camera()).get("zoom")
+        self.grid_widget.set_zoom(1/zoom)
     
 
+class CameraListModel(QtCore.QAbstractListModel):
+    '''Model of the scene's cameras for the camera picker.
+        NOTES:
+            > Each camera is stored as [name, type], type being "persp", "ortho" or "startup".
+            The type is available through the TypeRole data role.
+            > Rows are found through a name lookup, so single changes from Maya callbacks
+            don't search the whole list. set_cameras() replaces everything in one model reset.
+    '''
+    TypeRole = QtCore.Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super(CameraListModel, self).__init__(parent)
+        self.cameras = []
+        self.rows = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.cameras)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name, camera_type = self.cameras[index.row()]
+        if role in [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole]:
+            return name
+        if role == self.TypeRole:
+            return camera_type
+
+        return None
+
+    def set_cameras(self, cameras):
+        '''Replace every camera with a list of [name, type].'''
+        self.beginResetModel()
+        self.cameras = [list(each) for each in cameras]
+        self.rows = dict([[each[0], num] for num, each in enumerate(self.cameras)])
+        self.endResetModel()
+
+    def has_camera(self, name):
+        return name in self.rows
+
+    def add_camera(self, name, camera_type):
+        if name in self.rows:
+            return
+        row = len(self.cameras)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.cameras.append([name, camera_type])
+        self.rows[name] = row
+        self.endInsertRows()
+
+    def remove_camera(self, name):
+        row = self.rows.get(name)
+        if row is None:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self.cameras.pop(row)
+        del self.rows[name]
+        for each in self.cameras[row:]:
+            self.rows[each[0]] -= 1
+        self.endRemoveRows()
+
+    def rename_camera(self, old_name, new_name):
+        row = self.rows.get(old_name)
+        if row is None or new_name in self.rows:
+            return
+        del self.rows[old_name]
+        self.rows[new_name] = row
+        self.cameras[row][0] = new_name
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+
+class CameraFilterModel(QtCore.QSortFilterProxyModel):
+    '''Filters a CameraListModel by camera type.
+        NOTES:
+            > The pinned camera is always shown, so filtering never hides the camera in use.
+    '''
+    def __init__(self, parent=None):
+        super(CameraFilterModel, self).__init__(parent)
+        self.camera_type = ""
+        self.pinned = ""
+
+    def set_camera_type(self, camera_type=""):
+        '''Show only one type of camera ("persp", "ortho" or "startup"). "" shows every camera.'''
+        self.begin_filter_change()
+        self.camera_type = camera_type
+        self.end_filter_change()
+
+    def set_pinned(self, name):
+        if name != self.pinned:
+            self.begin_filter_change()
+            self.pinned = name
+            self.end_filter_change()
+
+    def begin_filter_change(self):
+        '''Call before changing what the filter accepts, and end_filter_change() after.'''
+        # invalidateFilter() is deprecated in recent Qt 6 releases, PySide2 only has invalidateFilter()
+        if hasattr(self, "endFilterChange"):
+            self.beginFilterChange()
+
+    def end_filter_change(self):
+        if hasattr(self, "endFilterChange"):
+            self.endFilterChange()
+        else:
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.camera_type:
+            return True
+        # Read the source list directly, going through index.data() is much slower for big scenes
+        name, camera_type = self.sourceModel().cameras[source_row]
+
+        return camera_type == self.camera_type or name == self.pinned
+
+
 class CameraView(QtWidgets.QGraphicsView):
     '''Camera Panning and Zooming UI Component
         Parameters:
-                width            : Width of view-widget
-                height           : Height of view-widget
-                columns          : Number of columns drawn
-                rows             : Number of rows drawn
+                aspect_ratio     : Width / height of the camera's film (ex. the render resolution's)
+                film_width       : Width of the film in scene units. The film's height follows "aspect_ratio".
+                columns          : Number of grid columns across the pan area (3 film widths)
+                rows             : Number of grid rows across the pan area (3 film heights)
                 line_thickness   : Line thickness of rows and columns drawn in the scene-widget
                 border_thickness : Line thickness of border around the child scene-widget
                 camera           : Camera being viewed through for the view to mimic
+                write_rate       : Maximum number of times per second pan and zoom values are written to the camera.
+                                   None uses the screen's refresh rate, 0 writes on every event.
+        NOTES:
+            > A drag (press to release) and a wheel gesture (until "wheel_timeout" milliseconds 
+            without wheel events) each leave a single undo step.
+            > The widget can be any size. The film is fit inside it at zoom 1, so the scene and what
+            it costs to paint don't depend on the render resolution.
+            > Pan values are in film coordinates: 1.0 is one film width (horizontal) or height (vertical),
+            see current_pan() and set_pan().
+            > The grid and guides (see GRID_GUIDES) are painted in drawBackground() and cached, so panning 
+            doesn't repaint them. The cache is redrawn when the zoom or set_grid() changes them.
+            > How the view and its reference image are rendered is set by one of RENDER_PROFILES, 
+            see set_render_profile() and benchmark_render_profiles().
     '''
-    def __init__(self, parent=None, width=300, height=300, columns=3, 
-                 rows=3, line_thickness=1, border_thickness=1, camera=""):
+    wheel_timeout = 400
+    def __init__(self, parent=None, aspect_ratio=16/9.0, film_width=640, columns=3, 
+                 rows=3, line_thickness=1, border_thickness=1, camera="", write_rate=None):
         super(CameraView, self).__init__(parent=parent)
         # Base Settings
         self.camera = camera
-        self.width = width
-        self.height = height
+        self.film_width = float(film_width)
+        self.film_height = self.film_width / aspect_ratio
         self.columns = columns
         self.rows = rows
         self.line_thickness = line_thickness
         self.border_thickness = border_thickness
+        self.guides = set()
+        self.custom_grid = [4, 4]
+        self.render_profile = "quality"
         self.startPos = None
         self.zoom = 1
+        self.write_scheduler = WriteScheduler(parent=self, max_rate=write_rate)
+        self.pan_session = UndoSession(name="cameraAdjusterPan", attrs=["horizontalPan", "verticalPan"])
+        # Pan when the current drag started, so a click without a move writes nothing
+        self.press_pan = None
+        self.zoom_session = UndoSession(name="cameraAdjusterZoom", attrs=["zoom"])
+        self.wheel_timer = QtCore.QTimer(self)
+        self.wheel_timer.setSingleShot(True)
+        self.wheel_timer.setInterval(self.wheel_timeout)
+        self.wheel_timer.timeout.connect(self.end_wheel)
+        # Latency overlay, see set_stats_overlay()
+        self.show_stats = False
+        self.paint_times = collections.deque(maxlen=120)
         # Base Component for graph to be made
-        self.setFixedSize(self.width, self.height)
         self.setObjectName("CameraView")
-        self.scale(1,1)
-        self.base_rect = QtCore.QRect(-self.width*3/2, 
-                                      -self.height*3/2, 
-                                      self.width*3, 
-                                      self.height*3)
+        self.setMinimumSize(160, 90)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        self.base_rect = QtCore.QRectF(-self.film_width*3/2, 
+                                       -self.film_height*3/2, 
+                                       self.film_width*3, 
+                                       self.film_height*3)
         self.graph_scene = CameraScene(rect=self.base_rect)
         # Viewer Settings
-        self.centerOn(0,0)
         self.setScene(self.graph_scene)
-        self.setSceneRect(-self.width*3/2, 
-                          -self.height*3/2, 
-                          self.width*3, 
-                          self.height*3)
+        self.setSceneRect(self.base_rect)
+        self.setResizeAnchor(QtWidgets.QGraphicsView.AnchorViewCenter)
+        self.fit_scale = 1.0
+        self.apply_zoom()
+        self.centerOn(0,0)
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         # # Drawing the Grid
         self.setDragMode(QtWidgets.QGraphicsView.DragMode.ScrollHandDrag)
-        self.draw_grid()
-
-    def draw_grid(self, color=QtCore.Qt.darkGray, line=QtCore.Qt.DashLine):
-        '''Draw the dotted lines that make up the grid'''
-        pos_incr_x = float(self.width*3) / self.rows
-        pos_incr_y = float(self.height*3) / self.columns
-        # print(pos_incr_x, pos_incr_y)
-        # Horizontal Lines
-        start_num = -1
-        for num in range(start_num, self.rows):
-            lineItem = QtWidgets.QGraphicsLineItem(-self.width*3/2, 
-                                                   pos_incr_y * num, 
-                                                   self.width*3, 
-                                                   pos_incr_y * num)
-            lineItem.setZValue(-1)
-            lineItem.setPen(QtGui.QPen(color, self.line_thickness, line))
-            self.graph_scene.addItem(lineItem)
-        # Vertical Lines
-        for num in range(start_num, self.columns):
-            lineItem = QtWidgets.QGraphicsLineItem(pos_incr_x * num, 
-                                                   -self.height*3/2, 
-                                                   pos_incr_x * num, 
-                                                   self.height*3)
-            lineItem.setZValue(-1)
-            lineItem.setPen(QtGui.QPen(color, self.line_thickness, line))
-            self.graph_scene.addItem(lineItem)
+        self.setCacheMode(QtWidgets.QGraphicsView.CacheBackground)
+        self.set_render_profile(self.render_profile)
+
+    def sizeHint(self):
+        return QtCore.QSize(480, int(480 * self.film_height / self.film_width))
+
+    def film_size(self):
+        '''Get the film's [width, height] in whole scene units, ex. for sizing the reference image.'''
+        return [int(round(self.film_width)), int(round(self.film_height))]
+
+    def set_grid(self, columns=None, rows=None, guides=None, custom_grid=None):
+        '''Change the grid and the guides drawn over the film. Arguments left as None are kept.
+            Parameters:
+                        guides      : Guide names from GRID_GUIDES.
+                        custom_grid : [columns, rows] of the "custom" guide.
+        '''
+        if columns:
+            self.columns = columns
+        if rows:
+            self.rows = rows
+        if guides is not None:
+            self.guides = set(guides)
+        if custom_grid:
+            self.custom_grid = list(custom_grid)
+        self.resetCachedContent()
+        self.viewport().update()
+
+    def film_rect(self):
+        return QtCore.QRectF(-self.film_width/2, -self.film_height/2, self.film_width, self.film_height)
+
+    def grid_lines(self, step_x, step_y, rect):
+        '''Get the lines inside "rect" of a grid with "step_x" by "step_y" cells, running through the film's center.'''
+        if rect.isEmpty():
+            return []
+        lines = []
+        for num in range(int(math.ceil(rect.left() / step_x)), int(math.floor(rect.right() / step_x)) + 1):
+            lines.append(QtCore.QLineF(num * step_x, rect.top(), num * step_x, rect.bottom()))
+        for num in range(int(math.ceil(rect.top() / step_y)), int(math.floor(rect.bottom() / step_y)) + 1):
+            lines.append(QtCore.QLineF(rect.left(), num * step_y, rect.right(), num * step_y))
+
+        return lines
+
+    def guide_lines(self, film):
+        '''Get the lines of the enabled ratio guides (thirds, golden ratio, custom grid) over the film.'''
+        ratios = []
+        if "thirds" in self.guides:
+            ratios.append([[1/3.0, 2/3.0], [1/3.0, 2/3.0]])
+        if "golden" in self.guides:
+            golden = 1 / ((1 + math.sqrt(5)) / 2)
+            ratios.append([[1 - golden, golden], [1 - golden, golden]])
+        if "custom" in self.guides:
+            ratios.append([[float(num) / self.custom_grid[0] for num in range(1, self.custom_grid[0])], 
+                           [float(num) / self.custom_grid[1] for num in range(1, self.custom_grid[1])]])
+        lines = []
+        for ratios_x, ratios_y in ratios:
+            for ratio in ratios_x:
+                x = film.left() + film.width() * ratio
+                lines.append(QtCore.QLineF(x, film.top(), x, film.bottom()))
+            for ratio in ratios_y:
+                y = film.top() + film.height() * ratio
+                lines.append(QtCore.QLineF(film.left(), y, film.right(), y))
+
+        return lines
+
+    def drawBackground(self, painter, rect):
+        '''Draw the grid, the guides and the pan area's border. Pens are cosmetic, so lines 
+           keep their pixel thickness at any view size or zoom.'''
+        super(CameraView, self).drawBackground(painter, rect)
+        painter.save()
+        # Grid
+        pen = QtGui.QPen(QtCore.Qt.darkGray, self.line_thickness, QtCore.Qt.DashLine)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        painter.drawLines(self.grid_lines(self.film_width * 3 / self.columns, self.film_height * 3 / self.rows, 
+                                          rect.intersected(self.base_rect)))
+        # Guides
+        film = self.film_rect()
+        if self.guides and rect.intersects(film):
+            pen = QtGui.QPen(QtGui.QColor(0, 150, 220), self.line_thickness)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawLines(self.guide_lines(film))
+            painter.drawRect(film)
+            pen.setStyle(QtCore.Qt.DotLine)
+            painter.setPen(pen)
+            for guide, fraction in SAFE_AREAS.items():
+                if guide in self.guides:
+                    margin = (1 - fraction) / 2
+                    painter.drawRect(film.adjusted(film.width() * margin, film.height() * margin, 
+                                                   -film.width() * margin, -film.height() * margin))
         # Outline
         pen = QtGui.QPen(QtCore.Qt.black, self.border_thickness, QtCore.Qt.SolidLine)
-        rect = QtWidgets.QGraphicsRectItem(self.base_rect)
-        rect.setZValue(-1)
-        rect.setPen(pen)
-        self.graph_scene.addItem(rect)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        painter.drawRect(self.base_rect)
+        painter.restore()
+
+    def resizeEvent(self, event):
+        '''Fit the film to the new size. The resize anchor keeps the same pan in view.'''
+        super(CameraView, self).resizeEvent(event)
+        self.apply_zoom()
+
+    def apply_zoom(self):
+        '''Scale the view so the film fits the widget at zoom 1, times the current zoom'''
+        viewport = self.viewport().size()
+        self.fit_scale = min(viewport.width() / self.film_width, viewport.height() / self.film_height)
+        scale = self.fit_scale * self.zoom
+        self.setTransform(QtGui.QTransform().scale(scale, scale))
 
+    def set_zoom(self, zoom):
+        '''Show the view at "zoom" (1 / the camera's zoom attribute) without writing it to the camera'''
+        self.zoom = zoom
+        self.apply_zoom()
+
+    def set_pan(self, pan):
+        '''Center the view on a camera pan [horizontalPan, verticalPan] without writing it to the camera'''
+        self.centerOn(pan[0] * self.film_width, -pan[1] * self.film_height)
+
+    @traced
     def reset_zoom(self):
-        self.zoom = 1
-        self.setTransform(QtGui.QTransform().scale(self.zoom, self.zoom))
-        cmds.setAttr("{}.zoom".format(self.camera), 1)
+        self.set_zoom(1)
+        self.write_scheduler.schedule(get_camera_handle(self.camera), "zoom", 1)
+        self.write_scheduler.flush()
 
+    @traced
     def reset_pan(self):
         self.centerOn(0,0)
-        cmds.setAttr("{}.horizontalPan".format(self.camera), 0)
-        cmds.setAttr("{}.verticalPan".format(self.camera), 0)
+        handle = get_camera_handle(self.camera)
+        self.write_scheduler.schedule_many(handle, {"horizontalPan": 0, "verticalPan": 0})
+        self.write_scheduler.flush()
 
+    @timed
+    @traced
     def wheelEvent(self, event):
-        '''Controls the Zoom between the Viewer and the Maya Camera'''
+        '''Controls the Zoom between the Viewer and the Maya Camera
+        NOTES:
+            > Zoom is scaled by the wheel's real angle, so one 15 degree notch zooms by "zoom_step"
+            and high-resolution wheels/trackpads zoom by a fraction of it.
+            > The view updates right away, the camera's zoom attribute is written once per frame.
+        '''
         zoom_magnify_max = 4.0
         zoom_magnify_min = 0.5
-        angle = event.angleDelta() / 8
-        degrees = angle.y() * 15
-        if degrees > 0:
-            self.zoom *= 1.05
-        elif degrees < 0:
-            self.zoom /= 1.05
+        zoom_step = 1.05
+        notches = event.angleDelta().y() / 120.0
+        if not notches:
+            event.ignore()
+            return
+        zoom = self.zoom * zoom_step ** notches
+        self.set_zoom(min(max(zoom, zoom_magnify_min), zoom_magnify_max))
+        self.write_scheduler.schedule(get_camera_handle(self.camera), "zoom", 1/self.zoom, 
+                                      session=self.zoom_session)
+        self.wheel_timer.start()
+        event.accept()
+
+    @traced
+    def end_wheel(self):
+        '''Write the last zoom value and close the wheel gesture's undo step'''
+        self.wheel_timer.stop()
+        self.write_scheduler.flush()
+        self.zoom_session.end()
+
+    def end_sessions(self):
+        '''Close any interaction still in progress, ex. when the tool closes mid-drag'''
+        self.end_wheel()
+        self.pan_session.end()
+
+    def set_stats_overlay(self, enabled=True):
+        '''Show paint FPS, the last timed handler's latency and the writes waiting for Maya in the top left corner.
+            NOTES:
+                > The whole viewport repaints while it's shown, so panning can't scroll a stale copy of it.
+        '''
+        self.show_stats = enabled
+        self.paint_times.clear()
+        if enabled:
+            self.setViewportUpdateMode(QtWidgets.QGraphicsView.FullViewportUpdate)
         else:
-            self.zoom = 1
-        if self.zoom > zoom_magnify_max:
-            self.zoom = zoom_magnify_max
-        if self.zoom < zoom_magnify_min:
-            self.zoom = zoom_magnify_min
-        self.setTransform(QtGui.QTransform().scale(self.zoom, self.zoom))
-        cmds.setAttr("{}.zoom".format(self.camera), 1/self.zoom)
+            self.setViewportUpdateMode(RENDER_PROFILES[self.render_profile]["update_mode"])
+        self.viewport().update()
+
+    def set_render_profile(self, name):
+        '''Render the view and the reference images in it with one of RENDER_PROFILES.'''
+        self.render_profile = name
+        profile = RENDER_PROFILES[name]
+        if not self.show_stats:
+            self.setViewportUpdateMode(profile["update_mode"])
+        for flag in [QtWidgets.QGraphicsView.DontSavePainterState, QtWidgets.QGraphicsView.DontAdjustForAntialiasing]:
+            self.setOptimizationFlag(flag, flag in profile["optimization"])
+        for item in self.graph_scene.items():
+            self.apply_render_profile(item)
+        self.viewport().update()
+
+    def apply_render_profile(self, item):
+        '''Set up a reference image added to the view for the current render profile.'''
+        if isinstance(item, CameraImagePoint):
+            profile = RENDER_PROFILES[self.render_profile]
+            item.setCacheMode(profile["item_cache"])
+            item.set_preblend(profile["preblend"])
+
+    def benchmark_render_profile(self, name, paints=20):
+        '''Time repaints under one of RENDER_PROFILES. Returns milliseconds per paint.
+            NOTES:
+                > Alternates 8 pixel pans with small zoom changes, which redraw the whole view.
+                > The view is put back at its pan, zoom and render profile afterwards.
+        '''
+        current = [self.render_profile, self.zoom, self.horizontalScrollBar().value()]
+        self.set_render_profile(name)
+        # Fill the caches the profile uses before timing it
+        self.viewport().repaint()
+        start = time.perf_counter()
+        for num in range(paints):
+            if num % 2:
+                self.horizontalScrollBar().setValue(current[2] + (num % 4 - 2) * 8)
+            else:
+                self.set_zoom(current[1] * (1.01 if num % 4 else 1.0))
+            self.viewport().repaint()
+        milliseconds = (time.perf_counter() - start) * 1000 / paints
+        self.set_zoom(current[1])
+        self.horizontalScrollBar().setValue(current[2])
+        self.set_render_profile(current[0])
+
+        return milliseconds
+
+    def benchmark_render_profiles(self, paints=20):
+        '''Time repaints under each of RENDER_PROFILES. Returns {profile name: milliseconds per paint}.'''
+        timings = collections.OrderedDict()
+        for name in RENDER_PROFILES:
+            timings[name] = self.benchmark_render_profile(name, paints)
+
+        return timings
+
+    def interacting(self):
+        '''Check if the view is being dragged or wheeled'''
+        return self.press_pan is not None or self.wheel_timer.isActive()
+
+    def paint_fps(self):
+        '''Get the paints per second over the last second of painting.'''
+        now = time.perf_counter()
+        times = [each for each in self.paint_times if now - each <= 1.0]
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def drawForeground(self, painter, rect):
+        super(CameraView, self).drawForeground(painter, rect)
+        if not self.show_stats:
+            return
+        self.paint_times.append(time.perf_counter())
+        last = HANDLER_LATENCY.last
+        lines = ["{:.0f} fps".format(self.paint_fps()),
+                 "{} {:.2f} ms".format(last[0].split(".")[-1], last[1]) if last else "no events yet",
+                 "{} writes pending".format(len(self.write_scheduler.pending) + 
+                                            (MAYA_DISPATCHER.depth() if MAYA_DISPATCHER else 0))]
+        painter.save()
+        painter.resetTransform()
+        text_rect = QtCore.QRect(4, 4, 160, painter.fontMetrics().height() * len(lines) + 4)
+        painter.fillRect(text_rect, QtGui.QColor(0, 0, 0, 160))
+        painter.setPen(QtCore.Qt.white)
+        painter.drawText(text_rect.adjusted(4, 2, 0, 0), QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, "\n".join(lines))
+        painter.restore()
+
+    def current_pan(self):
+        '''Get the camera pan values [horizontalPan, verticalPan] matching the view's center'''
+        center = self.mapToScene(self.viewport().rect()).boundingRect().center()
+        return [center.x()/self.film_width, -center.y()/self.film_height]
+
+    def schedule_pan(self):
+        '''Queue the view's current pan to be written to the Maya Camera'''
+        pan = self.current_pan()
+        handle = get_camera_handle(self.camera)
+        self.write_scheduler.schedule_many(handle, {"horizontalPan": pan[0], "verticalPan": pan[1]}, 
+                                           session=self.pan_session)
+
+    @traced
+    def mousePressEvent(self, event):
+        '''Starts a drag, everything written until the release is one undo step'''
+        self.end_wheel()
+        self.press_pan = self.current_pan()
+        super(CameraView, self).mousePressEvent(event)
 
+    @timed
+    @traced
     def mouseMoveEvent(self, event):
         '''Controls Panning effect between the Viewer and the Maya Camera'''
         super(CameraView, self).mouseMoveEvent(event)
-        bounding_box = self.mapToScene(self.viewport().geometry()).boundingRect()
-        center = bounding_box.center()
-        x = center.x() - 4
-        y = -(center.y() - 4)
-        cmds.setAttr("{}.horizontalPan".format(self.camera), (x/self.width))
-        cmds.setAttr("{}.verticalPan".format(self.camera), (y/self.height))
+        if event.buttons() and self.pan_changed():
+            self.schedule_pan()
+
+    @traced
+    def mouseReleaseEvent(self, event):
+        '''Writes the final pan position so the camera ends exactly where the drag stopped'''
+        super(CameraView, self).mouseReleaseEvent(event)
+        if self.pan_changed():
+            self.schedule_pan()
+        self.write_scheduler.flush()
+        self.pan_session.end()
+        self.press_pan = None
+
+    def pan_changed(self):
+        '''Check if the current drag has moved the view (or written a pan) since the press'''
+        if self.pan_session.active or self.write_scheduler.pending:
+            return True
+
+        return self.press_pan is not None and self.current_pan() != self.press_pan
+
+
+class WriteScheduler(QtCore.QObject):
+    '''Coalesces attribute writes so Maya only receives the latest value of each attribute,
+       at most "max_rate" times per second.
+        Parameters:
+                max_rate : Maximum number of flushes per second. 
+                           None uses the screen's refresh rate (one flush per display frame).
+                           0 disables coalescing and writes every value immediately.
+        NOTES:
+            > The first value after an idle period is written right away, 
+            later values are held until the next frame and only the newest one is written.
+    '''
+    def __init__(self, parent=None, max_rate=None):
+        super(WriteScheduler, self).__init__(parent=parent)
+        self.pending = {}
+        self.interval = 0
+        self.clock = QtCore.QElapsedTimer()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self.set_max_rate(max_rate)
+
+    def set_max_rate(self, max_rate=None):
+        '''Change how many times per second pending values can be written.'''
+        if max_rate is None:
+            screen = QtGui.QGuiApplication.primaryScreen()
+            max_rate = screen.refreshRate() if screen else 60.0
+        self.max_rate = max_rate
+        self.interval = int(1000.0 / max_rate) if max_rate > 0 else 0
+
+    def schedule(self, handle, attr, value, session=None):
+        '''Store the newest value for a CameraHandle attribute and write it on the next flush.
+           When an UndoSession is given, the value is written through it.'''
+        self.schedule_many(handle, {attr: value}, session=session)
+
+    def schedule_many(self, handle, values={}, session=None):
+        '''Store the newest values of several CameraHandle attributes ({attribute: value}) so they are 
+           always written in the same flush, ex. both pan values of one move.'''
+        for attr, value in values.items():
+            self.pending[handle.names[attr]] = [handle, attr, value, session]
+        if self.timer.isActive():
+            return
+        elapsed = self.clock.elapsed() if self.clock.isValid() else self.interval
+        if elapsed >= self.interval:
+            self.flush()
+        else:
+            self.timer.start(self.interval - elapsed)
+
+    @traced
+    def flush(self):
+        '''Write all pending values to Maya.'''
+        self.timer.stop()
+        pending = self.pending
+        self.pending = {}
+        for handle, attr, value, session in pending.values():
+            if session:
+                session.write(handle, attr, value)
+            else:
+                handle.set(attr, value)
+        if pending:
+            self.clock.start()
+
+    def discard(self):
+        '''Drop pending values without writing them.'''
+        self.timer.stop()
+        self.pending = {}
+
+
+class PosingMode(object):
+    '''Makes the viewport cheaper to draw while the camera is being posed, and puts it back afterwards.
+        Parameters:
+                mode  : One of the POSING_MODES modes. 
+                        "suspend" stops viewport refreshes, "bounding_box" draws bounding boxes, 
+                        "textures_off" turns textures off, and "" leaves the viewport alone.
+                layer : Display layer to isolate in the active panel while posing. Empty for none.
+        NOTES:
+            > begin() and end() are counted, so overlapping interactions share one posing period.
+            > end() restores the user's panel settings and forces exactly one refresh.
+    '''
+    def __init__(self, mode="", layer=""):
+        self.mode = mode
+        self.layer = layer
+        self.depth = 0
+        self.editor = ""
+        self.saved = {}
+        self.suspended = False
+        self.isolated = False
+
+    def is_enabled(self):
+        return bool(self.mode or self.layer)
+
+    def begin(self):
+        '''Switch the viewport to its posing display.'''
+        self.depth += 1
+        if self.depth > 1 or not self.is_enabled():
+            return
+        backend = get_backend()
+        self.editor = backend.get_active_editor()
+        self.saved = {}
+        if self.editor and self.mode == "bounding_box":
+            self.saved = backend.get_editor_settings(self.editor, ["displayAppearance"])
+            backend.set_editor_settings(self.editor, {"displayAppearance": "boundingBox"})
+        if self.editor and self.mode == "textures_off":
+            self.saved = backend.get_editor_settings(self.editor, ["displayTextures"])
+            backend.set_editor_settings(self.editor, {"displayTextures": False})
+        if self.editor and self.layer:
+            self.isolated = backend.isolate_layer(self.editor, self.layer)
+        if self.mode == "suspend":
+            backend.refresh(suspend=True)
+            self.suspended = True
+
+    def end(self):
+        '''Restore the user's viewport settings and refresh once.'''
+        if not self.depth:
+            return
+        self.depth -= 1
+        if self.depth or not (self.saved or self.suspended or self.isolated):
+            return
+        backend = get_backend()
+        if self.suspended:
+            backend.refresh(suspend=False)
+            self.suspended = False
+        if self.isolated:
+            self.isolated = False
+            backend.end_isolate(self.editor)
+        if self.saved and backend.editor_exists(self.editor):
+            backend.set_editor_settings(self.editor, self.saved)
+        self.saved = {}
+        backend.refresh(force=True)
+
+
+POSING_MODE = PosingMode(mode=get_backend().get_option(POSING_OPTION_VAR, ""), 
+                         layer=get_backend().get_option(POSING_LAYER_OPTION_VAR, ""))
+
+
+class UndoSession(object):
+    '''Groups every write of one interaction (a drag, a wheel gesture, a held key) into a single undo step.
+        Parameters:
+                name     : Name of the undo chunk, shown in Maya's undo history.
+                coalesce : If True, writes made during the session are left out of the undo queue and 
+                           only the final value of each attribute is written undoably when the session ends.
+                           If False, every write is kept inside one undo chunk.
+                attrs    : CameraHandle attributes the session writes. Their start values are read once,
+                           when the session begins.
+        NOTES:
+            > Writes go through CameraHandle.set_unlocked(), so locked attributes can be edited too.
+            In-between values are written straight to the cached plugs, only the final values 
+            go through the cameraAdjusterSetAttr command.
+            > Whether Maya's undo queue is on is checked once per session. When it is off, 
+            writes are passed straight through.
+            > The undo queue is never switched off and on around a write, in-between values 
+            don't reach it in the first place.
+            > The viewport is in its POSING_MODE display for as long as the session runs.
+    '''
+    def __init__(self, name="cameraAdjuster", coalesce=True, attrs=[]):
+        self.name = name
+        self.coalesce = coalesce
+        self.attrs = attrs
+        self.active = False
+        self.undoable = True
+        self.chunk_open = False
+        self.start_values = {}
+        self.end_values = {}
+
+    def begin(self, handle=None):
+        '''Start the session, reading the start values of "attrs" from a CameraHandle. 
+           Does nothing if it is already running.'''
+        if self.active:
+            return
+        self.active = True
+        POSING_MODE.begin()
+        self.start_values = {}
+        self.end_values = {}
+        self.undoable = get_backend().undo_enabled()
+        if not self.undoable:
+            return
+        if not self.coalesce:
+            get_backend().open_undo_chunk(self.name)
+            self.chunk_open = True
+        elif handle:
+            for attr in self.attrs:
+                self.start_values[(handle, attr)] = handle.get(attr)
+
+    def write(self, handle, attr, value, relative=False):
+        '''Write a CameraHandle attribute during the session, starting it if needed. 
+           Returns the attribute's new value.'''
+        self.begin(handle)
+        if not self.coalesce or not self.undoable:
+            return handle.set_unlocked(attr, value, relative=relative)
+        key = (handle, attr)
+        if key not in self.start_values:
+            # Not one of "attrs", or another camera than the one the session began with
+            self.start_values[key] = handle.get(attr)
+        # Keep the intermediate value out of the undo queue
+        value = handle.set_unlocked(attr, value, relative=relative, undoable=False)
+        self.end_values[key] = value
+
+        return value
+
+    def end(self):
+        '''Finish the session, leaving one undo step for everything written during it.'''
+        if not self.active:
+            return
+        self.active = False
+        if self.chunk_open:
+            self.chunk_open = False
+            get_backend().close_undo_chunk()
+        try:
+            if self.end_values:
+                self.commit()
+        finally:
+            POSING_MODE.end()
+
+    def commit(self):
+        '''Write the session's final values as one undo step.'''
+        # Attributes in "attrs" the session never wrote have nothing to put back
+        self.start_values = dict([[key, self.start_values[key]] for key in self.end_values])
+        if all(self.start_values[key] == value for key, value in self.end_values.items()):
+            # Ended where it started, nothing to undo
+            self.start_values = {}
+            self.end_values = {}
+            return
+        # Put the starting values back silently, then write the final values as one undo step
+        for (handle, attr), value in self.start_values.items():
+            handle.set_unlocked(attr, value, undoable=False)
+        backend = get_backend()
+        backend.open_undo_chunk(self.name)
+        try:
+            for (handle, attr), value in self.end_values.items():
+                handle.set_unlocked(attr, value)
+        finally:
+            backend.close_undo_chunk()
+        self.start_values = {}
+        self.end_values = {}
+
+
+class MainThreadDispatcher(QtCore.QObject):
+    '''Runs Maya operations queued from any thread on the main thread, in batches.
+        Parameters:
+                batch_time : Longest a single batch may run, in milliseconds. 
+                             What's left is run on the next pass of the event loop so the UI stays responsive.
+        NOTES:
+            > submit() and set_attr() return concurrent.futures.Future objects, 
+            so worker threads can wait on results with future.result().
+            > A write to a plug whose previous write is still the last thing queued replaces that value 
+            instead of adding another write. All of the merged futures get the final result.
+            Writes are never merged past other queued operations, so everything runs in the order it was queued.
+            > Never wait on a future from the main thread, the batch that would complete it can't run.
+    '''
+    wake = QtCore.Signal()
+
+    def __init__(self, parent=None, batch_time=8):
+        super(MainThreadDispatcher, self).__init__(parent=parent)
+        self.batch_time = batch_time
+        self.lock = threading.Lock()
+        self.queue = collections.deque()
+        self.writes = {}
+        self.scheduled = False
+        self.latencies = collections.deque(maxlen=256)
+        self.submitted = 0
+        self.executed = 0
+        self.merged = 0
+        self.max_depth = 0
+        # Emitted from any thread, always delivered on the thread this object lives in
+        self.wake.connect(self.run_batch, QtCore.Qt.QueuedConnection)
+
+    def submit(self, function, *args, **kwargs):
+        '''Queue function(*args, **kwargs) to run on the main thread. Returns a Future of its result.'''
+        future = futures.Future()
+        with self.lock:
+            self.queue.append([function, args, kwargs, [future], time.perf_counter(), None])
+            self.submitted += 1
+            self.schedule()
+
+        return future
+
+    def set_attr(self, attribute_name, value):
+        '''Queue a setAttr, merged with any write to the same plug that hasn't run yet.'''
+        future = futures.Future()
+        with self.lock:
+            self.submitted += 1
+            entry = self.writes.get(attribute_name)
+            if entry and self.queue and self.queue[-1] is entry:
+                entry[1] = (attribute_name, value)
+                entry[3].append(future)
+                self.merged += 1
+                return future
+            entry = [get_backend().set_attr, (attribute_name, value), {}, [future], time.perf_counter(), attribute_name]
+            self.writes[attribute_name] = entry
+            self.queue.append(entry)
+            self.schedule()
+
+        return future
+
+    def schedule(self):
+        '''Ask for a batch to run, unless one is already on its way. Called with the lock held.'''
+        self.max_depth = max(self.max_depth, len(self.queue))
+        if not self.scheduled:
+            self.scheduled = True
+            self.wake.emit()
+
+    @traced
+    def run_batch(self):
+        '''Run queued operations until the queue is empty or "batch_time" is used up.'''
+        start = time.perf_counter()
+        while True:
+            with self.lock:
+                if not self.queue:
+                    self.scheduled = False
+                    return
+                if (time.perf_counter() - start) * 1000 >= self.batch_time:
+                    # Leave the rest for the next pass of the event loop
+                    self.wake.emit()
+                    return
+                entry = self.queue.popleft()
+                function, args, kwargs, entry_futures, queued, attribute_name = entry
+                if attribute_name is not None and self.writes.get(attribute_name) is entry:
+                    del self.writes[attribute_name]
+                self.latencies.append(time.perf_counter() - queued)
+            entry_futures = [each for each in entry_futures if each.set_running_or_notify_cancel()]
+            if not entry_futures:
+                continue
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:
+                for each in entry_futures:
+                    each.set_exception(error)
+            else:
+                for each in entry_futures:
+                    each.set_result(result)
+            self.executed += 1
+
+    def depth(self):
+        '''Get the number of operations waiting to run.'''
+        with self.lock:
+            return len(self.queue)
+
+    def stats(self):
+        '''Get the queue depth, counts, and the latency (milliseconds from queued to run) of recent operations.'''
+        with self.lock:
+            latencies = sorted(self.latencies)
+            depth = len(self.queue)
+        return {"depth"      : depth,
+                "max_depth"  : self.max_depth,
+                "submitted"  : self.submitted,
+                "executed"   : self.executed,
+                "merged"     : self.merged,
+                "latency_avg": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                "latency_p95": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+                "latency_max": latencies[-1] * 1000 if latencies else 0.0}
+
+
+# Made on first use, see get_maya_dispatcher()
+MAYA_DISPATCHER = None
+MAYA_DISPATCHER_LOCK = threading.Lock()
+
+
+class HandlerLatency(object):
+    '''Rolling latency histograms of the UI handlers decorated with @timed.
+        Parameters:
+                window : Number of most recent samples kept per handler.
+        NOTES:
+            > "last" is [handler name, milliseconds] of the most recent sample, or None.
+            > Histogram buckets are LATENCY_BUCKETS plus one for anything slower.
+    '''
+    def __init__(self, window=500):
+        self.window = window
+        self.samples = {}
+        self.last = None
+
+    def record(self, name, seconds):
+        milliseconds = seconds * 1000
+        if name not in self.samples:
+            self.samples[name] = collections.deque(maxlen=self.window)
+        self.samples[name].append(milliseconds)
+        self.last = [name, milliseconds]
+
+    def histogram(self, name):
+        '''Get the number of samples in each bucket, see LATENCY_BUCKETS.'''
+        counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        for milliseconds in self.samples.get(name, []):
+            index = 0
+            while index < len(LATENCY_BUCKETS) and milliseconds > LATENCY_BUCKETS[index]:
+                index += 1
+            counts[index] += 1
+
+        return counts
+
+    def stats(self):
+        '''Get {handler name: {"count", "p50", "p90", "p99", "max", "histogram"}} in milliseconds.'''
+        stats = collections.OrderedDict()
+        for name in sorted(self.samples):
+            samples = sorted(self.samples[name])
+            if not samples:
+                continue
+            stats[name] = {"count"    : len(samples),
+                           "p50"      : samples[int(len(samples) * 0.5)],
+                           "p90"      : samples[int(len(samples) * 0.9)],
+                           "p99"      : samples[int(len(samples) * 0.99)],
+                           "max"      : samples[-1],
+                           "histogram": self.histogram(name)}
+
+        return stats
+
+    def clear(self):
+        self.samples.clear()
+        self.last = None
+
+
+HANDLER_LATENCY = HandlerLatency()
 
 
 class CameraScene(QtWidgets.QGraphicsScene):
@@ -566,275 +1912,961 @@ class CameraScene(QtWidgets.QGraphicsScene):
         self.setSceneRect(self.rect)
 
 
-class CameraImagePoint(QtWidgets.QGraphicsPixmapItem):
+class ImageCache(object):
+    '''Least-recently-used cache of decoded reference images, shared by every CameraImagePoint.
+        Parameters:
+                budget : Maximum bytes of pixmaps kept. Least recently used pixmaps are evicted first.
+        NOTES:
+            > Keys come from key(), so an edited file (new mtime) never returns a stale image.
+            > Holds QPixmaps, so it must only be used from the GUI thread.
+    '''
+    def __init__(self, budget=256*1024*1024):
+        self.budget = budget
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(image_path, size=[100,100], level=0, tile=None):
+        '''Build a cache key from an image's real path, modification time, display size,
+           pyramid level and tile [column, row] (None for the whole image).'''
+        real_path = os.path.realpath(image_path)
+        mtime = os.path.getmtime(real_path) if os.path.isfile(real_path) else 0
+
+        return (real_path, mtime, tuple(size), level, tuple(tile) if tile else None)
+
+    def get(self, key):
+        '''Get a cached pixmap, or None.'''
+        pixmap = self.entries.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+
+        return pixmap
+
+    def put(self, key, pixmap):
+        '''Store a pixmap, evicting least recently used pixmaps until within budget.'''
+        size = self.pixmap_bytes(pixmap)
+        if size > self.budget:
+            return
+        if key in self.entries:
+            self.bytes -= self.pixmap_bytes(self.entries.pop(key))
+        self.entries[key] = pixmap
+        self.bytes += size
+        self.trim()
+
+    def trim(self):
+        '''Evict least recently used pixmaps until within budget.'''
+        while self.bytes > self.budget and self.entries:
+            old_key, old_pixmap = self.entries.popitem(last=False)
+            self.bytes -= self.pixmap_bytes(old_pixmap)
+            self.evictions += 1
+
+    def set_budget(self, budget):
+        '''Change the byte budget, evicting right away if it shrank.'''
+        self.budget = budget
+        self.trim()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        '''Get the cache's usage and hit/miss/eviction counts.'''
+        return {"entries"  : len(self.entries),
+                "bytes"    : self.bytes,
+                "budget"   : self.budget,
+                "hits"     : self.hits,
+                "misses"   : self.misses,
+                "evictions": self.evictions}
+
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+# Process-wide, so cameras sharing a reference image decode it only once
+IMAGE_CACHE = ImageCache()
+
+
+class ProxyCache(object):
+    '''Small copies of reference images kept on disk, so an image opened in an earlier session
+       can be shown right away while the full quality version decodes.
+        Parameters:
+                folder      : Directory proxies are written to. Defaults to "folder_name" in get_cache_folder().
+                folder_name : Name of the default directory.
+                max_size    : Longest edge of a proxy in pixels.
+                max_bytes   : Size cap of the folder. Least recently used proxies are deleted past it.
+        NOTES:
+            > Proxies are named from a hash of the image's real path, modification time and 
+            file size, so an edited image gets a new proxy and the old one ages out.
+            > Only uses QImage and files, so it is safe to use from worker threads.
+    '''
+    def __init__(self, folder="", folder_name="proxies", max_size=512, max_bytes=512*1024*1024):
+        self.folder = folder
+        self.folder_name = folder_name
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+
+    def get_folder(self):
+        if not self.folder:
+            self.folder = os.path.join(get_cache_folder(), self.folder_name)
+
+        return self.folder
+
+    def proxy_path(self, image_path):
+        '''Get where the proxy for an image is stored. The proxy may not exist yet.'''
+        real_path = os.path.realpath(image_path)
+        stat = os.stat(real_path)
+        key = "{}|{}|{}".format(real_path, stat.st_mtime, stat.st_size)
+        file_name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jpg"
+
+        return os.path.join(self.get_folder(), file_name)
+
+    def get(self, image_path):
+        '''Get the path to an image's proxy, or "" if there isn't one.'''
+        try:
+            proxy_path = self.proxy_path(image_path)
+        except OSError:
+            return ""
+        if not os.path.isfile(proxy_path):
+            return ""
+        # Modification time doubles as "last used" for pruning
+        os.utime(proxy_path, None)
+
+        return proxy_path
+
+    def write(self, image_path, image):
+        '''Save a downsampled copy of a decoded QImage as the image's proxy.
+           Returns False if it couldn't be written (ex. a null image or an unwritable folder).'''
+        if image.isNull():
+            return False
+        try:
+            proxy_path = self.proxy_path(image_path)
+            if not os.path.isdir(self.get_folder()):
+                os.makedirs(self.get_folder())
+        except OSError as err:
+            LOG.warning("Unable to write proxy for '{}': {}".format(image_path, err))
+            return False
+        if image.width() > self.max_size or image.height() > self.max_size:
+            image = image.scaled(self.max_size, self.max_size, 
+                                 QtCore.Qt.KeepAspectRatio, 
+                                 QtCore.Qt.SmoothTransformation)
+        # Write to a temporary file first so a reader never sees half a proxy.
+        # Unique per writer, worker threads may be writing the same proxy at once.
+        try:
+            handle, temp_path = tempfile.mkstemp(dir=self.get_folder(), suffix=".tmp")
+            os.close(handle)
+        except OSError as err:
+            LOG.warning("Unable to write proxy for '{}': {}".format(image_path, err))
+            return False
+        try:
+            if not image.save(temp_path, "JPG", 85):
+                LOG.warning("Unable to write proxy image '{}'".format(proxy_path))
+                return False
+            os.replace(temp_path, proxy_path)
+            self.prune()
+        except OSError as err:
+            LOG.warning("Unable to write proxy image '{}': {}".format(proxy_path, err))
+            return False
+        finally:
+            # Only left behind if the save or the rename failed
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+        return True
+
+    def prune(self):
+        '''Delete least recently used proxies until the folder is within max_bytes.'''
+        proxies = []
+        total = 0
+        for each in os.listdir(self.get_folder()):
+            # Still being written by another thread or process
+            if each.endswith(".tmp"):
+                continue
+            path = os.path.join(self.get_folder(), each)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            proxies.append([stat.st_mtime, stat.st_size, path])
+            total += stat.st_size
+        for mtime, size, path in sorted(proxies):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+PROXY_CACHE = ProxyCache()
+# Proxies Maya's imagePlane nodes are pointed at, see proxy_image_plane()
+# NOTE: > Kept large, a pruned proxy is rebuilt the next time its imagePlane is proxied.
+PLANE_PROXY_CACHE = ProxyCache(folder_name="image_plane_proxies", max_size=2048, max_bytes=4*1024*1024*1024)
+
+
+class CameraImagePoint(QtWidgets.QGraphicsItem):
+    '''Reference image displayed in the CameraView
+        Parameters:
+                image_path  : Path to the image file.
+                size        : [width, height] the image is scaled to fit within.
+        NOTES:
+            > The whole image is decoded once at "size" on a background thread. A placeholder
+            the size of the final image is shown until the decoded image arrives.
+            > Decoded images and tiles are kept in IMAGE_CACHE, so showing the same image again
+            (ex. switching back to a camera) is immediate.
+            > If PROXY_CACHE has a proxy of the image from an earlier session, it is shown instead 
+            of the placeholder. Otherwise one is written once the image is decoded.
+            > When the view is zoomed in past "size", the image is drawn from a tile pyramid.
+            Each level doubles the resolution of the one below it (the last level is the source
+            resolution), and only the tiles visible at the current zoom and pan are decoded.
+            > Call cancel() before discarding the item so unfinished decodes are dropped.
+            > With set_preblend(), the image and tiles are drawn from copies with "image_opacity" 
+            already applied (tiles are kept in IMAGE_CACHE), instead of through the item's opacity.
+    '''
+    tile_size = 256
+
     def __init__(self, parent=None, image_path="", size=[100,100]):
         super(CameraImagePoint, self).__init__(parent=parent)
         self.size = size
         self.image_path = image_path
+        self.image = QtGui.QPixmap()
+        self.rect = QtCore.QRectF()
+        self.task = None
+        self.base_key = None
+        self.tile_tasks = []
+        self.pending_tiles = set()
+        self.tile_level = 0
+        self.levels = 0
+        self.source_size = QtCore.QSize()
+        self.rotated = False
+        self.supports_clip = False
+        self.image_opacity = 0.5
+        self.preblend = False
+        self.blended_image = None
+        self.setOpacity(self.image_opacity)
+        self.setZValue(0.5)
+        # Needed for option.exposedRect to only hold the area being repainted
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)
         if os.path.isfile(self.image_path):
-            self.image = QtGui.QPixmap(self.image_path)
-            self.image = self.image.scaled(QtCore.QSize(self.size[0], 
-                                                        self.size[1]), 
-                                                        QtCore.Qt.KeepAspectRatio, 
-                                                        QtCore.Qt.FastTransformation)
-            self.setPixmap(self.image)
-            self.offset = [self.image.width()/2, self.image.height()/2]
-            self.setOffset(QtCore.QPointF(-self.offset[0], -self.offset[1]))
-            self.setOpacity(0.5)
-            self.setZValue(0.5)
-
-
-class UpDownButtons(QtWidgets.QWidget):
+            # Only the file header is read here to size the placeholder and the pyramid
+            reader = QtGui.QImageReader(self.image_path)
+            reader.setAutoTransform(True)
+            display_size = fit_image_size(reader, self.size)
+            self.source_size = reader.size()
+            self.rotated = bool(reader.transformation() & QtGui.QImageIOHandler.TransformationRotate90)
+            if self.rotated:
+                display_size.transpose()
+                self.source_size.transpose()
+            # Decoding a tile on its own needs the reader to clip while decoding (ex. JPEG),
+            # otherwise a whole level is decoded and split into tiles.
+            self.supports_clip = (reader.supportsOption(QtGui.QImageIOHandler.ScaledClipRect) and 
+                                  reader.transformation() == QtGui.QImageIOHandler.TransformationNone)
+            if self.source_size.isValid() and display_size.width() > 0:
+                ratio = float(self.source_size.width()) / display_size.width()
+                self.levels = max(0, int(math.ceil(math.log(ratio, 2)))) if ratio > 1 else 0
+            self.base_key = IMAGE_CACHE.key(self.image_path, self.size)
+            cached = IMAGE_CACHE.get(self.cache_key())
+            if cached:
+                self.set_image(cached)
+                return
+            proxy_path = PROXY_CACHE.get(self.image_path)
+            if proxy_path:
+                self.set_image(QtGui.QPixmap.fromImage(decode_image(proxy_path, [display_size.width(), 
+                                                                                 display_size.height()])))
+            else:
+                self.set_image(self.placeholder(display_size))
+            self.task = ImageDecodeTask(image_path=self.image_path, size=self.size, 
+                                        write_proxy=not proxy_path)
+            self.task.signals.finished.connect(self.set_image)
+            IMAGE_THREAD_POOL.start(self.task)
+
+    def cache_key(self, level=0, tile=None):
+        '''Get the IMAGE_CACHE key for the whole image (level 0) or one tile of a pyramid level.'''
+        return self.base_key[:3] + (level, tuple(tile) if tile else None)
+
+    def placeholder(self, size):
+        '''Build the pixmap shown while the image is being decoded.'''
+        pixmap = QtGui.QPixmap(size)
+        pixmap.fill(QtGui.QColor(85, 85, 85))
+        painter = QtGui.QPainter(pixmap)
+        painter.setPen(QtCore.Qt.lightGray)
+        painter.drawText(pixmap.rect(), QtCore.Qt.AlignCenter, "Loading Image...")
+        painter.end()
+
+        return pixmap
+
+    def set_image(self, image):
+        '''Display a decoded QImage (or a QPixmap) centered on the item's position.'''
+        if isinstance(image, QtGui.QImage):
+            # Decode was cancelled after the image was already on its way
+            if not self.task:
+                return
+            self.task = None
+            image = QtGui.QPixmap.fromImage(image)
+            IMAGE_CACHE.put(self.cache_key(), image)
+        self.prepareGeometryChange()
+        self.image = image
+        self.blended_image = None
+        self.offset = [self.image.width()/2, self.image.height()/2]
+        self.rect = QtCore.QRectF(-self.offset[0], -self.offset[1], self.image.width(), self.image.height())
+        self.update()
+
+    def set_preblend(self, enabled=True):
+        '''Draw copies of the image with its opacity already applied, instead of through the item's opacity.'''
+        self.preblend = enabled
+        self.setOpacity(1.0 if enabled else self.image_opacity)
+        self.update()
+
+    def blend(self, pixmap):
+        '''Get a copy of a pixmap with "image_opacity" applied to its alpha.'''
+        blended = QtGui.QPixmap(pixmap.size())
+        blended.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(blended)
+        painter.setOpacity(self.image_opacity)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+
+        return blended
+
+    def get_tile(self, level, column, row):
+        '''Get a decoded tile (pre-blended if set_preblend() is on), or None if it isn't in IMAGE_CACHE.'''
+        if not self.preblend:
+            return IMAGE_CACHE.get(self.cache_key(level, [column, row]))
+        key = self.cache_key(level, [column, row]) + (self.image_opacity,)
+        tile = IMAGE_CACHE.get(key)
+        if tile is None:
+            tile = IMAGE_CACHE.get(self.cache_key(level, [column, row]))
+            if tile is None:
+                return None
+            tile = self.blend(tile)
+            IMAGE_CACHE.put(key, tile)
+
+        return tile
+
+    def boundingRect(self):
+        return self.rect
+
+    def paint(self, painter, option, widget=None):
+        if self.image.isNull():
+            return
+        image = self.image
+        if self.preblend:
+            if self.blended_image is None:
+                self.blended_image = self.blend(self.image)
+            image = self.blended_image
+        # The base image is always drawn, so tiles that haven't arrived yet show it stretched
+        painter.drawPixmap(self.rect, image, QtCore.QRectF(image.rect()))
+        if self.task:
+            return
+        scale = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        scale *= painter.device().devicePixelRatioF()
+        level = 0
+        if scale > 1:
+            level = min(self.levels, int(math.ceil(math.log(scale, 2))))
+        if level != self.tile_level:
+            self.cancel_tiles()
+            self.tile_level = level
+        if level:
+            self.paint_tiles(painter, option.exposedRect.intersected(self.rect), level)
+
+    def level_size(self, level):
+        '''Get the pixel size of a pyramid level. The top level is the source resolution.'''
+        if level >= self.levels:
+            return QtCore.QSize(self.source_size)
+
+        return QtCore.QSize(self.image.width() * 2**level, self.image.height() * 2**level)
+
+    def tile_rect(self, level, column, row):
+        '''Get a tile's rectangle in pixels of its level.'''
+        level_size = self.level_size(level)
+
+        return QtCore.QRect(column * self.tile_size, row * self.tile_size, 
+                            self.tile_size, self.tile_size).intersected(QtCore.QRect(QtCore.QPoint(0, 0), level_size))
+
+    def tile_item_rect(self, level, column, row):
+        '''Get a tile's rectangle in the item's coordinates.'''
+        level_size = self.level_size(level)
+        rect = QtCore.QRectF(self.tile_rect(level, column, row))
+        scale_x = self.rect.width() / level_size.width()
+        scale_y = self.rect.height() / level_size.height()
+
+        return QtCore.QRectF(self.rect.left() + rect.left() * scale_x, 
+                             self.rect.top()  + rect.top()  * scale_y, 
+                             rect.width()  * scale_x, 
+                             rect.height() * scale_y)
+
+    def paint_tiles(self, painter, exposed_rect, level):
+        '''Draw the decoded tiles of a level within exposed_rect, and request the missing ones.'''
+        level_size = self.level_size(level)
+        scale_x = level_size.width()  / self.rect.width()
+        scale_y = level_size.height() / self.rect.height()
+        first_column = int((exposed_rect.left()   - self.rect.left()) * scale_x) // self.tile_size
+        last_column  = int((exposed_rect.right()  - self.rect.left()) * scale_x) // self.tile_size
+        first_row    = int((exposed_rect.top()    - self.rect.top())  * scale_y) // self.tile_size
+        last_row     = int((exposed_rect.bottom() - self.rect.top())  * scale_y) // self.tile_size
+        last_column  = min(last_column, (level_size.width()  - 1) // self.tile_size)
+        last_row     = min(last_row,    (level_size.height() - 1) // self.tile_size)
+        missing = []
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                key = (level, column, row)
+                tile = self.get_tile(level, column, row)
+                if tile:
+                    painter.drawPixmap(self.tile_item_rect(level, column, row), tile, QtCore.QRectF(tile.rect()))
+                elif key not in self.pending_tiles:
+                    missing.append(key)
+        if missing:
+            self.request_tiles(level, missing)
+
+    def request_tiles(self, level, keys):
+        '''Start decoding tiles of a level on the image thread pool.'''
+        level_size = self.level_size(level)
+        tile_rects = [[key, self.tile_rect(*key)] for key in keys]
+        if self.supports_clip:
+            batches = [[each] for each in tile_rects]
+        else:
+            batches = [tile_rects]
+        for batch in batches:
+            task = TileDecodeTask(image_path=self.image_path, level_size=level_size, 
+                                  tile_rects=batch, clip=self.supports_clip, rotated=self.rotated)
+            task.signals.tile_finished.connect(self.set_tile)
+            self.tile_tasks.append(task)
+            IMAGE_THREAD_POOL.start(task)
+        self.pending_tiles.update(keys)
+
+    def set_tile(self, key, image):
+        '''Store a decoded tile and repaint the area it covers.'''
+        if key not in self.pending_tiles:
+            return
+        self.pending_tiles.discard(key)
+        if not self.pending_tiles:
+            self.tile_tasks = []
+        IMAGE_CACHE.put(self.cache_key(key[0], key[1:]), QtGui.QPixmap.fromImage(image))
+        self.update(self.tile_item_rect(*key))
+
+    def cancel_tiles(self):
+        '''Drop tile decodes that haven't finished yet.'''
+        for task in self.tile_tasks:
+            task.cancel()
+        self.tile_tasks = []
+        self.pending_tiles = set()
+
+    def cancel(self):
+        '''Drop the image and tile decodes that haven't finished yet.'''
+        self.cancel_tiles()
+        if self.task:
+            self.task.cancel()
+            self.task.signals.finished.disconnect(self.set_image)
+            self.task = None
+
+
+class ImageDecodeSignals(QtCore.QObject):
+    '''Signals for the decode tasks. QRunnable is not a QObject, so it can't own signals itself.'''
+    finished = QtCore.Signal(QtGui.QImage)
+    tile_finished = QtCore.Signal(object, QtGui.QImage)
+    proxy_finished = QtCore.Signal(str, bool)
+
+
+class ImageDecodeTask(QtCore.QRunnable):
+    '''Decodes an image file at display size on a worker thread.
+        Parameters:
+                image_path  : Path to the image file.
+                size        : [width, height] the image is scaled to fit within.
+                write_proxy : If True, the decoded image is also saved to PROXY_CACHE.
+        NOTES:
+            > Emits signals.finished with the QImage. Nothing is emitted if the task 
+            was cancelled or the file couldn't be read.
+            > QImage is used because QPixmap can only be created on the GUI thread.
     '''
-    Two Buttons with a label in-between. Handy if you need them to do the opposite of each other.
-    Arguments:
-            text:      Text to appear in the label between the two buttons.
-            up_text:   Text to appear on the first button.
-            down_text: Text to appear on the second button.
-            vertical:  If True, buttons are laid out vertically. 
-                       If False, laid out horizontally. 
-                       True by Default.
-            btn_size:  Dimensions of each button. Ex. [32, 20]
+    def __init__(self, image_path="", size=[100,100], write_proxy=False):
+        super(ImageDecodeTask, self).__init__()
+        self.image_path = image_path
+        self.size = size
+        self.write_proxy = write_proxy
+        self.cancelled = False
+        self.signals = ImageDecodeSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        if self.cancelled:
+            return
+        image = decode_image(self.image_path, self.size)
+        if image.isNull():
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(image)
+        if self.write_proxy:
+            PROXY_CACHE.write(self.image_path, image)
+
+
+class TileDecodeTask(QtCore.QRunnable):
+    '''Decodes tiles of one CameraImagePoint pyramid level on a worker thread.
+        Parameters:
+                image_path : Path to the image file.
+                level_size : QSize of the whole level, after auto-transform.
+                tile_rects : List of [key, QRect] with each tile's rectangle in level pixels.
+                clip       : If True, each tile is decoded on its own by clipping while decoding.
+                             If False, the level is decoded once and cut into tiles.
+                rotated    : If True, the image file is stored on its side (ex. EXIF orientation).
+        NOTES:
+            > Emits signals.tile_finished with (key, QImage) for each tile.
     '''
-    def __init__(self, parent=None, text="Direction", up_text="up", 
-                 down_text="down", vertical=True, btn_size=[32, 32]):
-        super(UpDownButtons, self).__init__(parent=parent)
-        # Base Members
-        self.up_icon = os.path.dirname(os.path.realpath(__file__)) + "/icons/up_btn.jpg"
-        self.down_icon = os.path.dirname(os.path.realpath(__file__)) + "/icons/down_btn.jpg"
-        self.stylesheet = '''QPushButton:pressed{
-            background: #666;}'''
-        self.text = text
-        self.up_text = up_text
-        self.down_text = down_text
-        self.vertical = vertical
-        self.btn_size = btn_size
-        self.selected = False
-        # Base Window
-        if self.vertical:
-            self.main_layout = QtWidgets.QVBoxLayout()
-        else:
-            self.main_layout = QtWidgets.QHBoxLayout()
-        self.setLayout(self.main_layout)
-        self.setStyleSheet("font-weight: bold")
-        # Components
-        self.up_btn = QtWidgets.QPushButton(self.up_text)
-        self.up_btn.setFixedSize(self.btn_size[0], self.btn_size[1])
-        self.label = QtWidgets.QLabel(self.text)
-        self.label.setSizePolicy(QtWidgets.QSizePolicy.Expanding, 
-                                 QtWidgets.QSizePolicy.Expanding)
-        self.label.setAlignment(QtCore.Qt.AlignCenter)
-        self.down_btn = QtWidgets.QPushButton(self.down_text)
-        self.down_btn.setFixedSize(self.btn_size[0], self.btn_size[1])
-        # Assemble Components
-        self.main_layout.addWidget(self.up_btn)
-        self.main_layout.addWidget(self.label)
-        self.main_layout.addWidget(self.down_btn)
-        # Component Settings
-        self.main_layout.setAlignment(QtCore.Qt.AlignVCenter)
-        self.main_layout.setAlignment(QtCore.Qt.AlignHCenter)
-        self.up_btn.setIcon(QtGui.QIcon(self.up_icon)) 
-        self.down_btn.setIcon(QtGui.QIcon(self.down_icon)) 
-        self.up_btn.setStyleSheet(self.stylesheet)
-        self.down_btn.setStyleSheet(self.stylesheet)
+    def __init__(self, image_path="", level_size=QtCore.QSize(), tile_rects=[], clip=True, rotated=False):
+        super(TileDecodeTask, self).__init__()
+        self.image_path = image_path
+        self.level_size = level_size
+        self.tile_rects = tile_rects
+        self.clip = clip
+        self.rotated = rotated
+        self.cancelled = False
+        self.signals = ImageDecodeSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        level_image = None
+        for key, rect in self.tile_rects:
+            if self.cancelled:
+                return
+            if self.clip:
+                reader = QtGui.QImageReader(self.image_path)
+                reader.setScaledSize(self.level_size)
+                reader.setScaledClipRect(rect)
+                image = reader.read()
+            else:
+                if level_image is None:
+                    reader = QtGui.QImageReader(self.image_path)
+                    reader.setAutoTransform(True)
+                    scaled_size = QtCore.QSize(self.level_size)
+                    if self.rotated:
+                        scaled_size.transpose()
+                    reader.setScaledSize(scaled_size)
+                    level_image = reader.read()
+                image = level_image.copy(rect)
+            if image.isNull():
+                LOG.warning("Unable to read image tile '{}' {}".format(self.image_path, key))
+            elif not self.cancelled:
+                self.signals.tile_finished.emit(key, image)
+
+
+class ProxyBuildTask(QtCore.QRunnable):
+    '''Decodes an image and saves it to PLANE_PROXY_CACHE on a worker thread.
+        Parameters:
+                image_path : Path to the image file.
+        NOTES:
+            > Emits signals.proxy_finished with (image_path, True if the proxy was written),
+            unless the task was cancelled.
+    '''
+    def __init__(self, image_path=""):
+        super(ProxyBuildTask, self).__init__()
+        self.image_path = image_path
+        self.cancelled = False
+        self.signals = ImageDecodeSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        if self.cancelled:
+            return
+        size = PLANE_PROXY_CACHE.max_size
+        written = PLANE_PROXY_CACHE.write(self.image_path, decode_image(self.image_path, [size, size]))
+        if not self.cancelled:
+            self.signals.proxy_finished.emit(self.image_path, written)
+
+
+class ImagePlaneProxyBuilder(QtCore.QObject):
+    '''Builds imagePlane proxies off the GUI thread, then points the imagePlanes waiting on them at the proxy.
+        NOTES:
+            > Each image is built once, however many imagePlanes use it.
+            > Only decoding and writing happen on the worker thread. Maya is only touched in set_proxy(), 
+            on the GUI thread.
+            > An imagePlane that was deleted or pointed at another image while it waited is left alone.
+    '''
+    def __init__(self, parent=None):
+        super(ImagePlaneProxyBuilder, self).__init__(parent)
+        # Image path: [ProxyBuildTask, set of imagePlanes waiting on it]
+        self.builds = {}
+
+    def build(self, image_plane, image_path):
+        '''Build the proxy of an image and point the imagePlane at it when it is done.'''
+        if image_path in self.builds:
+            self.builds[image_path][1].add(image_plane)
+            return
+        # Resolved here, finding the cache folder asks Maya for its user folder
+        PLANE_PROXY_CACHE.get_folder()
+        task = ProxyBuildTask(image_path=image_path)
+        task.signals.proxy_finished.connect(self.set_proxy)
+        self.builds[image_path] = [task, set([image_plane])]
+        IMAGE_THREAD_POOL.start(task)
+
+    def set_proxy(self, image_path, written):
+        '''Point the imagePlanes waiting on an image at its newly written proxy.'''
+        task, image_planes = self.builds.pop(image_path, [None, set()])
+        proxy_path = PLANE_PROXY_CACHE.get(image_path) if written else ""
+        if not proxy_path:
+            return
+        for each in sorted(image_planes):
+            if get_backend().node_exists(each) and get_original_image(each) == image_path:
+                swap_image_plane(each, proxy_path, image_path)
+
+    def discard(self, image_plane):
+        '''Stop waiting on a proxy for an imagePlane. The proxy is still written to the cache.'''
+        for task, image_planes in self.builds.values():
+            image_planes.discard(image_plane)
+
+    def cancel(self):
+        '''Stop every build that hasn't started and forget the imagePlanes waiting on them.'''
+        for task, image_planes in self.builds.values():
+            task.cancel()
+        self.builds = {}
 
 
-class NavGrid(QtWidgets.QTableWidget):
+PLANE_PROXY_BUILDER = ImagePlaneProxyBuilder()
+
+
+class IconRegistry(object):
+    '''Icons from a folder, each read from disk once per process and shared by every widget.
+        Parameters:
+                folder : Folder holding the icon files.
+        NOTES:
+            > pixmap() keeps a copy per size and device pixel ratio, scaled once so painting
+            never resamples it. icon() builds its QIcon from those copies.
+            > Holds QPixmaps, so it must only be used from the GUI thread.
+    '''
+    def __init__(self, folder=ICON_FOLDER):
+        self.folder = folder
+        self.images = {}
+        self.pixmaps = {}
+        self.icons = {}
+
+    def image(self, name):
+        '''Get an icon file (ex. "up_btn.jpg") as a QImage at its own size.'''
+        if name not in self.images:
+            self.images[name] = QtGui.QImage(os.path.join(self.folder, name))
+            if self.images[name].isNull():
+                LOG.warning("Unable to read icon '{}'".format(os.path.join(self.folder, name)))
+
+        return self.images[name]
+
+    def pixmap(self, name, size=16, device_pixel_ratio=1.0):
+        '''Get an icon as a "size" x "size" (logical pixels) QPixmap rendered for "device_pixel_ratio".'''
+        key = (name, size, device_pixel_ratio)
+        if key not in self.pixmaps:
+            pixels = int(round(size * device_pixel_ratio))
+            image = self.image(name).scaled(pixels, pixels, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            pixmap = QtGui.QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            self.pixmaps[key] = pixmap
+
+        return self.pixmaps[key]
+
+    def icon(self, name, size=16):
+        '''Get a QIcon with the icon pre-rendered for every screen's device pixel ratio.'''
+        key = (name, size)
+        if key not in self.icons:
+            icon = QtGui.QIcon()
+            ratios = set([each.devicePixelRatio() for each in QtGui.QGuiApplication.screens()] or [1.0])
+            for ratio in sorted(ratios):
+                icon.addPixmap(self.pixmap(name, size, ratio))
+            self.icons[key] = icon
+
+        return self.icons[key]
+
+    def clear(self):
+        self.images.clear()
+        self.pixmaps.clear()
+        self.icons.clear()
+
+
+# Process-wide, so opening the tool again never reads an icon from disk
+ICONS = IconRegistry()
+
+
+class NavGrid(QtWidgets.QWidget):
     '''Navigation Widget to Control a Camera's Transformation Attributes
+        Parameters:
+                hold_rate      : Steps per second moved while an up/down key is held.
+                hold_delay     : Seconds a key must be held before continuous motion starts.
+                hold_curve     : Name of the HOLD_CURVES acceleration curve for long holds.
+                max_multiplier : Highest speed multiplier the curve reaches.
+                ramp_time      : Seconds of holding it takes to reach "max_multiplier".
+        Signals:
+                clicked(attribute, negative) : An up (negative False) or down button was clicked.
+                attribute_changed(attribute) : The selected attribute changed, by click or left/right keys.
         NOTES:
             > Increment Widget for setting the step size is not parented within the 
-            Table Widget and must be assigned to a separate external layout.
+            Navigation Widget and must be assigned to a separate external layout.
+            > A tap moves one step. Holding the key moves the camera by elapsed time, 
+            once per display frame, and the OS's key auto-repeat events are dropped.
+            > One painted widget: each attribute's cell has an up button, its name and a down button, 
+            found by hit-testing in cell_at(), instead of a table of button widgets. 
+            Arrows come from ICONS, already scaled for the screen.
     '''
-    def __init__(self, parent=None):
+    clicked = QtCore.Signal(str, bool)
+    attribute_changed = QtCore.Signal(str)
+    # Attributes by [row][column]
+    attributes = [["tx", "ty", "tz"], 
+                  ["rx", "ry", "rz"]]
+    # Pressed button color by column (x, y, z)
+    axis_colors = [QtGui.QColor(200, 50, 50), QtGui.QColor(0, 200, 100), QtGui.QColor(0, 100, 255)]
+    button_color = QtGui.QColor(85, 85, 85)
+    hover_color = QtGui.QColor(102, 102, 102)
+    button_size = 32
+    icon_size = 16
+
+    def __init__(self, parent=None, hold_rate=10.0, hold_delay=0.3, hold_curve="ease_in", 
+                 max_multiplier=8.0, ramp_time=2.0):
         super(NavGrid, self).__init__(parent=parent)
-        # Initial Table Widget Settings
+        # Initial Settings
         self.attr = "tx"
+        self.current_cell = -1
+        self.hover = None
+        self.pressed = None
+        self.key_session = UndoSession(name="cameraAdjusterNudge")
+        self.hold_rate = hold_rate
+        self.hold_delay = hold_delay
+        self.hold_curve = hold_curve
+        self.max_multiplier = max_multiplier
+        self.ramp_time = ramp_time
+        self.hold = None
+        self.hold_clock = QtCore.QElapsedTimer()
+        self.hold_time = 0.0
+        self.hold_timer = QtCore.QTimer(self)
+        screen = QtGui.QGuiApplication.primaryScreen()
+        self.hold_timer.setInterval(int(1000.0 / (screen.refreshRate() if screen else 60.0)))
+        self.hold_timer.timeout.connect(self.hold_step)
         self.setObjectName("NavGrid")
-        self.setRowCount(2)
-        self.setColumnCount(3)
-        self.verticalHeader().setVisible(False)
-        self.horizontalHeader().setVisible(False)
-        self.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
-        self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
-        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
-        # StyleSheets for buttons
-        self.red = '''QPushButton:pressed {
-                            color: white;
-                            background: rgb(200,50,50);
-                            }'''
-        self.blue = '''QPushButton:pressed {
-                            color: white;
-                            background: rgb(0,100,255);
-                            }'''
-        self.green = '''QPushButton:pressed {
-                            color: white;
-                            background: rgb(0,200,100);
-                            }'''
+        self.setFocusPolicy(QtCore.Qt.StrongFocus)
+        self.setMouseTracking(True)
         # Components
         self.increments_widget = StepWidget() # Will be added to separate layout in parent widget
-        self.tx = UpDownButtons(text="tx", up_text="", down_text="")
-        self.ty = UpDownButtons(text="ty", up_text="", down_text="")
-        self.tz = UpDownButtons(text="tz", up_text="", down_text="")
-        self.rx = UpDownButtons(text="rx", up_text="", down_text="")
-        self.ry = UpDownButtons(text="ry", up_text="", down_text="")
-        self.rz = UpDownButtons(text="rz", up_text="", down_text="")
-        # Assemble Components
-        self.setCellWidget(0,0,self.tx)
-        self.setCellWidget(0,1,self.ty)
-        self.setCellWidget(0,2,self.tz)
-        self.setCellWidget(1,0,self.rx)
-        self.setCellWidget(1,1,self.ry)
-        self.setCellWidget(1,2,self.rz)
-        # Component Settings
-        self.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
-        self.resizeColumnsToContents()
-        self.resizeRowsToContents()
         # Button Methods
-        self.tx.up_btn.clicked.connect(  partial( self.set_attr, "tx", False))
-        self.tx.down_btn.clicked.connect(partial( self.set_attr, "tx", True) )
-        self.ty.up_btn.clicked.connect(  partial( self.set_attr, "ty", False))
-        self.ty.down_btn.clicked.connect(partial( self.set_attr, "ty", True) )
-        self.tz.up_btn.clicked.connect(  partial( self.set_attr, "tz", False))
-        self.tz.down_btn.clicked.connect(partial( self.set_attr, "tz", True) )
-        self.rx.up_btn.clicked.connect(  partial( self.set_attr, "rx", False))
-        self.rx.down_btn.clicked.connect(partial( self.set_attr, "rx", True) )
-        self.ry.up_btn.clicked.connect(  partial( self.set_attr, "ry", False))
-        self.ry.down_btn.clicked.connect(partial( self.set_attr, "ry", True) )
-        self.rz.up_btn.clicked.connect(  partial( self.set_attr, "rz", False))
-        self.rz.down_btn.clicked.connect(partial( self.set_attr, "rz", True) )
-        # Button color when clicked
-        self.tx.up_btn.setStyleSheet(self.red)
-        self.tx.down_btn.setStyleSheet(self.red)
-        self.ty.up_btn.setStyleSheet(self.green)
-        self.ty.down_btn.setStyleSheet(self.green)
-        self.tz.up_btn.setStyleSheet(self.blue)
-        self.tz.down_btn.setStyleSheet(self.blue)
-        self.rx.up_btn.setStyleSheet(self.red)
-        self.rx.down_btn.setStyleSheet(self.red)
-        self.ry.up_btn.setStyleSheet(self.green)
-        self.ry.down_btn.setStyleSheet(self.green)
-        self.rz.up_btn.setStyleSheet(self.blue)
-        self.rz.down_btn.setStyleSheet(self.blue)
-        # Finalize
-        self.setWindowFlags(QtCore.Qt.Window)
+        self.clicked.connect(self.set_attr)
 
-    def mouseReleaseEvent(self, event):
-        '''Determine which one of the six manipulation options is selected'''
-        super(NavGrid, self).mousePressEvent(event)
-        index = self.indexAt(event.pos())
-        if index.isValid():
-            self.selectedCell = [self.currentRow(), self.currentColumn()]
-            self.current_attr = self.cellWidget(self.currentRow(), 
-                                                self.currentColumn()).label.text()
-            self.attr = self.current_attr
+    def sizeHint(self):
+        return QtCore.QSize(168, 252)
+
+    def cell_rect(self, cell):
+        '''Get the rectangle of cell 0-5 (tx, ty, tz, rx, ry, rz).'''
+        width = self.width() // 3
+        height = min(self.height() // 2, 126)
+
+        return QtCore.QRect((cell % 3) * width, (cell // 3) * height, width, height)
+
+    def button_rect(self, cell, zone):
+        '''Get the rectangle of a cell's "up" or "down" button.'''
+        rect = self.cell_rect(cell)
+        margin = 9
+        top = rect.top() + margin if zone == "up" else rect.bottom() - margin - self.button_size + 1
+
+        return QtCore.QRect(rect.center().x() - self.button_size // 2 + 1, top, self.button_size, self.button_size)
+
+    def cell_at(self, pos):
+        '''Get [cell, zone] under a position, zone being "up", "down" or "label". Returns [-1, None] outside the cells.'''
+        for cell in range(6):
+            if self.cell_rect(cell).contains(pos):
+                for zone in ["up", "down"]:
+                    if self.button_rect(cell, zone).contains(pos):
+                        return [cell, zone]
+                return [cell, "label"]
+
+        return [-1, None]
+
+    def cell_attribute(self, cell):
+        return self.attributes[cell // 3][cell % 3]
+
+    def select_cell(self, cell):
+        '''Select cell 0-5 and the attribute it controls, or -1 to clear the selection.'''
+        self.current_cell = cell
+        if cell >= 0:
+            self.attr = self.cell_attribute(cell)
+            self.attribute_changed.emit(self.attr)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        palette = self.palette()
+        icons = dict([[zone, ICONS.pixmap(zone + "_btn.jpg", self.icon_size, self.devicePixelRatioF())] 
+                      for zone in ["up", "down"]])
+        font = painter.font()
+        font.setBold(True)
+        painter.setFont(font)
+        for cell in range(6):
+            rect = self.cell_rect(cell)
+            if not rect.intersects(event.rect()):
+                continue
+            if cell == self.current_cell:
+                painter.fillRect(rect, palette.highlight())
+            painter.setPen(palette.mid().color())
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+            painter.setPen(palette.highlightedText().color() if cell == self.current_cell else palette.text().color())
+            painter.drawText(rect, QtCore.Qt.AlignCenter, self.cell_attribute(cell))
+            for zone in ["up", "down"]:
+                button = self.button_rect(cell, zone)
+                color = self.button_color
+                if self.pressed == [cell, zone] and self.hover == [cell, zone]:
+                    color = self.axis_colors[cell % 3]
+                elif self.hover == [cell, zone]:
+                    color = self.hover_color
+                painter.fillRect(button, color)
+                icon_rect = QtCore.QRect(0, 0, self.icon_size, self.icon_size)
+                icon_rect.moveCenter(button.center())
+                painter.drawPixmap(icon_rect.topLeft(), icons[zone])
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        '''Highlight the button under the mouse.'''
+        cell, zone = self.cell_at(event.pos())
+        hover = [cell, zone] if zone in ["up", "down"] else None
+        if hover != self.hover:
+            self.hover = hover
+            self.update()
+        super(NavGrid, self).mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.hover = None
+        self.update()
+        super(NavGrid, self).leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        '''Press a button, or select the attribute of the cell clicked.'''
+        cell, zone = self.cell_at(event.pos())
+        if event.button() != QtCore.Qt.LeftButton:
+            return
+        if zone in ["up", "down"]:
+            self.pressed = [cell, zone]
+            self.hover = [cell, zone]
+            self.update()
         else:
-            self.selectedCell = [-1,-1]
-            self.current_attr = ""
-            self.setCurrentIndex(QtCore.QModelIndex())
+            self.select_cell(cell)
+
+    @traced
+    def mouseReleaseEvent(self, event):
+        '''A button click only counts if released over the button it was pressed on, like a QPushButton.'''
+        pressed = self.pressed
+        self.pressed = None
+        self.update()
+        if pressed and self.cell_at(event.pos()) == pressed:
+            self.clicked.emit(self.cell_attribute(pressed[0]), pressed[1] == "down")
         
+    @timed
+    @traced
     def keyPressEvent(self,event):
         '''Settings for arrow keys. 
         NOTES:
             Left/Right for changing which attribute is being modified. 
             Up/Down applies transformation to selected attribute.
         '''
-        self.selectedCell = [self.currentRow(), self.currentColumn()]
-        cell_num = (self.columnCount()*self.currentRow()) + self.currentColumn()
-        par = cmds.listRelatives(self.get_current_camera(),parent=True)[0]
-        # Left Arrow Key
+        # Left/Right Arrow Keys, wrapping around the six cells
         if event.key() == QtCore.Qt.Key_Left:
-            if cell_num == 0:
-                new_selected_cell = 5
-            else:
-                new_selected_cell = cell_num - 1
-            new_selected_cell = [(new_selected_cell-(new_selected_cell % self.columnCount())) / self.rowCount(), 
-                                new_selected_cell % self.columnCount()]
-            self.setCurrentCell(new_selected_cell[0], new_selected_cell[1])
-            if self.cellWidget(new_selected_cell[0], new_selected_cell[1]):
-                self.attr = self.cellWidget(new_selected_cell[0], new_selected_cell[1]).label.text()
-            else:
-                self.attr = ""
-        # Right Arrow Key
-        if event.key() == QtCore.Qt.Key_Right:
-            if cell_num == 5:
-                new_selected_cell = 0
-            else:
-                new_selected_cell = cell_num + 1
-            new_selected_cell = [(new_selected_cell-(new_selected_cell % self.columnCount())) / self.rowCount(), 
-                                new_selected_cell % self.columnCount()]
-            self.setCurrentCell(new_selected_cell[0], new_selected_cell[1])
-            if self.cellWidget(new_selected_cell[0], new_selected_cell[1]):
-                self.attr = self.cellWidget(new_selected_cell[0], new_selected_cell[1]).label.text()
-            else:
-                self.attr = ""
-        # Up Arrow Key
-        if event.key() == QtCore.Qt.Key_Up:
-            if self.attr:
-                full_attr = "{}.{}".format(par, self.attr)
-                current = cmds.getAttr("{}.{}".format(par, self.attr))
-                locked = cmds.getAttr(full_attr, lock=True)
-                if locked:
-                    cmds.setAttr(full_attr, lock=False)
-                    cmds.setAttr("{}.{}".format(par, self.attr), 
-                                current + self.increments_widget.step_box.value())
-                    cmds.setAttr(full_attr, lock=True)
-                else:
-                    cmds.setAttr("{}.{}".format(par, self.attr), 
-                                current + self.increments_widget.step_box.value())
-        # Down Arrow Key
-        if event.key() == QtCore.Qt.Key_Down:
-            if self.attr:
-                full_attr = "{}.{}".format(par, self.attr)
-                current = cmds.getAttr("{}.{}".format(par, self.attr))
-                locked = cmds.getAttr(full_attr, lock=True)
-                if locked:
-                    cmds.setAttr(full_attr, lock=False)
-                    cmds.setAttr("{}.{}".format(par, self.attr), 
-                                current - self.increments_widget.step_box.value())
-                    cmds.setAttr(full_attr, lock=True)
-                else:
-                    cmds.setAttr("{}.{}".format(par, self.attr), 
-                                current - self.increments_widget.step_box.value())
+            self.select_cell(5 if self.current_cell <= 0 else self.current_cell - 1)
+        elif event.key() == QtCore.Qt.Key_Right:
+            self.select_cell(0 if self.current_cell in [-1, 5] else self.current_cell + 1)
+        # Up/Down Arrow Keys. Auto-repeats are dropped, hold_step() moves the camera while held.
+        elif event.key() in [QtCore.Qt.Key_Up, QtCore.Qt.Key_Down]:
+            if self.attr and not event.isAutoRepeat():
+                self.start_hold(self.attr, event.key() == QtCore.Qt.Key_Down)
+        else:
+            super(NavGrid, self).keyPressEvent(event)
+
+    @traced
+    def keyReleaseEvent(self, event):
+        '''Holding up/down leaves a single undo step, closed when the key is let go.'''
+        super(NavGrid, self).keyReleaseEvent(event)
+        if event.key() in [QtCore.Qt.Key_Up, QtCore.Qt.Key_Down] and not event.isAutoRepeat():
+            self.stop_hold()
+
+    def focusOutEvent(self, event):
+        '''The key release is never received once focus is lost, so stop moving here.'''
+        self.stop_hold()
+        super(NavGrid, self).focusOutEvent(event)
+
+    def start_hold(self, attr, neg):
+        '''Move one step right away, then keep moving from hold_step() until stop_hold().'''
+        self.stop_hold()
+        handle = get_camera_handle(self.get_current_camera())
+        self.hold = [handle, attr, neg]
+        self.adjust_value(object_name=handle, 
+                          attribute=attr, 
+                          increment=self.increments_widget.step_box.value(), 
+                          negative=neg, 
+                          session=self.key_session)
+        self.hold_time = 0.0
+        self.hold_clock.start()
+        self.hold_timer.start()
+
+    @traced
+    def hold_step(self):
+        '''Move the held attribute by the time elapsed since the last frame.
+           NOTES:
+               > If Maya is slow to draw, the next frame makes up the distance in one write 
+               instead of a backlog of key events.'''
+        if not self.hold:
+            self.hold_timer.stop()
+            return
+        hold_time = self.hold_clock.elapsed() / 1000.0
+        start = max(self.hold_time, self.hold_delay)
+        self.hold_time = hold_time
+        if hold_time <= start:
+            return
+        # Average the curve's speed over the frame
+        speed = hold_speed((start + hold_time) / 2.0 - self.hold_delay, self.hold_curve, 
+                           self.max_multiplier, self.ramp_time)
+        increment = self.increments_widget.step_box.value() * self.hold_rate * speed * (hold_time - start)
+        self.adjust_value(object_name=self.hold[0], 
+                          attribute=self.hold[1], 
+                          increment=increment, 
+                          negative=self.hold[2], 
+                          session=self.key_session)
+
+    def stop_hold(self):
+        '''Stop moving and close the held key's undo step.'''
+        self.hold_timer.stop()
+        self.hold = None
+        self.key_session.end()
 
     def get_current_camera(self):
         '''Get the current camera being used in the active viewport.'''
-        cur_view = OpenMayaUI.M3dView.active3dView()
-        cur_cam = OpenMaya.MDagPath()
-        cur_view.getCamera(cur_cam)
-        cur_camPath = cur_cam.fullPathName()
-        cur_camPath = cur_camPath.split("|")[-1]
-        return cur_camPath
+        return get_backend().get_current_camera()
     
-    def adjust_value(self, object_name, attribute="", increment=1, negative=False):
+    def adjust_value(self, object_name, attribute="", increment=1, negative=False, session=None):
         '''Orients or translates the specified object along a specific axis by a specific increment.
-        Good for manually adjusting camera to match perspective of grid to concept art for modeling.'''
-        attribute_name = "{}.{}".format(object_name, attribute)
-        # Adjust Camera
-        current_val = cmds.getAttr(attribute_name)
-        locked = cmds.getAttr(attribute_name, lock=True)
-        if locked:
-            cmds.setAttr(attribute_name, lock=False)
-            if negative:
-                output = current_val - increment
-                cmds.setAttr(attribute_name, output)
-            else:
-                output = current_val + increment
-                cmds.setAttr(attribute_name, output)
-            cmds.setAttr(attribute_name, lock=True)
+        Good for manually adjusting camera to match perspective of grid to concept art for modeling.
+            Parameters:
+                    object_name: Camera's shape or transform name, or its CameraHandle.
+                    session:     Optional UndoSession the write is grouped into.'''
+        handle = object_name
+        if isinstance(handle, str):
+            handle = get_camera_handle(object_name)
+        # Adjust Camera. Locked attributes are handled by the command.
+        if negative:
+            increment = -increment
+        if session:
+            session.write(handle, attribute, increment, relative=True)
         else:
-            if negative:
-                output = current_val - increment
-                cmds.setAttr(attribute_name, output)
-            else:
-                output = current_val + increment
-                cmds.setAttr(attribute_name, output)
+            handle.nudge(attribute, increment)
             
+    @traced
     def set_attr(self, attr, neg):
         '''Change value of selected object(s)
             Parameters:
                     attr: transform attribute to be modified
                     neg: Boolean value determining if value should be added or subtracted'''
-        cam = cmds.listRelatives(self.get_current_camera(), parent=True)[0]
+        cam = get_camera_handle(self.get_current_camera())
         inc = self.increments_widget.step_box.value()
         self.adjust_value(object_name=cam,
                           attribute=attr,
@@ -882,4 +2914,137 @@ class StepWidget(QtWidgets.QWidget):
         if self.limits[1]:
             if self.default_val > self.limits[1]:
                 self.step_box.setValue(self.limits[1])
-            self.step_box.setMaximum(self.limits[1])
\ No newline at end of file
+            self.step_box.setMaximum(self.limits[1])
+
+class CallTracerPanel(QtWidgets.QWidget):
+    '''Debug panel listing the Maya calls each UI event made, with their plugs and timings.
+        Parameters:
+                max_rows     : Number of most recent events listed.
+                refresh_rate : Milliseconds between list updates while the panel is shown.
+        NOTES:
+            > Recording wraps the backend, see backend.start_tracing(). It stops when the panel closes.
+            > The "By Handler" tab shows which handlers make the most calls, 
+            the "Events" tab lists each event with its calls.
+            > The "Latency" tab shows HANDLER_LATENCY, which is always collected.
+    '''
+    def __init__(self, parent=None, max_rows=200, refresh_rate=500):
+        super(CallTracerPanel, self).__init__(parent)
+        # Members
+        self.max_rows = max_rows
+        self.tracer = None
+        self.listed_event = None
+        # Components
+        self.main_layout = QtWidgets.QVBoxLayout()
+        self.record_cbox = QtWidgets.QCheckBox("Record Maya Calls")
+        self.summary_label = QtWidgets.QLabel()
+        self.tabs = QtWidgets.QTabWidget()
+        self.handler_tree = QtWidgets.QTreeWidget()
+        self.event_tree = QtWidgets.QTreeWidget()
+        self.latency_tree = QtWidgets.QTreeWidget()
+        self.buttons_layout = QtWidgets.QHBoxLayout()
+        self.clear_btn = QtWidgets.QPushButton("Clear")
+        self.export_btn = QtWidgets.QPushButton("Export Chrome Trace...")
+        self.refresh_timer = QtCore.QTimer(self)
+        # Assemble
+        self.setLayout(self.main_layout)
+        self.main_layout.addWidget(self.record_cbox)
+        self.main_layout.addWidget(self.summary_label)
+        self.main_layout.addWidget(self.tabs)
+        self.tabs.addTab(self.handler_tree, "By Handler")
+        self.tabs.addTab(self.event_tree, "Events")
+        self.tabs.addTab(self.latency_tree, "Latency")
+        self.buttons_layout.addWidget(self.clear_btn)
+        self.buttons_layout.addWidget(self.export_btn)
+        self.main_layout.addLayout(self.buttons_layout)
+        # Settings
+        self.setWindowTitle("Camera Adjuster Call Tracer")
+        self.setWindowFlags(QtCore.Qt.Window)
+        self.resize(520, 420)
+        self.handler_tree.setRootIsDecorated(False)
+        self.handler_tree.setHeaderLabels(["Handler", "Events", "Calls/Event", "Max Calls", "Maya ms/Event", "ms/Event"])
+        self.event_tree.setHeaderLabels(["Event / Call", "Plug", "Calls", "ms"])
+        self.latency_tree.setRootIsDecorated(False)
+        self.latency_tree.setHeaderLabels(["Handler", "Samples", "p50 ms", "p90 ms", "p99 ms", "Max ms"] + 
+                                          ["<={}".format(each) for each in LATENCY_BUCKETS] + 
+                                          [">{}".format(LATENCY_BUCKETS[-1])])
+        self.refresh_timer.setInterval(refresh_rate)
+        self.record_cbox.toggled.connect(self.set_recording)
+        self.clear_btn.clicked.connect(self.clear)
+        self.export_btn.clicked.connect(self.export)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super(CallTracerPanel, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super(CallTracerPanel, self).hideEvent(event)
+
+    def closeEvent(self, event):
+        self.record_cbox.setChecked(False)
+        super(CallTracerPanel, self).closeEvent(event)
+
+    def set_recording(self, recording):
+        if recording:
+            self.tracer = start_tracing()
+        else:
+            stop_tracing()
+        self.refresh()
+
+    def clear(self):
+        if self.tracer:
+            self.tracer.clear()
+        HANDLER_LATENCY.clear()
+        self.refresh()
+
+    def export(self):
+        '''Save the recorded events for chrome://tracing or ui.perfetto.dev.'''
+        if not self.tracer:
+            return
+        path = QtWidgets.QFileDialog.getSaveFileName(self, "Export Chrome Trace", 
+                                                     "camera_adjuster_trace.json", "JSON (*.json)")[0]
+        if path:
+            self.tracer.save_chrome_trace(path)
+
+    def refresh(self):
+        '''Update the lists with events recorded since the last refresh.'''
+        self.refresh_latency()
+        if not self.tracer:
+            self.summary_label.setText("Not recording.")
+            return
+        events = list(self.tracer.events)
+        # Nothing new, keep the user's expanded rows
+        if events and events[-1] is self.listed_event:
+            return
+        self.listed_event = events[-1] if events else None
+        summary = self.tracer.summary()
+        calls = sum([each["calls"] for each in summary.values()])
+        call_ms = sum([each["call_ms"] for each in summary.values()])
+        self.summary_label.setText("{} events, {} Maya calls, {:.1f} ms in Maya".format(len(events), calls, call_ms))
+        self.handler_tree.clear()
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]["call_ms"]):
+            self.handler_tree.addTopLevelItem(QtWidgets.QTreeWidgetItem([name, 
+                                                                         str(stats["events"]),
+                                                                         "{:.1f}".format(float(stats["calls"]) / stats["events"]),
+                                                                         str(stats["max_calls"]),
+                                                                         "{:.3f}".format(stats["call_ms"] / stats["events"]),
+                                                                         "{:.3f}".format(stats["event_ms"] / stats["events"])]))
+        self.event_tree.clear()
+        for event in reversed(events[-self.max_rows:]):
+            event_item = QtWidgets.QTreeWidgetItem([event["name"], "", str(len(event["calls"])), 
+                                                    "{:.3f}".format(event["duration"] * 1000)])
+            for call, plug, start, duration, handler in event["calls"]:
+                event_item.addChild(QtWidgets.QTreeWidgetItem([call, plug, "", "{:.3f}".format(duration * 1000)]))
+            self.event_tree.addTopLevelItem(event_item)
+        for tree in [self.handler_tree, self.event_tree]:
+            tree.resizeColumnToContents(0)
+
+    def refresh_latency(self):
+        self.latency_tree.clear()
+        for name, stats in HANDLER_LATENCY.stats().items():
+            self.latency_tree.addTopLevelItem(QtWidgets.QTreeWidgetItem([name, str(stats["count"])] + 
+                                                                        ["{:.2f}".format(stats[each]) for each in ["p50", "p90", "p99", "max"]] + 
+                                                                        [str(each) for each in stats["histogram"]]))
+        self.latency_tree.resizeColumnToContents(0)